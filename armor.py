@@ -1,15 +1,20 @@
 import arcade
 
 
+def get_level_health(health, level, modifiers):
+    return health * modifiers.get('health', 1) * (level / 10 + 0.9)
+
+
 class BaseArmor(arcade.Sprite):
+    name = ''
+    base_health = 0
+
     def __init__(self, texture, scale, health, player, level):
         super().__init__(texture, scale)
         self.health = health * player.modifiers.get('health', 1)
         self.player = player
         self.level = level
 
-        self.name = ''
-
         self.apply_level()
 
     def apply_level(self):
@@ -28,46 +33,69 @@ class BaseArmor(arcade.Sprite):
         self.player.health = self.player.health / self.player.max_health * hp
         self.player.max_health = hp
 
+    @classmethod
+    def get_stats(cls, level, modifiers):
+        return {'health': get_level_health(cls.base_health, level, modifiers)}
+
+    @classmethod
+    def describe(cls, level, modifiers):
+        return f'Уровень: {level}\nЗдоровье: {cls.get_stats(level, modifiers)["health"]}'
+
     def return_name(self):
         return self.name
 
     def return_desc(self):
-        return f'Уровень: {self.level}\nЗдоровье: {self.health}'
+        return self.describe(self.level, self.player.modifiers)
 
 
 class WoodenArmor(BaseArmor):
+    texture_path = 'assets/images/armor/wooden_armor.png'
+    rarity = 1
+    name = 'Деревянная броня'
+    base_health = 10
+
     def __init__(self, player, level):
-        super().__init__('assets/images/armor/wooden_armor.png', player.scale, 10, player, level)
-        self.rarity = 1
-        self.name = 'Деревянная броня'
+        super().__init__(self.texture_path, player.scale, self.base_health, player, level)
 
 
 class IronArmor(BaseArmor):
+    texture_path = 'assets/images/armor/iron_armor.png'
+    rarity = 2
+    name = 'Железная броня'
+    base_health = 13
+
     def __init__(self, player, level):
-        super().__init__('assets/images/armor/iron_armor.png', player.scale, 13, player, level)
-        self.rarity = 2
-        self.name = 'Железная броня'
+        super().__init__(self.texture_path, player.scale, self.base_health, player, level)
 
 
 class DiamondArmor(BaseArmor):
+    texture_path = 'assets/images/armor/diamond_armor.png'
+    rarity = 3
+    name = 'Алмазная броня'
+    base_health = 16
+
     def __init__(self, player, level):
-        super().__init__('assets/images/armor/diamond_armor.png', player.scale, 16, player, level)
-        self.rarity = 3
-        self.name = 'Алмазная броня'
+        super().__init__(self.texture_path, player.scale, self.base_health, player, level)
 
 
 class HolyArmor(BaseArmor):
+    texture_path = 'assets/images/armor/holy_armor.png'
+    rarity = 4
+    name = 'Святая броня'
+    base_health = 20
+
     def __init__(self, player, level):
-        super().__init__('assets/images/armor/holy_armor.png', player.scale, 20, player, level)
-        self.rarity = 4
-        self.name = 'Святая броня'
+        super().__init__(self.texture_path, player.scale, self.base_health, player, level)
 
 
 class MechaArmor(BaseArmor):
+    texture_path = 'assets/images/armor/mecha_armor.png'
+    rarity = 5
+    name = 'Меха-броня'
+    base_health = 25
+
     def __init__(self, player, level):
-        super().__init__('assets/images/armor/mecha_armor.png', player.scale, 25, player, level)
-        self.rarity = 5
-        self.name = 'Меха-броня'
+        super().__init__(self.texture_path, player.scale, self.base_health, player, level)
 
 
 USUAL_RARITY_ARMOR = [WoodenArmor]
@@ -83,4 +111,6 @@ RARITY_TO_ARMOR = {1: USUAL_RARITY_ARMOR,
                      2: UNUSUAL_RARITY_ARMOR,
                      3: RARE_RARITY_ARMOR,
                      4: EPIC_RARITY_ARMOR,
-                     5: LEGENDARY_RARITY_ARMOR}
\ No newline at end of file
+                     5: LEGENDARY_RARITY_ARMOR}
+
+REGISTRY = {i.__name__: i for i in ARMORS}
@@ -0,0 +1,188 @@
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import arcade
+import pyglet
+
+
+CACHE_SIZE = 4
+FADE_TIME = 1.0
+UPDATE_INTERVAL = 1 / 30
+
+
+def decode(path):
+    start = time.perf_counter()
+    sound = arcade.load_sound(path)
+
+    return sound, (time.perf_counter() - start) * 1000
+
+
+class Track:
+    def __init__(self, path, volume, fade):
+        self.path = path
+        self.volume = volume
+        self.fade = fade
+        self.target = volume
+        self.level = 0
+        self.player = None
+        self.requested = time.perf_counter()
+
+
+class AudioManager:
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.sounds = OrderedDict()
+        self.loading = {}
+        self.tracks = []
+        self.current = None
+        self.executor = None
+        self.scheduled = False
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.decode_ms = {}
+        self.start_ms = None
+        self.play_ms = None
+
+    def preload(self, path):
+        if path in self.sounds or path in self.loading:
+            return
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='audio')
+
+        self.loading[path] = self.executor.submit(decode, path)
+
+    def collect(self):
+        for path, future in list(self.loading.items()):
+            if not future.done():
+                continue
+
+            del self.loading[path]
+
+            try:
+                sound, elapsed = future.result()
+            except Exception:
+                self.errors += 1
+                continue
+
+            self.sounds[path] = sound
+            self.decode_ms[path] = round(elapsed, 2)
+
+            while len(self.sounds) > self.size:
+                self.sounds.popitem(last=False)
+
+    def play_music(self, path, volume=1, fade=FADE_TIME):
+        start = time.perf_counter()
+
+        if self.current is not None and self.current.path == path:
+            self.current.target = volume
+            return
+
+        self.stop_music(fade)
+
+        if path in self.sounds:
+            self.hits += 1
+            self.sounds.move_to_end(path)
+        else:
+            self.misses += 1
+            self.preload(path)
+
+        self.current = Track(path, volume, fade)
+        self.tracks.append(self.current)
+        self.update(0)
+
+        self.play_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    def stop_music(self, fade=FADE_TIME):
+        if self.current is None:
+            return
+
+        self.current.target = 0
+        self.current.fade = fade
+        self.current = None
+        self.update(0)
+
+    def start(self, track):
+        sound = self.sounds[track.path]
+        track.player = sound.play(track.level, loop=True)
+        self.start_ms = round((time.perf_counter() - track.requested) * 1000, 2)
+
+    def update(self, delta_time):
+        self.collect()
+
+        for track in list(self.tracks):
+            if track.player is None and track.path not in self.sounds and track.path not in self.loading:
+                if track is self.current:
+                    self.current = None
+
+                self.tracks.remove(track)
+                continue
+
+            if track.player is None and track is self.current and track.path in self.sounds:
+                self.start(track)
+
+            if track.fade <= 0:
+                track.level = track.target
+            elif track.level < track.target:
+                track.level = min(track.level + track.volume * delta_time / track.fade, track.target)
+            elif track.level > track.target:
+                track.level = max(track.level - track.volume * delta_time / track.fade, track.target)
+
+            if track.player is not None:
+                track.player.volume = track.level
+
+            if track is not self.current and track.level <= 0:
+                if track.player is not None:
+                    arcade.stop_sound(track.player)
+
+                self.tracks.remove(track)
+
+        self.schedule()
+
+    def is_idle(self):
+        return not self.loading and all(i.player is not None and i.level == i.target for i in self.tracks)
+
+    def schedule(self):
+        idle = self.is_idle()
+
+        if idle and self.scheduled:
+            pyglet.clock.unschedule(self.update)
+            self.scheduled = False
+        elif not idle and not self.scheduled:
+            pyglet.clock.schedule_interval(self.update, UPDATE_INTERVAL)
+            self.scheduled = True
+
+    def get_stats(self):
+        return {
+            'tracks': len(self.sounds),
+            'loading': len(self.loading),
+            'playing': sum(1 for i in self.tracks if i.player is not None),
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'decode_ms': dict(self.decode_ms),
+            'start_ms': self.start_ms,
+            'play_ms': self.play_ms,
+        }
+
+
+manager = AudioManager()
+
+
+def play_music(path, volume=1, fade=FADE_TIME):
+    manager.play_music(path, volume, fade)
+
+
+def stop_music(fade=FADE_TIME):
+    manager.stop_music(fade)
+
+
+def preload(path):
+    manager.preload(path)
+
+
+def get_stats():
+    return manager.get_stats()
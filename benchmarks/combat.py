@@ -0,0 +1,290 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import arcade
+
+import bullets
+import enemies
+import textures
+import weapons
+from simulation import Simulation, FIXED_DELTA
+
+
+SUBSYSTEMS = ['physics', 'pathfinding', 'enemy_ai', 'bullets', 'collisions', 'particles', 'weapons', 'triggers', 'draw']
+
+
+class Timings:
+    def __init__(self):
+        self.stack = []
+        self.frame = defaultdict(float)
+        self.last = 0
+
+    def push(self, name):
+        now = time.perf_counter()
+
+        if self.stack:
+            self.frame[self.stack[-1]] += now - self.last
+
+        self.stack.append(name)
+        self.last = now
+
+    def pop(self):
+        now = time.perf_counter()
+        self.frame[self.stack.pop()] += now - self.last
+        self.last = now
+
+    def take_frame(self):
+        frame = self.frame
+        self.frame = defaultdict(float)
+
+        return frame
+
+    def wrap(self, name, func):
+        def wrapper(*args, **kwargs):
+            self.push(name)
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.pop()
+
+        wrapper.__wrapped__ = func
+
+        return wrapper
+
+
+def instrument(timings):
+    patches = [
+        (Simulation, 'update_physics', 'physics'),
+        (Simulation, 'update_flow_field', 'pathfinding'),
+        (Simulation, 'update_enemies', 'enemy_ai'),
+        (Simulation, 'update_particles', 'particles'),
+        (Simulation, 'update_grid', 'collisions'),
+        (Simulation, 'update_player', 'weapons'),
+        (Simulation, 'update_projectiles', 'bullets'),
+        (Simulation, 'check_join_triggers', 'triggers'),
+        (Simulation, 'draw_map', 'draw'),
+        (Simulation, 'draw_sprites', 'draw'),
+        (arcade, 'check_for_collision', 'collisions'),
+        (arcade, 'check_for_collision_with_list', 'collisions'),
+    ]
+
+    originals = []
+
+    for owner, attr, name in patches:
+        func = owner.__dict__[attr]
+        originals.append((owner, attr, func))
+        setattr(owner, attr, timings.wrap(name, func))
+
+    return originals
+
+
+def restore(originals):
+    for owner, attr, func in originals:
+        setattr(owner, attr, func)
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = min(len(values) - 1, round(percent / 100 * (len(values) - 1)))
+
+    return values[index]
+
+
+def summarize(values):
+    values = [i * 1000 for i in values]
+
+    return {
+        'median': round(statistics.median(values), 4),
+        'p99': round(percentile(values, 99), 4),
+        'mean': round(statistics.fmean(values), 4),
+        'max': round(max(values), 4),
+    }
+
+
+def make_simulation(map_name, weapon=weapons.OldPistol, level=10):
+    color = arcade.color.BLACK.from_iterable((random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)))
+
+    return Simulation(map_name, 0, 0, {}, [(weapon, 5)], (None, 1), 10 ** 9, level, color, seed=random.getrandbits(63))
+
+
+def floor_positions(simulation):
+    walls = {(round(i.center_x), round(i.center_y)) for i in simulation.walls_list}
+
+    return [i.position for i in simulation.phone_list if (round(i.center_x), round(i.center_y)) not in walls]
+
+
+def nearest_enemy(simulation):
+    player = simulation.player
+
+    return min(simulation.enemy_list, key=lambda i: (i.center_x - player.center_x) ** 2 + (i.center_y - player.center_y) ** 2, default=None)
+
+
+class Scenario:
+    def __init__(self, name, map_name, enemies_count=0, weapon=weapons.OldPistol, shooting=False, activate=True):
+        self.name = name
+        self.map_name = map_name
+        self.enemies_count = enemies_count
+        self.weapon = weapon
+        self.shooting = shooting
+        self.activate = activate
+
+    def setup(self):
+        self.simulation = make_simulation(self.map_name, self.weapon)
+        self.positions = floor_positions(self.simulation)
+
+        if self.activate:
+            self.simulation.wake_all()
+
+        self.fill()
+
+    def fill(self):
+        pool = enemies.NORMAL_ENEMIES + enemies.ELITE_ENEMIES
+
+        while len(self.simulation.enemy_list) < self.enemies_count:
+            x, y = random.choice(self.positions)
+            self.simulation.spawn_enemy(random.choice(pool), x, y)
+
+    def before_frame(self):
+        self.fill()
+
+        if self.shooting:
+            target = nearest_enemy(self.simulation)
+
+            if target is not None:
+                self.simulation.player.attack(*target.position)
+
+
+def build_scenarios():
+    scenarios = [Scenario(f'map5_{count}_enemies', 'map5.tmx', count, shooting=True) for count in (50, 200, 1000)]
+
+    for weapon in weapons.WEAPONS:
+        scenarios.append(Scenario(f'weapon_{weapon.__name__}', 'map5.tmx', 50, weapon, shooting=True))
+
+    scenarios.append(Scenario('summoner_boss', 'boss.tmx', weapon=weapons.Shotgun, shooting=True))
+
+    return scenarios
+
+
+def run_scenario(scenario, frames, warmup, seed, draw):
+    random.seed(seed)
+    bullets.POOLS.clear()
+    textures.cache.clear()
+    scenario.setup()
+
+    timings = Timings()
+    originals = instrument(timings)
+    frame_times = []
+    subsystems = defaultdict(list)
+    camera = arcade.Camera2D() if draw is not None else None
+
+    try:
+        for frame in range(warmup + frames):
+            scenario.before_frame()
+            timings.take_frame()
+
+            start = time.perf_counter()
+            scenario.simulation.update(FIXED_DELTA)
+
+            if draw is not None:
+                draw.clear()
+                camera.position = scenario.simulation.player.position
+                camera.use()
+                scenario.simulation.draw_map(camera)
+                scenario.simulation.draw_sprites()
+                draw.ctx.finish()
+
+            elapsed = time.perf_counter() - start
+            frame_timings = timings.take_frame()
+
+            if frame < warmup:
+                continue
+
+            frame_times.append(elapsed)
+
+            for name in SUBSYSTEMS:
+                subsystems[name].append(frame_timings.get(name, 0))
+    finally:
+        restore(originals)
+
+    state = scenario.simulation.get_state()
+
+    return {
+        'name': scenario.name,
+        'map': scenario.map_name,
+        'weapon': scenario.weapon.__name__,
+        'frames': frames,
+        'enemies': state['enemies'],
+        'bullets': state['bullets'],
+        'frame_ms': summarize(frame_times),
+        'bullet_pools': bullets.get_pool_stats(),
+        'textures': textures.get_stats(),
+        'particles': scenario.simulation.particles.get_stats(),
+        'chunks': scenario.simulation.map_renderer.get_stats(),
+        'subsystems_ms': {name: summarize(values) for name, values in subsystems.items() if draw is not None or name != 'draw'},
+    }
+
+
+def get_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Combat benchmarks on top of the headless simulation.')
+    parser.add_argument('-k', '--filter', default='', help='run only scenarios whose name contains this string')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--draw', action='store_true', help='also time drawing (needs an OpenGL context)')
+    parser.add_argument('--list', action='store_true')
+    parser.add_argument('-o', '--output', help='write JSON results to this file instead of stdout')
+    args = parser.parse_args()
+
+    scenarios = [i for i in build_scenarios() if args.filter in i.name]
+
+    if args.list:
+        for i in scenarios:
+            print(i.name)
+        return
+
+    draw = arcade.Window(800, 600, 'KPK benchmark', visible=False) if args.draw else None
+
+    results = {
+        'commit': get_commit(),
+        'python': platform.python_version(),
+        'arcade': arcade.version.VERSION,
+        'seed': args.seed,
+        'scenarios': [],
+    }
+
+    for scenario in scenarios:
+        result = run_scenario(scenario, args.frames, args.warmup, args.seed, draw)
+        results['scenarios'].append(result)
+        print(f"{result['name']}: median {result['frame_ms']['median']} ms, p99 {result['frame_ms']['p99']} ms", file=sys.stderr)
+
+    text = json.dumps(results, indent=2, ensure_ascii=False)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,34 +1,121 @@
 import arcade
 import math
+import textures
+
+
+POOL_SIZE = 256
+
+
+class BulletPool:
+    def __init__(self, size=POOL_SIZE):
+        self.size = size
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self):
+        if self.free:
+            self.hits += 1
+            return self.free.pop()
+
+        self.misses += 1
+
+    def release(self, bullet):
+        if len(self.free) < self.size:
+            self.free.append(bullet)
+
+    def resize(self, size):
+        self.size = size
+        del self.free[size:]
+
+    def get_stats(self):
+        return {'size': self.size, 'free': len(self.free), 'hits': self.hits, 'misses': self.misses}
+
+
+POOLS = {}
+
+
+def get_pool(key):
+    if key not in POOLS:
+        POOLS[key] = BulletPool()
+
+    return POOLS[key]
+
+
+def set_pool_size(size):
+    global POOL_SIZE
+    POOL_SIZE = size
+
+    for pool in POOLS.values():
+        pool.resize(size)
+
+
+def get_pool_stats():
+    return {key.__name__: pool.get_stats() for key, pool in POOLS.items()}
 
 
 class BulletBase(arcade.Sprite):
     def __init__(self, texture, scale, x1, y1, x2, y2, damage, lifetime, speed):
         super().__init__(texture, scale, x1, y1)
+        self.attacked = set()
+        self.pool = None
+
+        self.reset(x1, y1, x2, y2, damage, lifetime, speed)
+
+    def reset(self, x1, y1, x2, y2, damage, lifetime, speed):
+        self.position = (x1, y1)
         self.angle = arcade.math.get_angle_degrees(x1, y1, x2, y2)
 
         self.damage = damage
         self.lifetime = lifetime
         self.speed = speed
         self.targets_damaged = 0
+        self.attacked.clear()
 
-    def update(self, delta_time):
-        self.center_x += math.sin(self.radians + math.radians(90)) * self.speed * delta_time
-        self.center_y += math.cos(self.radians + math.radians(90)) * self.speed * delta_time
-
-        self.lifetime -= delta_time
-
-        if self.lifetime <= 0:
-            self.kill()
+        self.manager = None
+        self.owner = None
+        self.faction = None
+        self.pierce = None
+        self.slot = None
 
     def get_damage(self):
         return self.damage
 
+    def get_motion(self):
+        radians = self.radians + math.radians(90)
+
+        return math.sin(radians) * self.speed, math.cos(radians) * self.speed, self.lifetime, None, 0
+
+    def kill(self):
+        if self.manager is not None:
+            self.manager.remove(self)
+        else:
+            super().kill()
+
+
+class AreaBullet(BulletBase):
+    def __init__(self, radius, color, x, y, damage, lifetime):
+        super().__init__(textures.circle(radius * 2, color), 1, x, y, x, y, damage, lifetime, 0)
+        self.alpha = 100
+
 
 class BoomBulletBase(BulletBase):
     def __init__(self, texture, scale, x1, y1, x2, y2, first_damage, second_damage, first_lifetime, second_lifetime, radius, speed):
         super().__init__(texture, scale, x1, y1, x2, y2, None, None, speed)
-        self.angle = arcade.math.get_angle_degrees(x1, y1, x2, y2)
+
+        self.first_phase_texture = self.texture
+        self.first_phase_scale = scale
+        self.second_phase_texture = textures.circle(radius * 2, (100, 51, 78))
+        self.phase = 1
+
+        self.reset_phases(first_damage, second_damage, first_lifetime, second_lifetime)
+
+    def reset_phases(self, first_damage, second_damage, first_lifetime, second_lifetime):
+        if self.phase != 1:
+            self.texture = self.first_phase_texture
+            self.sync_hit_box_to_texture()
+            self.alpha = 255
+            self.scale = self.first_phase_scale
 
         self.target_radians = self.radians + math.radians(90)
 
@@ -36,35 +123,22 @@ class BoomBulletBase(BulletBase):
         self.second_damage = second_damage
         self.first_lifetime = first_lifetime
         self.second_lifetime = second_lifetime
-        self.speed = speed
-        self.targets_damaged = 0
-        self.second_phase_texture = arcade.make_circle_texture(radius * 2, (100, 51, 78))
 
         self.want_boom = False
 
         self.phase = 1
 
-    def update(self, delta_time):
-        if self.phase == 1:
-            self.center_x += math.sin(self.target_radians) * self.speed * delta_time
-            self.center_y += math.cos(self.target_radians) * self.speed * delta_time
-            self.angle += 720 * delta_time
-
-            self.first_lifetime -= delta_time
-
-            if self.first_lifetime <= 0:
-                self.phase = 2
-                self.attacked = set()
-                self.want_boom = True
-                self.texture = self.second_phase_texture
-                self.sync_hit_box_to_texture()
-                self.alpha = 150
-                self.scale = 1
-        else:
-            self.second_lifetime -= delta_time
+    def start_second_phase(self):
+        self.phase = 2
+        self.attacked = set()
+        self.want_boom = True
+        self.texture = self.second_phase_texture
+        self.sync_hit_box_to_texture()
+        self.alpha = 150
+        self.scale = 1
 
-            if self.second_lifetime <= 0:
-                self.kill()
+    def get_motion(self):
+        return math.sin(self.target_radians) * self.speed, math.cos(self.target_radians) * self.speed, self.first_lifetime, self.second_lifetime, 720
 
     def get_damage(self):
         if self.phase == 1:
@@ -74,9 +148,18 @@ class BoomBulletBase(BulletBase):
 
 
 class SlipperBulletBase(BoomBulletBase):
-    def __init__(self, x1, y1, x2, y2, damage_mod=1):
+    def __init__(self, x1, y1, x2, y2, first_damage, second_damage):
+        super().__init__('assets/images/weapons/magic/slipper.png', 1.75, x1, y1, x2, y2, *self.get_phases(x1, y1, x2, y2, first_damage, second_damage), 80, 300)
+
+    def reuse(self, x1, y1, x2, y2, first_damage, second_damage):
+        self.reset(x1, y1, x2, y2, None, None, 300)
+        self.reset_phases(*self.get_phases(x1, y1, x2, y2, first_damage, second_damage))
+
+    @staticmethod
+    def get_phases(x1, y1, x2, y2, first_damage, second_damage):
         lifetime = arcade.math.get_distance(x1, y1, x2, y2) / 300 - 0.15
-        super().__init__('assets/images/weapons/magic/slipper.png', 1.75, x1, y1, x2, y2, 7 * damage_mod, 5 * damage_mod, lifetime, 0.75, 80, 300)
+
+        return first_damage, second_damage, lifetime, 0.75
 
 
 class Bullet:
@@ -87,66 +170,83 @@ class Bullet:
         self.lifetime = lifetime
         self.speed = speed
         self.color = (0, 0, 0)
+        self.pool = get_pool(type(self))
 
     def shoot(self, x1, y1, x2, y2):
-        return BulletBase(self.texture, self.scale, x1, y1, x2, y2, self.damage, self.lifetime, self.speed)
+        bullet = self.pool.acquire()
+
+        if bullet is None:
+            bullet = BulletBase(self.texture, self.scale, x1, y1, x2, y2, self.damage, self.lifetime, self.speed)
+            bullet.pool = self.pool
+        else:
+            bullet.reset(x1, y1, x2, y2, self.damage, self.lifetime, self.speed)
+
+        return bullet
 
 
 class NormalPistolBullet(Bullet):
-    def __init__(self):
-        super().__init__('assets/images/bullets/pistol_bullet.png', 1, 3, 1, 200)
+    def __init__(self, damage):
+        super().__init__('assets/images/bullets/pistol_bullet.png', 1, damage, 1, 200)
 
 
 class ModernPistolBullet(Bullet):
-    def __init__(self):
-        super().__init__('assets/images/bullets/pistol_bullet.png', 1.5, 4, 1.5, 250)
+    def __init__(self, damage):
+        super().__init__('assets/images/bullets/pistol_bullet.png', 1.5, damage, 1.5, 250)
 
 
 class PrimitiveSniperBullet(Bullet):
-    def __init__(self):
-        super().__init__('assets/images/bullets/upgraded_bullet.png', 1.5, 8, 1.5, 500)
+    def __init__(self, damage):
+        super().__init__('assets/images/bullets/upgraded_bullet.png', 1.5, damage, 1.5, 500)
 
 
 class SniperBullet(Bullet):
-    def __init__(self):
-        super().__init__('assets/images/bullets/insane_bullet.png', 1.5, 13, 1.5, 650)
+    def __init__(self, damage):
+        super().__init__('assets/images/bullets/insane_bullet.png', 1.5, damage, 1.5, 650)
 
 
 class SpreadingBullet(Bullet):
-    def __init__(self):
-        super().__init__('assets/images/bullets/upgraded_bullet.png', 1.75, 3, 1.25, 250)
+    def __init__(self, damage):
+        super().__init__('assets/images/bullets/upgraded_bullet.png', 1.75, damage, 1.25, 250)
 
 
 class GoodSpreadingBullet(Bullet):
-    def __init__(self):
-        super().__init__('assets/images/bullets/upgraded_bullet.png', 1.75, 4, 1.5, 275)
+    def __init__(self, damage):
+        super().__init__('assets/images/bullets/upgraded_bullet.png', 1.75, damage, 1.5, 275)
 
 
 class InsaneSpreadingBullet(Bullet):
-    def __init__(self):
-        super().__init__('assets/images/bullets/insane_bullet.png', 2, 5, 1.5, 300)
+    def __init__(self, damage):
+        super().__init__('assets/images/bullets/insane_bullet.png', 2, damage, 1.5, 300)
 
 
 class WaterBullet(Bullet):
-    def __init__(self):
-        super().__init__(arcade.make_soft_circle_texture(20, arcade.color.BLUE, 255, 50), 1, 3, 1.75, 125)
+    def __init__(self, damage):
+        super().__init__(textures.soft_circle(20, arcade.color.BLUE, 255, 50), 1, damage, 1.75, 125)
         self.color = arcade.color.BLUE
 
 
 class FireBullet(Bullet):
-    def __init__(self):
-        super().__init__(arcade.make_soft_circle_texture(20, arcade.color.RED, 255, 150), 1.2, 4, 2, 175)
+    def __init__(self, damage):
+        super().__init__(textures.soft_circle(20, arcade.color.RED, 255, 150), 1.2, damage, 2, 175)
         self.color = arcade.color.ORANGE
 
 
 class SlipperBullet:
-    def __init__(self, damage_mod=1):
-        self.damage_mod = damage_mod
-        self.first_damage = 7 * damage_mod
-        self.second_damage = 5 * damage_mod
+    def __init__(self, first_damage, second_damage):
+        self.first_damage = first_damage
+        self.second_damage = second_damage
+        self.pool = get_pool(type(self))
 
     def shoot(self, x1, y1, x2, y2):
-        return SlipperBulletBase(x1, y1, x2, y2, self.damage_mod)
+        bullet = self.pool.acquire()
+
+        if bullet is None:
+            bullet = SlipperBulletBase(x1, y1, x2, y2, self.first_damage, self.second_damage)
+            bullet.pool = self.pool
+        else:
+            bullet.reuse(x1, y1, x2, y2, self.first_damage, self.second_damage)
+
+        return bullet
 
 
 class NormalEnemyBullet(Bullet):
@@ -0,0 +1,98 @@
+import itertools
+
+import arcade
+
+
+CHUNK_TILES = 16
+ATLAS_SIZE = 2048
+
+chunk_ids = itertools.count()
+
+
+class ChunkRenderer:
+    def __init__(self, layers, width, height, tile_width, tile_height, chunk_tiles=CHUNK_TILES):
+        self.layers = layers
+        self.map_width = width * tile_width
+        self.map_height = height * tile_height
+        self.chunk_width = chunk_tiles * tile_width
+        self.chunk_height = chunk_tiles * tile_height
+
+        self.chunks = {}
+        self.colors = None
+        self.baked = False
+        self.drawn = 0
+
+    def get_chunk(self, x, y):
+        return int(x // self.chunk_width), int(y // self.chunk_height)
+
+    def get_colors(self):
+        return [tuple(i.color) for i in self.layers]
+
+    def bake(self):
+        groups = {}
+
+        for n, layer in enumerate(self.layers):
+            for sprite in layer:
+                chunk = self.get_chunk(sprite.center_x, sprite.center_y)
+
+                if chunk not in groups:
+                    groups[chunk] = [arcade.SpriteList() for _ in self.layers]
+
+                groups[chunk][n].append(sprite)
+
+        per_atlas = max(ATLAS_SIZE // self.chunk_width, 1) * max(ATLAS_SIZE // self.chunk_height, 1)
+        atlas = None
+        self.chunks = {}
+
+        for i, ((x, y), layers) in enumerate(sorted(groups.items())):
+            if i % per_atlas == 0:
+                atlas = arcade.DefaultTextureAtlas((ATLAS_SIZE, ATLAS_SIZE), border=0, capacity=1)
+
+            left = x * self.chunk_width
+            bottom = y * self.chunk_height
+            width = int(min(self.chunk_width, self.map_width - left))
+            height = int(min(self.chunk_height, self.map_height - bottom))
+
+            texture = arcade.Texture.create_empty(f'chunk-{next(chunk_ids)}', (width, height))
+
+            chunk = arcade.SpriteList(atlas=atlas)
+            chunk.append(arcade.Sprite(texture, center_x=left + width / 2, center_y=bottom + height / 2))
+
+            with atlas.render_into(texture, projection=(left, left + width, bottom, bottom + height)) as fbo:
+                fbo.clear()
+
+                for source, sprites in zip(self.layers, layers):
+                    sprites.color = source.color
+                    sprites.draw()
+                    sprites.clear()
+
+            self.chunks[(x, y)] = chunk
+
+        self.colors = self.get_colors()
+        self.baked = True
+
+    def get_visible(self, camera):
+        if camera is None:
+            return list(self.chunks.values())
+
+        x1, y1 = self.get_chunk(*camera.bottom_left)
+        x2, y2 = self.get_chunk(*camera.top_right)
+
+        return [self.chunks[(x, y)] for x in range(x1, x2 + 1) for y in range(y1, y2 + 1) if (x, y) in self.chunks]
+
+    def draw(self, camera=None):
+        if not self.baked or self.colors != self.get_colors():
+            self.bake()
+
+        visible = self.get_visible(camera)
+
+        for chunk in visible:
+            chunk.draw(pixelated=True)
+
+        self.drawn = len(visible)
+
+    def get_stats(self):
+        return {
+            'chunks': len(self.chunks),
+            'drawn': self.drawn,
+        }
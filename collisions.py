@@ -0,0 +1,55 @@
+import math
+
+import arcade
+
+
+class SpatialGrid:
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def get_cells(self, sprite):
+        half = math.hypot(sprite.width, sprite.height) / 2
+        size = self.cell_size
+
+        x1 = int((sprite.center_x - half) // size)
+        x2 = int((sprite.center_x + half) // size)
+        y1 = int((sprite.center_y - half) // size)
+        y2 = int((sprite.center_y + half) // size)
+
+        return [(x, y) for x in range(x1, x2 + 1) for y in range(y1, y2 + 1)]
+
+    def rebuild(self, sprites):
+        cells = {}
+
+        for sprite in sprites:
+            for cell in self.get_cells(sprite):
+                if cell in cells:
+                    cells[cell].append(sprite)
+                else:
+                    cells[cell] = [sprite]
+
+        self.cells = cells
+
+    def query(self, sprite):
+        cells = self.get_cells(sprite)
+
+        if len(cells) == 1:
+            return self.cells.get(cells[0], [])
+
+        found = {}
+
+        for cell in cells:
+            for i in self.cells.get(cell, ()):
+                found[id(i)] = i
+
+        return list(found.values())
+
+    def check(self, sprite):
+        return [i for i in self.query(sprite) if i.sprite_lists and arcade.check_for_collision(sprite, i)]
+
+    def get_pairs(self, sprites):
+        return [(sprite, i) for sprite in sprites for i in self.query(sprite)]
+
+    def check_pairs(self, sprites):
+        return [(sprite, i) for sprite, i in self.get_pairs(sprites) if arcade.check_for_collision(sprite, i)]
@@ -1,41 +1,22 @@
 import arcade
-import arcade.particles
 import math
 import bullets
-import random
+import particles
+import projectiles
+import textures
 
 
 def make_explosion(x, y, texture, count=80):
-    return arcade.particles.Emitter(
-        center_xy=(x, y),
-        emit_controller=arcade.particles.EmitBurst(count),
-        particle_factory=lambda e: arcade.particles.FadeParticle(
-            filename_or_texture=texture,
-            change_xy=arcade.math.rand_in_circle((0.0, 0.0), 5.0),
-            lifetime=random.uniform(0.3, 0.6),
-            start_alpha=255, end_alpha=0,
-            scale=random.uniform(0.35, 0.6)
-        ),
-    )
+    return particles.Emitter(x, y, texture, count, 5.0, (0.3, 0.6), (0.35, 0.6))
 
 
 def make_big_explosion(x, y, texture, count=80):
-    return arcade.particles.Emitter(
-        center_xy=(x, y),
-        emit_controller=arcade.particles.EmitBurst(count),
-        particle_factory=lambda e: arcade.particles.FadeParticle(
-            filename_or_texture=texture,
-            change_xy=arcade.math.rand_in_circle((0.0, 0.0), 10.0),
-            lifetime=random.uniform(0.5, 2),
-            start_alpha=255, end_alpha=0,
-            scale=random.uniform(0.35, 0.6)
-        ),
-    )
+    return particles.Emitter(x, y, texture, count, 10.0, (0.5, 2), (0.35, 0.6))
 
 
 class BasicEnemy(arcade.Sprite):
     def __init__(self, texture, scale, center_x, center_y, damage, reload, health, speed, active, player, color, level):
-        super().__init__(texture, scale, center_x, center_y)
+        super().__init__(textures.load(texture), scale, center_x, center_y)
         self.damage = damage
         self.reload = reload
         self.time_left = 0
@@ -61,23 +42,30 @@ class BasicEnemy(arcade.Sprite):
 
     def get_move(self):
         if self.active:
-            angle = arcade.math.get_angle_radians(*self.position, *self.player.position)
-            move_x = math.sin(angle) * self.speed
-            move_y = math.cos(angle) * self.speed
+            x, y = self.get_direction()
 
-            return move_x, move_y
+            return x * self.speed, y * self.speed
 
         return 0, 0
 
+    def get_direction(self):
+        direction = self.player.flow_field.get_direction(*self.position)
+
+        if direction is None:
+            angle = arcade.math.get_angle_radians(*self.position, *self.player.position)
+            return math.sin(angle), math.cos(angle)
+
+        return direction
+
     def hurt(self, damage):
         if self.active:
             self.health -= damage
 
             if self.health <= 0:
                 self.kill()
-                self.player.emitters.append(make_explosion(self.center_x, self.center_y, arcade.make_circle_texture(10, self.color), 20))
+                self.player.particles.add(make_explosion(self.center_x, self.center_y, textures.circle(10, self.color), 20))
             else:
-                self.player.emitters.append(make_explosion(self.center_x, self.center_y, arcade.make_circle_texture(8, self.color), 5))
+                self.player.particles.add(make_explosion(self.center_x, self.center_y, textures.circle(8, self.color), 5))
 
     def attack(self):
         if self.time_left <= 0:
@@ -114,14 +102,12 @@ class BasicShootingEnemy(BasicEnemy):
 
         self.distance = distance
         self.attack_distance = attack_distance
-        self.weapon = arcade.Sprite(weapon_texture, 1.2, center_x + x, center_y + y)
-        self.source_texture = arcade.load_texture(weapon_texture)
+        self.weapon = arcade.Sprite(textures.load(weapon_texture), 1.2, center_x + x, center_y + y)
+        self.source_texture = textures.load(weapon_texture)
         self.player.weapons_list.append(self.weapon)
 
-        self.bullets_list = arcade.SpriteList()
         self.bullet = bullet
         self.attacking = False
-        self.player.bullets_list.append(self.bullets_list)
 
         self.bullet.damage = self.damage
 
@@ -144,13 +130,6 @@ class BasicShootingEnemy(BasicEnemy):
                 self.weapon.center_x = self.center_x + self.r_d * math.sin(self.weapon.radians + math.radians(90))
                 self.weapon.center_y = self.center_y + self.r_d * math.cos(self.weapon.radians + math.radians(90))
 
-            for bullet in self.bullets_list.sprite_list:
-                if arcade.check_for_collision(bullet, self.player):
-                    self.player.hurt(bullet.get_damage())
-                    bullet.kill()
-
-            self.bullets_list.update(delta_time)
-
             if self.time_left > 0:
                 self.time_left -= delta_time
             else:
@@ -158,11 +137,9 @@ class BasicShootingEnemy(BasicEnemy):
 
     def get_move(self, distance):
         if self.active and distance > self.distance:
-            angle = arcade.math.get_angle_radians(*self.position, *self.player.position)
-            move_x = math.sin(angle) * self.speed
-            move_y = math.cos(angle) * self.speed
+            x, y = self.get_direction()
 
-            return move_x, move_y
+            return x * self.speed, y * self.speed
 
         return 0, 0
 
@@ -176,24 +153,19 @@ class BasicShootingEnemy(BasicEnemy):
             if -90 < self.weapon.angle < 90:
                 self.weapon.texture = self.source_texture
             else:
-                self.weapon.texture = self.source_texture.flip_vertically()
+                self.weapon.texture = textures.flipped(self.source_texture)
 
             self.weapon.center_x = self.center_x + self.r_d * math.sin(self.weapon.radians + math.radians(90))
             self.weapon.center_y = self.center_y + self.r_d * math.cos(self.weapon.radians + math.radians(90))
 
             bullet = self.bullet.shoot(self.center_x, self.center_y, self.player.center_x, self.player.center_y)
             bullet.position = self.weapon.position
-            self.bullets_list.append(bullet)
+            self.player.projectiles.add(bullet, self, projectiles.ENEMY)
 
     def kill(self):
         super().kill()
         self.weapon.kill()
-
-        for i in self.bullets_list.sprite_list:
-            i.remove_from_sprite_lists()
-            i.kill()
-
-        del self.player.bullets_list[self.player.bullets_list.index(self.bullets_list)]
+        self.player.projectiles.remove_owner(self)
 
 
 class ShootingEnemy(BasicShootingEnemy):
@@ -256,7 +228,7 @@ class ShotgunEnemy(BasicShootingEnemy):
             if -90 < self.weapon.angle < 90:
                 self.weapon.texture = self.source_texture
             else:
-                self.weapon.texture = self.source_texture.flip_vertically()
+                self.weapon.texture = textures.flipped(self.source_texture)
 
             self.weapon.center_x = self.center_x + self.r_d * math.sin(self.weapon.radians + math.radians(90))
             self.weapon.center_y = self.center_y + self.r_d * math.cos(self.weapon.radians + math.radians(90))
@@ -269,7 +241,7 @@ class ShotgunEnemy(BasicShootingEnemy):
             for x, y in targets:
                 bullet = self.bullet.shoot(self.center_x, self.center_y, x, y)
                 bullet.position = self.weapon.position
-                self.bullets_list.append(bullet)
+                self.player.projectiles.add(bullet, self, projectiles.ENEMY)
 
 
 class BasicSwordEnemy(BasicEnemy):
@@ -279,7 +251,7 @@ class BasicSwordEnemy(BasicEnemy):
         self.y = y
 
         self.attack_distance = attack_distance
-        self.weapon = arcade.Sprite(weapon_texture, 1.2, center_x + x, center_y + y)
+        self.weapon = arcade.Sprite(textures.load(weapon_texture), 1.2, center_x + x, center_y + y)
         self.player.weapons_list.append(self.weapon)
 
         self.attacking = False
@@ -321,11 +293,9 @@ class BasicSwordEnemy(BasicEnemy):
 
     def get_move(self):
         if self.active:
-            angle = arcade.math.get_angle_radians(*self.position, *self.player.position)
-            move_x = math.sin(angle) * self.speed
-            move_y = math.cos(angle) * self.speed
+            x, y = self.get_direction()
 
-            return move_x, move_y
+            return x * self.speed, y * self.speed
 
         return 0, 0
 
@@ -374,11 +344,10 @@ class SummonerBoss(BasicEnemy):
         self.reload_summon = 2
         self.reload_summon_now = self.reload_summon
 
-        self.reload_tp_now = random.randint(5, 10)
+        self.rng = player.seeds.get('ai')
+        self.reload_tp_now = self.rng.randint(5, 10)
 
         self.bullet = bullets.SummonerBossBullet()
-        self.bullets_list = arcade.SpriteList()
-        self.player.bullets_list.append(self.bullets_list)
 
         self.x1 = x1 + self.width / 2
         self.x2 = x2 - self.width / 2
@@ -400,7 +369,7 @@ class SummonerBoss(BasicEnemy):
                 self.reload_tp_now -= delta_time
             else:
                 self.tp()
-                self.reload_tp_now = random.randint(5, 10)
+                self.reload_tp_now = self.rng.randint(5, 10)
 
             if self.reload_summon_now > 0:
                 self.reload_summon_now -= delta_time
@@ -411,36 +380,27 @@ class SummonerBoss(BasicEnemy):
             if self.time_left > 0:
                 self.time_left -= delta_time
 
-            self.bullets_list.update(delta_time)
-
-            for bullet in self.bullets_list.sprite_list:
-                if arcade.check_for_collision(bullet, self.player):
-                    self.player.hurt(bullet.get_damage())
-                    bullet.kill()
-
             self.attack()
 
     def shoot(self):
         bullet = self.bullet.shoot(self.center_x, self.center_y, self.player.center_x, self.player.center_y)
-        self.bullets_list.append(bullet)
+        self.player.projectiles.add(bullet, self, projectiles.ENEMY)
 
     def tp(self):
-        x = random.choice([self.x1, self.x2])
-        y = random.choice([self.y1, self.y2])
+        x = self.rng.choice([self.x1, self.x2])
+        y = self.rng.choice([self.y1, self.y2])
 
         self.physics_engines[0].set_position(self, (x, y))
 
     def summon(self):
-        x = random.choice([self.x1, self.x2])
-        y = random.choice([self.y1, self.y2])
+        x = self.rng.choice([self.x1, self.x2])
+        y = self.rng.choice([self.y1, self.y2])
 
-        enemy = Enemy(x, y, True, self.player, self.color, self.level)
-        self.physics_engines[0].add_sprite(enemy, 1, 0, moment_of_inertia=arcade.PymunkPhysicsEngine.MOMENT_INF, collision_type='enemy')
-        self.player.enemies_list.append(enemy)
+        self.player.spawn_enemy(Enemy, x, y, True, self.room)
 
     def kill(self):
         super().kill()
-        self.bullets_list.clear()
+        self.player.projectiles.remove_owner(self)
 
     def hurt(self, damage):
         if self.active:
@@ -448,9 +408,9 @@ class SummonerBoss(BasicEnemy):
 
             if self.health <= 0:
                 self.kill()
-                self.player.emitters.append(make_big_explosion(self.center_x, self.center_y, arcade.make_circle_texture(35, self.color), 40))
+                self.player.particles.add(make_big_explosion(self.center_x, self.center_y, textures.circle(35, self.color), 40))
             else:
-                self.player.emitters.append(make_explosion(self.center_x, self.center_y, arcade.make_circle_texture(8, self.color), 5))
+                self.player.particles.add(make_explosion(self.center_x, self.center_y, textures.circle(8, self.color), 5))
 
 
 NORMAL_ENEMIES = [Enemy, FastEnemy, SlowEnemy, ShootingEnemy, DashingEnemy]
@@ -0,0 +1,203 @@
+import json
+import os
+import shutil
+import time
+
+import saves
+
+
+GRAPH_PATH = os.path.join('data', 'galaxy.json')
+JOURNAL_PATH = os.path.join('data', 'galaxy.log')
+SEED_PATH = os.path.join('assets', 'levels', 'level_graph.json')
+COMPACT_RECORDS = 256
+
+
+def dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+class GraphStore:
+    def __init__(self, path=GRAPH_PATH, journal_path=JOURNAL_PATH, seed_path=SEED_PATH):
+        self.path = path
+        self.journal_path = journal_path
+        self.seed_path = seed_path
+        self.graph = None
+        self.generation = 0
+        self.records = 0
+        self.compacted = False
+
+        self.loads = 0
+        self.appends = 0
+        self.compactions = 0
+        self.errors = 0
+        self.written = 0
+        self.load_ms = None
+        self.write_ms = None
+
+    def read_base(self):
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            self.errors += 1
+            self.backup()
+            return None
+
+        if not isinstance(data, dict) or not isinstance(data.get('nodes'), list):
+            self.errors += 1
+            self.backup()
+            return None
+
+        return data
+
+    def read_journal(self):
+        records = []
+
+        try:
+            with open(self.journal_path, encoding='utf-8') as file:
+                lines = file.read().split('\n')
+        except FileNotFoundError:
+            return records, True
+        except OSError:
+            self.errors += 1
+            return records, False
+
+        for line in lines:
+            if not line:
+                continue
+
+            try:
+                record = json.loads(line)
+            except ValueError:
+                return records, False
+
+            if record[0] == self.generation:
+                records.append(record[1:])
+
+        return records, True
+
+    def read_seed(self, graph):
+        with open(self.seed_path, encoding='utf-8') as file:
+            graph.load_dict(json.load(file))
+
+    def backup(self):
+        try:
+            shutil.copyfile(self.path, self.path + '.bak')
+        except OSError:
+            pass
+
+    def load(self, factory):
+        if self.graph is not None:
+            return self.graph
+
+        start = time.perf_counter()
+        self.loads += 1
+
+        graph = factory()
+        data = self.read_base()
+
+        if data is not None:
+            self.generation = data.get('generation', 0)
+            graph.load_dict(data)
+            records, complete = self.read_journal()
+
+            try:
+                for record in records:
+                    graph.apply_change(record)
+            except (IndexError, KeyError, TypeError, ValueError):
+                self.errors += 1
+                complete = False
+
+            self.records = len(records)
+            self.compacted = complete
+        else:
+            try:
+                self.read_seed(graph)
+            except (OSError, ValueError, KeyError, TypeError):
+                graph = factory()
+                graph.create_default_graph()
+
+            self.compacted = False
+
+        graph.changes.clear()
+        self.graph = graph
+        self.load_ms = round((time.perf_counter() - start) * 1000, 3)
+
+        return graph
+
+    def save(self, graph):
+        if graph is not self.graph:
+            self.graph = graph
+            self.compacted = False
+
+        start = time.perf_counter()
+
+        if not self.compacted or self.records + len(graph.changes) > COMPACT_RECORDS:
+            self.compact(graph)
+        elif graph.changes:
+            self.append(graph.changes)
+        else:
+            return
+
+        graph.changes.clear()
+        self.write_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    def append(self, changes):
+        text = ''.join(dumps([self.generation] + change) + '\n' for change in changes)
+
+        try:
+            os.makedirs(os.path.dirname(self.journal_path) or '.', exist_ok=True)
+
+            with open(self.journal_path, 'a', encoding='utf-8') as file:
+                file.write(text)
+                file.flush()
+                os.fsync(file.fileno())
+        except OSError:
+            self.errors += 1
+            self.compacted = False
+            return
+
+        self.records += len(changes)
+        self.appends += 1
+        self.written += len(text)
+
+    def compact(self, graph):
+        data = graph.to_dict()
+        data['generation'] = self.generation + 1
+        text = dumps(data)
+
+        try:
+            saves.write_atomic(self.path, text)
+        except OSError:
+            self.errors += 1
+            return
+
+        self.generation += 1
+        self.records = 0
+        self.compacted = True
+        self.compactions += 1
+        self.written += len(text)
+
+        try:
+            os.remove(self.journal_path)
+        except OSError:
+            pass
+
+    def get_stats(self):
+        return {
+            'nodes': len(self.graph.nodes) if self.graph else 0,
+            'generation': self.generation,
+            'records': self.records,
+            'loads': self.loads,
+            'appends': self.appends,
+            'compactions': self.compactions,
+            'errors': self.errors,
+            'bytes': self.written,
+            'load_ms': self.load_ms,
+            'write_ms': self.write_ms,
+        }
+
+
+store = GraphStore()
@@ -0,0 +1,59 @@
+import arcade
+
+
+class HudText:
+    def __init__(self, x, y, batch, fmt='{}', **kwargs):
+        self.fmt = fmt
+        self.label = arcade.Text('', x, y, batch=batch, **kwargs)
+        self.values = None
+        self.visible = True
+        self.updates = 0
+
+    def set(self, *values):
+        if values != self.values:
+            self.values = values
+            self.label.text = self.fmt.format(*values)
+            self.updates += 1
+
+        self.show()
+
+    def move(self, x, y):
+        if (x, y) != (self.label.x, self.label.y):
+            self.label.position = (x, y)
+
+    def show(self):
+        if not self.visible:
+            self.label.visible = True
+            self.visible = True
+
+    def hide(self):
+        if self.visible:
+            self.label.visible = False
+            self.visible = False
+
+
+class TextLines:
+    def __init__(self, x, y, step, batch, **kwargs):
+        self.x = x
+        self.y = y
+        self.step = step
+        self.batch = batch
+        self.kwargs = kwargs
+        self.lines = []
+
+    def set(self, lines):
+        while len(self.lines) < len(lines):
+            self.lines.append(HudText(self.x, self.y + self.step * len(self.lines), self.batch, **self.kwargs))
+
+        for line, text in zip(self.lines, lines):
+            line.set(text)
+
+        for line in self.lines[len(lines):]:
+            line.hide()
+
+    def hide(self):
+        for line in self.lines:
+            line.hide()
+
+    def get_updates(self):
+        return sum(i.updates for i in self.lines)
@@ -1,12 +1,13 @@
 import arcade
-import random
+import math
 import weapons
 import armor
+import textures
 
 
 class Item(arcade.Sprite):
     def __init__(self, texture, scale, x, y):
-        super().__init__(texture, scale, x, y)
+        super().__init__(textures.load(texture), scale, x, y)
 
     def activate(self):
         pass
@@ -14,14 +15,7 @@ class Item(arcade.Sprite):
 
 class WeaponItem(Item):
     def __init__(self, weapon, x, y, player, level):
-        weaponex = weapon(player, 1)
-
-        try:
-            texture = weaponex.source_texture
-        except AttributeError:
-            texture = weaponex.texture
-
-        super().__init__(texture, weaponex.scale, x, y)
+        super().__init__(weapon.texture_path, weapon.item_scale, x, y)
 
         self.weapon = weapon
         self.player = player
@@ -38,14 +32,7 @@ class WeaponItem(Item):
 
 class ArmorItem(Item):
     def __init__(self, armor, x, y, player, level):
-        armorex = armor(player, 1)
-
-        try:
-            texture = armorex.source_texture
-        except AttributeError:
-            texture = armorex.texture
-
-        super().__init__(texture, armorex.scale, x, y)
+        super().__init__(armor.texture_path, player.scale, x, y)
 
         self.armor = armor
         self.player = player
@@ -68,28 +55,32 @@ class Chest(Item):
 
     def activate(self):
         loot = self.get_loot()
+        rng = self.player.seeds.get('loot')
 
         for i in loot:
-            i.position = arcade.math.rand_in_circle((self.center_x, self.center_y), 100)
+            angle = rng.uniform(0, 2 * math.pi)
+            distance = 100 * math.sqrt(rng.random())
+            i.position = (self.center_x + distance * math.cos(angle), self.center_y + distance * math.sin(angle))
             self.player.items_list.append(i)
 
         self.kill()
 
     def get_loot(self):
         loot = []
+        rng = self.player.seeds.get('loot')
 
         min_level = max([self.level - 2, 1])
         max_level = min([self.level + 2, 100])
 
-        weaponss = random.randint(0, 2)
-        armors = random.randint(0, 2)
-        money_count = random.randint(1, 10 + self.player.modifiers.get('lucky', 0))
-        upgrade_crystals = random.randint(0, 1)
+        weaponss = rng.randint(0, 2)
+        armors = rng.randint(0, 2)
+        money_count = rng.randint(1, 10 + self.player.modifiers.get('lucky', 0))
+        upgrade_crystals = rng.randint(0, 1)
 
         for _ in range(weaponss):
-            level = random.randint(min_level, max_level)
+            level = rng.randint(min_level, max_level)
 
-            rarity = random.random()
+            rarity = rng.random()
             lucky = self.player.modifiers.get('lucky', 0) * 0.01
 
             if rarity < 0.3 - lucky:
@@ -103,12 +94,12 @@ class Chest(Item):
             else:
                 rarity = 5
 
-            loot.append(WeaponItem(random.choice(weapons.RARITY_TO_WEAPONS[rarity]), self.center_x, self.center_y, self.player, level))
+            loot.append(WeaponItem(rng.choice(weapons.RARITY_TO_WEAPONS[rarity]), self.center_x, self.center_y, self.player, level))
 
         for _ in range(armors):
-            level = random.randint(min_level, max_level)
+            level = rng.randint(min_level, max_level)
 
-            rarity = random.random()
+            rarity = rng.random()
             lucky = self.player.modifiers.get('lucky', 0) * 0.01
 
             if rarity < 0.3 - lucky:
@@ -122,7 +113,7 @@ class Chest(Item):
             else:
                 rarity = 5
 
-            loot.append(ArmorItem(random.choice(armor.RARITY_TO_ARMOR[rarity]), self.center_x, self.center_y, self.player, level))
+            loot.append(ArmorItem(rng.choice(armor.RARITY_TO_ARMOR[rarity]), self.center_x, self.center_y, self.player, level))
 
         for _ in range(money_count):
             loot.append(Money(1, self.center_x, self.center_y, self.player))
@@ -130,7 +121,7 @@ class Chest(Item):
         for _ in range(upgrade_crystals):
             loot.append(UpgradeCrystal(1.5, self.center_x, self.center_y, self.player))
 
-        loot.append(random.choice([Olyvie, Donut, Heart])(1.5, self.center_x, self.center_y, self.player))
+        loot.append(rng.choice([Olyvie, Donut, Heart])(1.5, self.center_x, self.center_y, self.player))
 
         return loot
 
@@ -0,0 +1,103 @@
+import glob
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import audio
+import textures
+import tilemaps
+
+
+MAPS_DIR = 'assets/tilesets/maps/'
+TEXTURE_DIRS = ['assets/images/enemies', 'assets/images/gui', 'assets/images/items', 'assets/images/weapons']
+
+
+def get_texture_paths():
+    return sorted(i.replace(os.sep, '/') for directory in TEXTURE_DIRS for i in glob.glob(f'{directory}/**/*.png', recursive=True))
+
+
+def prepare(path):
+    start = time.perf_counter()
+    tilemap = tilemaps.load_map(path, lazy=True)
+
+    for texture_path in get_texture_paths():
+        textures.load(texture_path)
+
+    return tilemap, (time.perf_counter() - start) * 1000
+
+
+class Landing:
+    def __init__(self, level_id, map_name, color, music):
+        self.level_id = level_id
+        self.map_name = map_name
+        self.color = color
+        self.music = music
+        self.tilemap = None
+        self.future = None
+
+    def is_ready(self):
+        return self.future is None or self.future.done()
+
+
+class Preloader:
+    def __init__(self):
+        self.landings = {}
+        self.executor = None
+
+        self.prepared = 0
+        self.ready = 0
+        self.waits = 0
+        self.errors = 0
+        self.prepare_ms = None
+        self.wait_ms = None
+
+    def prepare(self, level_id, map_name, color, music):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='landing')
+
+        landing = self.landings[level_id] = Landing(level_id, map_name, color, music)
+        landing.future = self.executor.submit(prepare, MAPS_DIR + map_name)
+        audio.preload(music)
+        self.prepared += 1
+
+        return landing
+
+    def get(self, level_id):
+        return self.landings.get(level_id)
+
+    def wait(self, landing):
+        start = time.perf_counter()
+
+        if landing.is_ready():
+            self.ready += 1
+        else:
+            self.waits += 1
+
+        try:
+            landing.tilemap, self.prepare_ms = landing.future.result()
+        except Exception:
+            self.errors += 1
+
+        self.wait_ms = round((time.perf_counter() - start) * 1000, 3)
+
+        return landing.tilemap
+
+    def clear(self):
+        for landing in self.landings.values():
+            landing.future.cancel()
+
+        self.landings = {}
+
+    def get_stats(self):
+        return {
+            'pending': sum(1 for i in self.landings.values() if not i.is_ready()),
+            'prepared': self.prepared,
+            'ready': self.ready,
+            'waits': self.waits,
+            'errors': self.errors,
+            'prepare_ms': round(self.prepare_ms, 3) if self.prepare_ms is not None else None,
+            'wait_ms': self.wait_ms,
+        }
+
+
+preloader = Preloader()
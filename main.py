@@ -1,91 +1,56 @@
-import os
-
 import arcade
 from pyglet.graphics import Batch
 from pyglet.image import load as load_image
 
 import armor
-import enemies
+import audio
+import galaxy
+import hud
 import items
+import replays
+import saves
+import seeds
+import snapshots
+import textures
+import tilemaps
 import weapons
-import random
+from simulation import Simulation, get_loadout
 
 from arcade.gui import UIManager, UITextureButton, UIMessageBox
 from arcade.gui.widgets.layout import UIAnchorLayout, UIBoxLayout
 
 
-if not os.path.exists('assets/levels'):
-    os.makedirs('assets/levels')
-
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 SCREEN_TITLE = 'KPK'
 
 
 def get_shards():
-    try:
-        with open('data/data.txt') as file:
-            return int(file.readline().rstrip('\n'))
-    except Exception:
-        try:
-            os.mkdir('data')
-        except FileExistsError:
-            pass
-
-        with open('data/data.txt', 'w') as file:
-            file.writelines(['0\n'] * 6)
-
-        return 0
+    return saves.manager.get_shards()
 
 
 def get_attrs(native=True):
-    try:
-        with open('data/data.txt') as file:
-            fin = [int(i) for i in file.read().split('\n')[1:6]]
+    fin = saves.manager.get_upgrades()
 
-            if len(fin) != 5:
-                raise Exception
+    if native:
+        return fin
+    else:
+        fin[0] = 1 + fin[0] * 0.1
+        fin[1] = 1 + fin[1] * 0.1
+        fin[3] = 1 + fin[3] * 0.1
+
+        if fin[2] == 0:
+            fin[2] = 1
+        elif fin[2] == 3:
+            fin[2] = 2
+        elif fin[2] == 5:
+            fin[2] = 3
 
-            if native:
-                return fin
-            else:
-                fin[0] = 1 + fin[0] * 0.1
-                fin[1] = 1 + fin[1] * 0.1
-                fin[3] = 1 + fin[3] * 0.1
-
-                if fin[2] == 0:
-                    fin[2] = 1
-                elif fin[2] == 3:
-                    fin[2] = 2
-                elif fin[2] == 5:
-                    fin[2] = 3
-
-                return fin
-    except Exception:
-        try:
-            os.mkdir('data')
-        except FileExistsError:
-            pass
-
-        with open('data/data.txt', 'w') as file:
-            file.writelines(['0\n'] * 6)
-
-        if native:
-            return [0] * 5
-        else:
-            return [1] * 5
+        return fin
 
 
 def write_to_file(data):
-    try:
-        os.mkdir('data')
-    except FileExistsError:
-        pass
-    
-    data = [str(i) + '\n' for i in data]
-
-    with open('data/data.txt', 'w') as file:
-        file.writelines(data)
+    saves.manager.set(data[0], data[1:])
 
 
 class StartScreen(arcade.View):
@@ -97,10 +62,10 @@ class StartScreen(arcade.View):
     def setup(self):
         game_name = 'KPK'
 
-        self.phone_texture = arcade.load_texture('assets/images/gui/start_picture.png')
+        self.phone_texture = textures.load('assets/images/gui/start_picture.png')
         self.phone_rect = arcade.Rect(0, self.width, 0, self.height, self.width, self.height, self.width / 2, self.height / 2)
-        self.button_texture = arcade.load_texture('assets/images/gui/start_button.png')
-        self.button_texture_hovered = arcade.load_texture('assets/images/gui/hovered_start_button.png')
+        self.button_texture = textures.load('assets/images/gui/start_button.png')
+        self.button_texture_hovered = textures.load('assets/images/gui/hovered_start_button.png')
 
         self.text = arcade.Text(game_name, 50, 530, arcade.color.WHITE, 40, batch=self.batch)
 
@@ -120,6 +85,11 @@ class StartScreen(arcade.View):
         self.start_button.on_click = self.start_game
         self.box_layout.add(self.start_button)
 
+        if snapshots.exists():
+            self.resume_button = UITextureButton(texture=self.button_texture, texture_hovered=self.button_texture_hovered, text='Продолжить')
+            self.resume_button.on_click = self.resume_game
+            self.box_layout.add(self.resume_button)
+
         self.exit_button = UITextureButton(texture=self.button_texture, texture_hovered=self.button_texture_hovered, text='Выход')
         self.exit_button.on_click = lambda x: arcade.exit()
         self.box_layout.add(self.exit_button)
@@ -137,6 +107,13 @@ class StartScreen(arcade.View):
         self.manager.disable()
         self.window.show_view(game)
 
+    def resume_game(self, *args):
+        game = resume_run()
+
+        if game is not None:
+            self.manager.disable()
+            self.window.show_view(game)
+
 
 class StartLocation(arcade.View):
     def __init__(self):
@@ -144,7 +121,7 @@ class StartLocation(arcade.View):
         self.batch = Batch()
         
     def setup(self):
-        self.tilemap = arcade.load_tilemap('assets/tilesets/start_tilemap.tmx', 0.75)
+        self.tilemap = tilemaps.load_map('assets/tilesets/start_tilemap.tmx', 0.75)
 
         self.base_tiles = self.tilemap.sprite_lists['base']
         self.collision_tiles = self.tilemap.sprite_lists['collision']
@@ -169,8 +146,10 @@ class StartLocation(arcade.View):
         self.world_camera = arcade.camera.Camera2D() 
         self.world_camera.position = self.player.position
 
-        self.music = arcade.load_sound('assets/music/menu.mp3')
-        self.music_player = self.music.play(1, loop=True)
+        audio.play_music('assets/music/menu.mp3')
+
+        for i in range(1, 4):
+            audio.preload(f'assets/music/music{i}.mp3')
 
         self.upgrade_pos = (1080, 804)
         self.start_pos = (864, 1200)
@@ -221,7 +200,7 @@ class StartLocation(arcade.View):
 
         if not self.stop_game:
             if symbol == arcade.key.ESCAPE:
-                arcade.stop_sound(self.music_player)
+                audio.stop_music()
                 self.world_camera.position = self.width / 2, self.height / 2
                 game = StartScreen()
                 self.manager.disable()
@@ -258,7 +237,6 @@ class StartLocation(arcade.View):
             self.stop_game = False
     
     def start(self):
-        arcade.stop_sound(self.music_player)
         mods = get_attrs(False)
 
         upgrade_shards = get_shards()
@@ -267,8 +245,9 @@ class StartLocation(arcade.View):
         for key, value in zip(['damage', 'health', 'inventory', 'speed', 'lucky'], mods):
             modifiers[key] = value
 
-        color = arcade.color.BLACK.from_iterable((random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)))
-        mapp = random.choice(["map1.tmx", "map2.tmx"])
+        rng = seeds.start_run().get('landing')
+        color = arcade.color.BLACK.from_iterable((rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)))
+        mapp = rng.choice(["map1.tmx", "map2.tmx"])
 
         game = Game(mapp, 0, upgrade_shards, modifiers, [(weapons.OldPistol, 5)], (None, 1), 20, 1, color)
         self.window.show_view(game)
@@ -283,16 +262,17 @@ class UpgradeScreen(arcade.View):
         self.setup()
 
     def setup(self):
-        self.bg = arcade.load_texture('assets/images/gui/upgrade_screen.png')
+        self.bg = textures.load('assets/images/gui/upgrade_screen.png')
         self.bg_pos = arcade.Rect(0, self.width, 0, self.height, self.width, self.height, self.width / 2, self.height / 2)
 
         self.attrs = get_attrs()
 
         self.coords = ((140, 470), (140, 296), (140, 122), (524, 470), (524, 296))
-        self.texts = []
+        self.texts = [hud.HudText(x + 68, y - 50, self.batch, font_size=25, anchor_x='right') for x, y in self.coords]
+        self.shards_text = hud.HudText(745, 560, self.batch, font_size=25, anchor_x='right')
 
-        self.button_texture = arcade.load_texture('assets/images/gui/start_button.png')
-        self.button_texture_hovered = arcade.load_texture('assets/images/gui/hovered_start_button.png')
+        self.button_texture = textures.load('assets/images/gui/start_button.png')
+        self.button_texture_hovered = textures.load('assets/images/gui/hovered_start_button.png')
 
         self.upgrade_shard_texture = arcade.load_texture('assets/images/items/upgrade_crystal.png')
 
@@ -358,7 +338,6 @@ class UpgradeScreen(arcade.View):
         arcade.draw_texture_rect(self.bg, self.bg_pos)
 
         curr_text = 0
-        self.texts.clear()
 
         for x, y in self.coords:
             if self.attrs[curr_text] != 5:
@@ -375,15 +354,14 @@ class UpgradeScreen(arcade.View):
             x += 73
             y -= 50
             arcade.draw_texture_rect(self.upgrade_shard_texture, arcade.Rect(x, x + 30, y, y + 30, 30, 30, x + 15, y + 15), pixelated=True)
+            self.texts[curr_text].set(num)
             curr_text += 1
 
-            self.texts.append(arcade.Text(str(num), x - 5, y, font_size=25, anchor_x='right', batch=self.batch))
-
         x = 750
         y = 560
 
         arcade.draw_texture_rect(self.upgrade_shard_texture, arcade.Rect(x, x + 30, y, y + 30, 30, 30, x + 15, y + 15), pixelated=True)
-        self.texts.append(arcade.Text(str(self.upgrade_shards), x - 5, y, font_size=25, anchor_x='right', batch=self.batch))
+        self.shards_text.set(self.upgrade_shards)
 
         self.manager.draw()
         self.batch.draw()
@@ -445,163 +423,34 @@ class UpgradeScreen(arcade.View):
         self.window.show_view(self.game)
 
 
-class Player(arcade.Sprite):
-    def __init__(self, texture, x, y, scale, money, upgrade_crystals, weapons_list, armor_list, bullets_list, enemies_list, items_list, emitters, modifiers={}):
-        super().__init__(texture, scale, x, y)
-        self.modifiers = modifiers
-        self.weapon = None
-        self.armor = None
-        self.max_health = 10 * modifiers.get('health', 1)
-        self.health = self.max_health
-        self.weapons_list = weapons_list
-        self.bullets_list = bullets_list
-        self.enemies_list = enemies_list
-        self.emitters = emitters
-        self.items_list = items_list
-        self.armor_list = armor_list
-        self.speed = 6500 * modifiers.get('speed', 1)
-        self.money = money
-        self.upgrade_crystals = upgrade_crystals
-
-        self.inventory = [None] * modifiers.get('inventory', 1)
-        self.curr_slot = 0
-
-    def update(self, delta_time, keys):
-        move_x = move_y = 0
-
-        if arcade.key.W in keys:
-            move_y += self.speed
-        if arcade.key.S in keys:
-            move_y -= self.speed
-        if arcade.key.D in keys:
-            move_x += self.speed
-        if arcade.key.A in keys:
-            move_x -= self.speed
-
-        self.physics_engines[0].apply_force(self, (move_x, move_y))
-
-        if self.weapon is not None:
-            self.weapon.update(delta_time)
-
-        if self.armor is not None:
-            self.armor.update(delta_time)
-
-    def attack(self, x, y):
-        if self.weapon is not None:
-            self.weapon.attack(x, y)
-
-    def set_weapon(self, weapon):
-        if self.weapon is not None:
-            self.weapon.kill()
-
-        self.weapon = weapon
-
-        if self.weapon is not None:
-            self.weapon.return_to_live()
-            self.weapons_list.append(self.weapon)
-
-    def hurt(self, damage):
-        if self.health > 0:
-            self.health -= damage
-
-            if self.health <= 0:
-                self.kill()
-                self.health = 0
-
-    def heal(self, health):
-        self.health = min([self.max_health, self.health + health])
-
-    def kill(self):
-        super().kill()
-
-        if self.weapon is not None:
-            self.weapon.kill()
-
-        if self.armor is not None:
-            self.armor.kill()
-
-    def next_item(self):
-        if self.health > 0:
-            self.curr_slot += 1
-            self.curr_slot %= len(self.inventory)
-
-            try:
-                for bullet in self.weapon.bullets_list.sprite_list:
-                    bullet.kill()
-            except AttributeError:
-                pass
-
-            self.set_weapon(self.inventory[self.curr_slot])
-
-    def set_weapon_slot(self, weapon, slot):
-        self.inventory[slot] = weapon
-
-        if slot == self.curr_slot:
-            self.set_weapon(weapon)
-
-    def get_item(self):
-        itemss = sorted(self.items_list.sprite_list, key=lambda x: x.get_distance())
-
-        if itemss:
-            if itemss[0].get_distance() <= 100:
-                return itemss[0]
-
-    def drop_item(self):
-        if self.health > 0:
-            if self.inventory[self.curr_slot] is not None:
-                self.items_list.append(items.WeaponItem(self.inventory[self.curr_slot].__class__, self.center_x, self.center_y, self, self.inventory[self.curr_slot].level))
-                self.set_weapon_slot(None, self.curr_slot)
-
-    def set_armor(self, armor):
-        if self.armor is not None:
-            self.armor.unapply_health()
-            self.armor.kill()
-
-        self.armor = armor
-
-        if self.armor is not None:
-            self.armor.apply_health()
-            self.armor_list.append(armor)
-
-    def drop_armor(self):
-        if self.health > 0:
-            if self.armor is not None:
-                self.items_list.append(items.ArmorItem(self.armor.__class__, self.center_x, self.center_y, self, self.armor.level))
-                self.set_armor(None)
-
-
 class Game(arcade.View):
-    def __init__(self, map_name, money, upgrade_crystals, modifiers, weapons, armor, hp, level, color, level_id=1):
+    def __init__(self, map_name, money, upgrade_crystals, modifiers, weapons, armor, hp, level, color, level_id=1, cleared_rooms=(), level_graph=None, music=None, tilemap=None, seed=None, slot=0):
         super().__init__()
 
         self.current_level_id = level_id
-
-        self.player_list = arcade.SpriteList()
-        self.walls = arcade.SpriteList()
-        self.enemy_list = arcade.SpriteList(True)
-        self.weapons_list = arcade.SpriteList()
-        self.bullets_list = []
-        self.items_list = arcade.SpriteList()
-        self.armor_list = arcade.SpriteList()
-        self.walls_list = arcade.SpriteList()
-        self.phone_list = arcade.SpriteList()
-        self.join_triggers = arcade.SpriteList()
-
-        self.emitters = []
+        self.level_graph = level_graph
+        self.seed = seed if seed is not None else seeds.run.derive('level', level, level_id)
+        self.recorder = replays.recorder
 
         self.batch = Batch()
         self.hint_batch = Batch()
 
-        self.physics_engine = arcade.PymunkPhysicsEngine(damping=0)
-
-        self.health_bar_texture = arcade.load_texture('assets/images/gui/health_bar.png')
-        self.slot_texture = arcade.load_texture('assets/images/gui/slot.png')
-        self.gui_rarities = [arcade.load_texture('assets/images/gui/usual_item_gui.png'),
-                             arcade.load_texture('assets/images/gui/unusual_item_gui.png'),
-                             arcade.load_texture('assets/images/gui/rare_item_gui.png'),
-                             arcade.load_texture('assets/images/gui/epic_item_gui.png'),
-                             arcade.load_texture('assets/images/gui/legendary_item_gui.png')]
-        self.texts = []
+        self.health_bar_texture = textures.load('assets/images/gui/health_bar.png')
+        self.slot_texture = textures.load('assets/images/gui/slot.png')
+        self.gui_rarities = [textures.load('assets/images/gui/usual_item_gui.png'),
+                             textures.load('assets/images/gui/unusual_item_gui.png'),
+                             textures.load('assets/images/gui/rare_item_gui.png'),
+                             textures.load('assets/images/gui/epic_item_gui.png'),
+                             textures.load('assets/images/gui/legendary_item_gui.png')]
+
+        self.hp_text = hud.HudText(675, 35, self.batch, '{}/{}', color=arcade.color.WHITE, font_size=20, anchor_x='center', anchor_y='center')
+        self.item_name_text = hud.HudText(320, 380, self.batch, font_size=13, anchor_x='left', anchor_y='center')
+        self.item_desc_texts = hud.TextLines(265, 310, -20, self.batch, font_size=10)
+        self.item_price_text = hud.HudText(400, 150, self.batch, 'Цена предмета: {}', font_size=20, anchor_x='center', anchor_y='center')
+        self.item_balance_text = hud.HudText(10, 580, self.batch, 'Баланс: {}', font_size=20, anchor_y='center')
+        self.item_hint_text = hud.HudText(400, 150, self.batch, 'ENTER чтобы подтвердить и Q чтобы выйти', font_size=20, anchor_x='center', anchor_y='center')
+        self.shown_item = None
+        self.hide_item_texts()
 
         self.showing_item = None
         self.chosen_item = None
@@ -618,29 +467,32 @@ class Game(arcade.View):
 
         self.game_over = False
 
-        self.setup_map(map_name, money, upgrade_crystals, modifiers, weapons, armor, hp)
+        self.setup_map(map_name, money, upgrade_crystals, modifiers, weapons, armor, hp, cleared_rooms, music, tilemap)
+
+        self.simulation.select_slot(slot)
+
+        self.saved_rooms = len(cleared_rooms)
+        self.autosave_time = 0
+        self.autosave()
+
+        self.recorder.start(self.get_snapshot(), upgrade_crystals)
 
     def on_update(self, delta_time):
         if self.showing_item is None and not self.game_over:
-            self.enemy_list.update(delta_time)
-
-            emitters_copy = self.emitters.copy()
-            for e in emitters_copy:
-                e.update(delta_time)
-            for e in emitters_copy:
-                if e.can_reap():
-                    self.emitters.remove(e) 
+            attacks, self.attacks = self.attacks, []
+            self.simulation.step(delta_time, self.keys, attacks)
 
-            self.physics_engine.step(delta_time)
-            self.player_list.update(delta_time, self.keys)
+            self.recorder.frame(delta_time, self.keys, attacks, self.simulation.get_checksum())
 
             position = (self.player.center_x, self.player.center_y)
             self.world_camera.position = arcade.math.lerp_2d(self.world_camera.position, position, 0.12)
 
-            self.check_join_triggers()
+            if len(self.simulation.cleared_rooms) != self.saved_rooms or self.simulation.time - self.autosave_time >= snapshots.AUTOSAVE_INTERVAL:
+                self.autosave()
 
             if self.player.health <= 0:
                 self.game_over = True
+                snapshots.autosaver.delete()
                 self.game_over_text = arcade.Text('Игра окончена! Нажмите ESC для выхода.', self.width / 2, self.height / 3 * 2, font_size=27, anchor_x='center',
                                                   anchor_y='center', batch=self.batch)
 
@@ -654,37 +506,13 @@ class Game(arcade.View):
         #     if self.level_completion_timer <= 0:
         #         self.toggle_level_completion()
 
-    def check_join_triggers(self):
-        for i in arcade.check_for_collision_with_list(self.player, self.join_triggers):
-            room = i.room
-
-            for enemy in self.enemy_list.sprite_list:
-                try:
-                    if enemy.room == room:
-                        enemy.active = True
-                except Exception:
-                    continue
-
     def on_draw(self):
         self.clear()
 
         self.world_camera.use()
-        self.phone_list.draw()
-        self.walls_list.draw()
+        self.simulation.draw_map(self.world_camera)
         self.hint_batch.draw()
-
-        for e in self.emitters:
-            e.draw()
-
-        self.items_list.draw()
-        self.player_list.draw()
-        self.armor_list.draw()
-        self.enemy_list.draw()
-
-        for i in self.bullets_list:
-            i.draw()
-
-        self.weapons_list.draw()
+        self.simulation.draw_sprites()
 
         self.gui_camera.use()
         self.draw_gui()
@@ -716,8 +544,7 @@ class Game(arcade.View):
 
         arcade.draw_rect_outline(rect_f, arcade.color.SEA_BLUE, 3)
 
-        self.hp_text = arcade.Text(f'{round(self.player.health)}/{round(self.player.max_health)}', 675, 35,
-                                   arcade.color.WHITE, 20, anchor_x='center', anchor_y='center', batch=self.batch)
+        self.hp_text.set(round(self.player.health), round(self.player.max_health))
 
         if self.showing_item is not None:
             self.draw_item()
@@ -727,7 +554,7 @@ class Game(arcade.View):
 
         if self.showing_item is None and not self.game_over:
             if symbol == arcade.key.E:
-                self.player.next_item()
+                self.act('next_item')
             elif symbol == arcade.key.Q:
                 item = self.player.get_item()
 
@@ -735,80 +562,51 @@ class Game(arcade.View):
                     if type(item) is items.WeaponItem:
                         if self.player.inventory[self.player.curr_slot] is None:
                             self.chosen_item = item
-                            self.showing_item = item.weapon(self.player, item.level)
+                            self.showing_item = item.weapon
                     elif type(item) is items.ArmorItem:
                         if self.player.armor is None:
                             self.chosen_item = item
-                            self.showing_item = item.armor(self.player, item.level)
+                            self.showing_item = item.armor
                     elif type(item) is items.BoughtWeapon:
                         if self.player.inventory[self.player.curr_slot] is None:
                             self.chosen_item = item
-                            self.showing_item = item.weapon(self.player, item.level)
+                            self.showing_item = item.weapon
                     elif type(item) is items.BoughtArmor:
                         if self.player.armor is None:
                             self.chosen_item = item
-                            self.showing_item = item.armor(self.player, item.level)
+                            self.showing_item = item.armor
                     else:
-                        item.activate()
+                        self.act('use_item')
             elif symbol == arcade.key.Z:
-                self.player.drop_item()
+                self.act('drop_item')
             elif symbol == arcade.key.X:
-                self.player.drop_armor()
+                self.act('drop_armor')
             elif symbol == arcade.key.ESCAPE:
                 self.keys = set()
                 self.window.show_view(PauseView(self, self.player.money, self.player.upgrade_crystals))
             elif symbol == arcade.key.Y:
-                if not self.enemy_list.sprite_list:
+                if self.simulation.is_cleared():
                     self.toggle_level_completion()
         elif not self.game_over:
             if symbol == arcade.key.ENTER:
-                if type(self.chosen_item) is items.WeaponItem:
-                    self.player.set_weapon_slot(self.showing_item, self.player.curr_slot)
-
-                    self.chosen_item.kill()
+                if self.act('take_item'):
                     self.showing_item = None
                     self.chosen_item = None
-                    self.texts.clear()
-                elif type(self.chosen_item) is items.ArmorItem:
-                    self.player.set_armor(self.showing_item)
-
-                    self.chosen_item.kill()
-                    self.showing_item = None
-                    self.chosen_item = None
-                    self.texts.clear()
-                elif type(self.chosen_item) is items.BoughtWeapon:
-                    if self.player.money >= self.chosen_item.money:
-                        self.player.money -= self.chosen_item.money
-                        self.player.set_weapon_slot(self.showing_item, self.player.curr_slot)
-
-                        self.chosen_item.kill()
-                        self.showing_item = None
-                        self.chosen_item = None
-                        self.texts.clear()
-                elif type(self.chosen_item) is items.BoughtArmor:
-                    if self.player.money >= self.chosen_item.money:
-                        self.player.money -= self.chosen_item.money
-                        self.player.set_armor(self.showing_item)
-
-                        self.chosen_item.kill()
-                        self.showing_item = None
-                        self.chosen_item = None
-                        self.texts.clear()
-
+                    self.hide_item_texts()
             elif symbol == arcade.key.Q:
                 self.showing_item = None
                 self.chosen_item = None
-                self.texts.clear()
+                self.hide_item_texts()
         else:
             if symbol == arcade.key.ESCAPE:
                 attrs = get_attrs()
                 write_to_file([self.player.upgrade_crystals] + attrs)
-                arcade.stop_sound(self.music_player)
+                audio.stop_music()
                 self.window.show_view(StartScreen())
 
     def toggle_level_completion(self):
         from planet_generation import LevelTransitionView
-        arcade.stop_sound(self.music_player)
+        audio.stop_music()
         level_transition_view = LevelTransitionView(self, True, self.current_level_id, self.level)
         self.window.show_view(level_transition_view)
 
@@ -816,8 +614,16 @@ class Game(arcade.View):
         self.keys.discard(symbol)
 
     def on_mouse_press(self, x, y, button, modifiers):
-        if button == arcade.MOUSE_BUTTON_LEFT:
-            self.player.attack(x + self.world_camera.position[0] - self.width / 2, y + self.world_camera.position[1] - self.height / 2)
+        if button == arcade.MOUSE_BUTTON_LEFT and self.showing_item is None and not self.game_over:
+            self.attack(x + self.world_camera.position[0] - self.width / 2, y + self.world_camera.position[1] - self.height / 2)
+
+    def attack(self, x, y):
+        self.attacks.append((x, y))
+
+    def act(self, action):
+        self.recorder.action(action)
+
+        return getattr(self.simulation, action)()
 
     def draw_item(self):
         texture = self.gui_rarities[self.showing_item.rarity - 1]
@@ -825,81 +631,59 @@ class Game(arcade.View):
         rect = arcade.Rect(250, 550, 200, 400, 300, 200, 400, 300)
         arcade.draw_texture_rect(texture, rect)
 
-        try:
-            texture = self.showing_item.source_texture
-        except AttributeError:
-            texture = self.showing_item.texture
+        texture = textures.load(self.showing_item.texture_path)
 
         rect = arcade.Rect(265, 315, 335, 385, 50, 50, 290, 360)
         arcade.draw_texture_rect(texture, rect)
 
-        self.texts = [
-            arcade.Text(self.showing_item.return_name(), 320, 380, font_size=13, anchor_x='left', anchor_y='center',
-                        batch=self.batch)]
-        texts = self.showing_item.return_desc().split('\n')
+        if self.shown_item is not self.chosen_item:
+            self.set_item_texts()
 
-        for i in range(len(texts)):
-            self.texts.append(arcade.Text(texts[i], 265, 310 - 20 * i, font_size=10, batch=self.batch))
+        if type(self.chosen_item) is items.BoughtWeapon or type(self.chosen_item) is items.BoughtArmor:
+            self.item_balance_text.set(self.player.money)
+
+    def set_item_texts(self):
+        self.shown_item = self.chosen_item
+
+        self.item_name_text.set(self.showing_item.name)
+        self.item_desc_texts.set(self.showing_item.describe(self.chosen_item.level, self.player.modifiers).split('\n'))
 
         if type(self.chosen_item) is items.BoughtWeapon or type(self.chosen_item) is items.BoughtArmor:
             text_y = 100
-            self.texts.append(
-                arcade.Text(f'Цена предмета: {self.chosen_item.money}', 400, 150, font_size=20, anchor_x='center',
-                            anchor_y='center', batch=self.batch))
-            self.texts.append(
-                arcade.Text(f'Баланс: {self.player.money}', 10, 580, font_size=20, anchor_y='center', batch=self.batch))
+            self.item_price_text.set(self.chosen_item.money)
         else:
             text_y = 150
+            self.item_price_text.hide()
+            self.item_balance_text.hide()
+
+        self.item_hint_text.move(400, text_y)
+        self.item_hint_text.set()
+
+    def hide_item_texts(self):
+        self.shown_item = None
+
+        self.item_name_text.hide()
+        self.item_desc_texts.hide()
+        self.item_price_text.hide()
+        self.item_balance_text.hide()
+        self.item_hint_text.hide()
+
+    def setup_map(self, map_name, money, upgrade_crystals, modifiers, weapons_now, armor_now, hp, cleared_rooms=(), music=None, tilemap=None):
+        self.simulation = Simulation(map_name, money, upgrade_crystals, modifiers, weapons_now, armor_now, hp, self.level, self.color, cleared_rooms, tilemap, self.seed)
+
+        self.player = self.simulation.player
+        self.player_list = self.simulation.player_list
+        self.enemy_list = self.simulation.enemy_list
+        self.weapons_list = self.simulation.weapons_list
+        self.projectiles = self.simulation.projectiles
+        self.items_list = self.simulation.items_list
+        self.armor_list = self.simulation.armor_list
+        self.walls_list = self.simulation.walls_list
+        self.phone_list = self.simulation.phone_list
+        self.particles = self.simulation.particles
+        self.tilemap = self.simulation.tilemap
 
-        self.texts.append(
-            arcade.Text('ENTER чтобы подтвердить и Q чтобы выйти', 400, text_y, font_size=20, anchor_x='center',
-                        anchor_y='center', batch=self.batch))
-
-    def setup_map(self, map_name, money, upgrade_crystals, modifiers, weapons_now, armor_now, hp):
-        self.tilemap = arcade.load_tilemap('assets/tilesets/maps/' + map_name)
-        self.walls_list = self.tilemap.sprite_lists['walls']
-        self.phone_list = self.tilemap.sprite_lists['floor']
-        player_pos = self.tilemap.sprite_lists['player'].sprite_list[0].position
-        try:
-            enemies_list = self.tilemap.sprite_lists['enemies'].sprite_list
-        except Exception:
-            enemies_list = []
-        chests_list = self.tilemap.sprite_lists['chests']
-        try:
-            join_triggers = self.tilemap.object_lists['join_triggers']
-        except Exception:
-            join_triggers = []
-        try:
-            shop_items = self.tilemap.sprite_lists['shop_items']
-        except Exception:
-            shop_items = []
-        try:
-            boss = self.tilemap.sprite_lists['boss'].sprite_list[0]
-        except Exception:
-            boss = False
-        try:
-            boss_angles = self.tilemap.sprite_lists['boss_angles'].sprite_list
-        except Exception:
-            boss_angles = []
-
-        normal_enemy_texture = self.tilemap.sprite_lists['normal_enemy_texture'].sprite_list[0].texture
-
-        self.player = Player('assets/images/player/players/default-player.png', player_pos[0], player_pos[1], 0.5, money, upgrade_crystals, self.weapons_list, self.armor_list, self.bullets_list, self.enemy_list, self.items_list, self.emitters, modifiers)
-        self.physics_engine.add_sprite_list(self.walls_list, body_type=arcade.PymunkPhysicsEngine.STATIC)
         self.world_camera.position = self.player.position
-        
-        for i in enemies_list:
-            if i.texture == normal_enemy_texture:
-                enemy = random.choice(enemies.NORMAL_ENEMIES)(*i.position, False, self.player, self.color, self.level)
-                enemy.room = i.properties['room']
-                self.enemy_list.append(enemy)
-            else:
-                enemy = random.choice(enemies.ELITE_ENEMIES)(*i.position, False, self.player, self.color, self.level)
-                enemy.room = i.properties['room']
-                self.enemy_list.append(enemy)
-
-        for i in chests_list.sprite_list:
-            self.items_list.append(items.Chest(*i.position, 2, self.player, self.level))
 
         walls_color = (min([self.color.r + 5, 255]), min([self.color.g + 5, 255]), min([self.color.b + 5, 255]))
         bg_color = (self.color.r // 4, self.color.g // 4, self.color.b // 4)
@@ -908,67 +692,10 @@ class Game(arcade.View):
         self.walls_list.color = walls_color
         arcade.set_background_color(bg_color)
 
-        for i in join_triggers:
-            trigger = arcade.Sprite(i)
-
-            for key, value in i.properties.items():
-                setattr(trigger, key, value)
-
-            x = [j[0] for j in i.shape]
-            x = sum(x) / len(x)
-
-            y = [j[1] for j in i.shape]
-            y = sum(y) / len(y)
-
-            trigger.center_x = x
-            trigger.center_y = y
-
-            self.join_triggers.append(trigger)
-
-        for i in shop_items:
-            min_level = max([self.level - 2, 1])
-            max_level = min([self.level + 2, 100])
-            level = random.randint(min_level, max_level)
-
-            if random.randint(0, 1):
-                rarity = random.randint(1, 5)
-                price = round((rarity * 100 + 10 * level) * random.uniform(0.95, 1.05))
-                item = items.BoughtWeapon(random.choice(weapons.RARITY_TO_WEAPONS[rarity]), *i.position, self.player, level, price)
-            else:
-                rarity = random.randint(1, 5)
-                price = round((rarity * 100 + 10 * level) * random.uniform(0.95, 1.05))
-                item = items.BoughtArmor(random.choice(armor.RARITY_TO_ARMOR[rarity]), *i.position, self.player, level, price)
-
-            self.items_list.append(item)
-
-        if boss:
-            angles = [i.position for i in boss_angles]
-            x1, y1 = min([i[0] for i in angles]), min([i[1] for i in angles]) 
-            x2, y2 = max([i[0] for i in angles]), max([i[1] for i in angles]) 
-            
-            bosss = random.choice(enemies.BOSSES)(boss.center_x, boss.center_y, False, self.player, self.color, self.level, x1, y1, x2, y2)
-            bosss.room = boss.properties['room']
-            self.enemy_list.append(bosss)
-
-        for num, (i, level) in enumerate(weapons_now):
-            if i is None:
-                continue
-            
-            self.player.set_weapon_slot(i(self.player, level), num)
-
-        if armor_now[0] is not None:
-            self.player.set_armor(armor_now[0](self.player, armor_now[1]))
-
-        self.player.health = hp
-        self.player_list.append(self.player)
-
         self.keys = set()
-  
-        self.physics_engine.add_sprite_list(self.player_list, 1, 0, moment_of_inertia=arcade.PymunkPhysicsEngine.MOMENT_INF, collision_type='player')
-        self.physics_engine.add_sprite_list(self.enemy_list, 1, 0, moment_of_inertia=arcade.PymunkPhysicsEngine.MOMENT_INF, collision_type='enemy')
+        self.attacks = []
 
-        self.music = arcade.load_sound(f'assets/music/music{random.randint(1, 3)}.mp3')
-        self.music_player = self.music.play(1, loop=True)
+        audio.play_music(music or f"assets/music/music{self.simulation.seeds.get('music').randint(1, 3)}.mp3")
 
         if self.level == 1:
             self.hint_text1 = arcade.Text('Y чтобы покинуть планету, когда все враги мертвы.', self.player.center_x, self.player.center_y + 80, font_size=18,
@@ -992,13 +719,65 @@ class Game(arcade.View):
         else:
             return (None, 1)
 
+    def get_snapshot(self):
+        armor_class, armor_level = self.get_player_armor()
+
+        return {
+            'map': self.simulation.map_name,
+            'level': self.level,
+            'level_id': self.current_level_id,
+            'color': tuple(self.color),
+            'money': self.player.money,
+            'health': self.player.health,
+            'modifiers': self.player.modifiers,
+            'weapons': [(i.__name__ if i else None, level) for i, level in self.get_player_weapons()],
+            'slot': self.player.curr_slot,
+            'armor': (armor_class.__name__ if armor_class else None, armor_level),
+            'rooms': self.simulation.cleared_rooms,
+            'run_seed': seeds.run.seed,
+            'seed': self.seed,
+            'graph': self.level_graph.to_dict() if self.level_graph else None,
+        }
+
+    def autosave(self):
+        if self.player.health <= 0:
+            return
+
+        self.saved_rooms = len(self.simulation.cleared_rooms)
+        self.autosave_time = self.simulation.time
+        snapshots.autosaver.save(self.get_snapshot())
+
+
+def resume_run():
+    from planet_generation import LevelGraph
+
+    snapshot = snapshots.load()
+
+    if snapshot is None:
+        return None
+
+    level_graph = None
+
+    if snapshot['graph'] is not None:
+        level_graph = LevelGraph()
+        level_graph.load_dict(snapshot['graph'])
+        galaxy.store.save(level_graph)
+
+    if snapshot['run_seed'] is not None:
+        seeds.start_run(snapshot['run_seed'])
+
+    weapons_now, armor_now, color = get_loadout(snapshot)
+
+    return Game(snapshot['map'], snapshot['money'], get_shards(), snapshot['modifiers'], weapons_now, armor_now, snapshot['health'], snapshot['level'], color,
+                snapshot['level_id'], snapshot['rooms'], level_graph, seed=snapshot['seed'], slot=snapshot['slot'])
+
 
 class PauseView(arcade.View):
     def __init__(self, game, money, upgrade_shards):
         super().__init__()
         self.game = game
         self.batch = Batch()
-        self.bg = arcade.load_texture('assets/images/gui/pause.png')
+        self.bg = textures.load('assets/images/gui/pause.png')
         self.bg_pos = arcade.Rect(0, self.width, 0, self.height, self.width, self.height, self.width / 2, self.height / 2)
 
         self.money_texture = arcade.load_texture('assets/images/items/money.png')
@@ -1013,8 +792,8 @@ class PauseView(arcade.View):
         self.setup_gui()
 
     def setup_gui(self):
-        self.button_texture = arcade.load_texture('assets/images/gui/start_button.png')
-        self.button_texture_hovered = arcade.load_texture('assets/images/gui/hovered_start_button.png')
+        self.button_texture = textures.load('assets/images/gui/start_button.png')
+        self.button_texture_hovered = textures.load('assets/images/gui/hovered_start_button.png')
 
         self.manager = UIManager()
         self.manager.enable()
@@ -1053,6 +832,7 @@ class PauseView(arcade.View):
     def exit_game(self, *args):
         attrs = get_attrs()
         write_to_file([self.game.player.upgrade_crystals] + attrs)
+        self.game.autosave()
         arcade.exit()
 
 
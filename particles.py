@@ -0,0 +1,237 @@
+import math
+
+import arcade
+import numpy as np
+
+
+X = 0
+Y = 1
+VX = 2
+VY = 3
+AGE = 4
+LIFETIME = 5
+START_ALPHA = 6
+END_ALPHA = 7
+FIELDS = 8
+
+
+class Emitter:
+    def __init__(self, x, y, texture, count, speed, lifetime, scale, start_alpha=255, end_alpha=0, maintain=False):
+        self.center_x = x
+        self.center_y = y
+        self.texture = texture
+        self.count = count
+        self.speed = speed
+        self.particle_lifetime = lifetime
+        self.scale = scale
+        self.start_alpha = start_alpha
+        self.end_alpha = end_alpha
+        self.maintain = maintain
+
+        self.emitted = False
+        self.alive = 0
+        self.id = None
+
+    def how_many(self):
+        if self.maintain:
+            return max(self.count - self.alive, 0)
+
+        if self.emitted:
+            return 0
+
+        self.emitted = True
+        return self.count
+
+    def is_complete(self):
+        return not self.maintain
+
+    def can_reap(self):
+        return self.is_complete() and self.emitted and self.alive <= 0
+
+
+class ParticleSystem:
+    def __init__(self, capacity=1024, seed=None):
+        self.data = np.zeros((capacity, FIELDS))
+        self.owners = np.zeros(capacity, dtype=np.int64)
+        self.sprites = np.empty(capacity, dtype=object)
+        self.slots = np.zeros(capacity, dtype=np.int64)
+        self.count = 0
+
+        self.emitters = {}
+        self.next_id = 1
+        self.rng = np.random.default_rng(seed)
+
+        self.sprite_list = arcade.SpriteList()
+        self.free = []
+        self.dirty = False
+
+    def add(self, emitter):
+        emitter.id = self.next_id
+        self.next_id += 1
+        self.emitters[emitter.id] = emitter
+
+        return emitter
+
+    def remove(self, emitter):
+        if self.emitters.pop(emitter.id, None) is None:
+            return
+
+        if emitter.alive:
+            self.compact(self.owners[:self.count] != emitter.id)
+            emitter.alive = 0
+
+    def reserve(self, count):
+        capacity = len(self.data)
+
+        if self.count + count <= capacity:
+            return
+
+        while capacity < self.count + count:
+            capacity *= 2
+
+        extra = capacity - len(self.data)
+        self.data = np.concatenate((self.data, np.zeros((extra, FIELDS))))
+        self.owners = np.concatenate((self.owners, np.zeros(extra, dtype=np.int64)))
+        self.sprites = np.concatenate((self.sprites, np.empty(extra, dtype=object)))
+        self.slots = np.concatenate((self.slots, np.zeros(extra, dtype=np.int64)))
+
+    def emit(self, emitter, count):
+        self.reserve(count)
+
+        start = self.count
+        end = start + count
+        rng = self.rng
+
+        angle = rng.uniform(0, 2 * math.pi, count)
+        radius = emitter.speed * np.sqrt(rng.random(count))
+        scales = rng.uniform(*emitter.scale, count)
+
+        rows = self.data[start:end]
+        rows[:, X] = emitter.center_x
+        rows[:, Y] = emitter.center_y
+        rows[:, VX] = radius * np.cos(angle)
+        rows[:, VY] = radius * np.sin(angle)
+        rows[:, AGE] = 0
+        rows[:, LIFETIME] = rng.uniform(*emitter.particle_lifetime, count)
+        rows[:, START_ALPHA] = emitter.start_alpha
+        rows[:, END_ALPHA] = emitter.end_alpha
+        self.owners[start:end] = emitter.id
+
+        texture = emitter.texture
+        reused = self.free[-count:][::-1]
+        del self.free[-count:]
+
+        for sprite in reused:
+            if sprite.texture is not texture:
+                sprite.texture = texture
+
+        created = [arcade.Sprite(texture) for _ in range(count - len(reused))]
+        self.sprite_list.extend(created)
+
+        sprites = reused + created
+        slot = self.sprite_list.sprite_slot
+        self.sprites[start:end] = sprites
+        self.slots[start:end] = [slot[i] for i in sprites]
+
+        sizes = self.get_buffer('size', np.float32, 2)
+        sizes[self.slots[start:end]] = scales[:, None] * (texture.width, texture.height)
+
+        self.count = end
+        emitter.alive += count
+
+    def update(self, delta_time):
+        for emitter in list(self.emitters.values()):
+            count = emitter.how_many()
+
+            if count > 0:
+                self.emit(emitter, count)
+
+        if self.count:
+            data = self.data[:self.count]
+            step = delta_time * 60
+
+            data[:, X] += data[:, VX] * step
+            data[:, Y] += data[:, VY] * step
+            data[:, AGE] += delta_time
+
+            dead = data[:, AGE] >= data[:, LIFETIME]
+
+            if dead.any():
+                owners, counts = np.unique(self.owners[:self.count][dead], return_counts=True)
+
+                for owner, count in zip(owners.tolist(), counts.tolist()):
+                    emitter = self.emitters.get(owner)
+
+                    if emitter is not None:
+                        emitter.alive -= count
+
+                self.compact(~dead)
+
+            self.dirty = True
+
+        for emitter in [i for i in self.emitters.values() if i.can_reap()]:
+            self.remove(emitter)
+
+    def compact(self, keep):
+        count = self.count
+
+        colors = self.get_buffer('color', np.uint8, 4)
+        colors[self.slots[:count][~keep], 3] = 0
+        self.free += self.sprites[:count][~keep].tolist()
+
+        alive = int(keep.sum())
+
+        self.data[:alive] = self.data[:count][keep]
+        self.owners[:alive] = self.owners[:count][keep]
+        self.sprites[:alive] = self.sprites[:count][keep]
+        self.sprites[alive:count] = None
+        self.slots[:alive] = self.slots[:count][keep]
+        self.count = alive
+        self.dirty = True
+
+    def sync(self):
+        count = self.count
+        data = self.data[:count]
+
+        progress = np.minimum(data[:, AGE] / data[:, LIFETIME], 1)
+        alpha = data[:, START_ALPHA] + (data[:, END_ALPHA] - data[:, START_ALPHA]) * progress
+
+        slots = self.slots[:count]
+        positions = self.get_buffer('pos_angle', np.float32, 4)
+        positions[slots, 0] = data[:, X]
+        positions[slots, 1] = data[:, Y]
+
+        colors = self.get_buffer('color', np.uint8, 4)
+        colors[slots, 3] = alpha
+
+        self.dirty = False
+
+    def get_buffer(self, name, dtype, width):
+        setattr(self.sprite_list, f'_sprite_{name}_changed', True)
+
+        return np.frombuffer(getattr(self.sprite_list, f'_sprite_{name}_data'), dtype=dtype).reshape(-1, width)
+
+    def draw(self):
+        if self.dirty:
+            self.sync()
+
+        if self.count:
+            self.sprite_list.draw()
+
+    def clear(self):
+        self.compact(np.zeros(self.count, dtype=bool))
+
+        for emitter in self.emitters.values():
+            emitter.alive = 0
+
+        self.emitters.clear()
+
+    def get_stats(self):
+        return {
+            'emitters': len(self.emitters),
+            'particles': self.count,
+            'sprites': len(self.sprite_list),
+        }
+
+    def __len__(self):
+        return len(self.emitters)
@@ -0,0 +1,131 @@
+import math
+
+import numpy as np
+
+
+NEIGHBOURS = [
+    (1, 0, 1), (-1, 0, 1), (0, 1, 1), (0, -1, 1),
+    (1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (-1, -1, math.sqrt(2)),
+]
+
+
+class FlowField:
+    def __init__(self, floor, walls, width, height, tile_width, tile_height):
+        self.width = width
+        self.height = height
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+
+        free = np.zeros((height, width), dtype=bool)
+
+        for sprite in floor:
+            tile = self.get_tile(sprite.center_x, sprite.center_y)
+
+            if tile is not None:
+                free[tile[1], tile[0]] = True
+
+        for sprite in walls:
+            tile = self.get_tile(sprite.center_x, sprite.center_y)
+
+            if tile is not None:
+                free[tile[1], tile[0]] = False
+
+        self.build_graph(free)
+
+        self.distance = np.full(self.count + 1, np.inf)
+        self.flow = [None] * self.count
+        self.target = None
+        self.updates = 0
+
+    def build_graph(self, free):
+        rows, cols = np.nonzero(free)
+        count = len(rows)
+
+        index = np.full((self.height, self.width), -1)
+        index[rows, cols] = np.arange(count)
+
+        self.count = count
+        self.index = index.tolist()
+        self.neighbours = np.full((len(NEIGHBOURS), count), count)
+        self.costs = np.full((len(NEIGHBOURS), count), np.inf)
+
+        for i, (dx, dy, cost) in enumerate(NEIGHBOURS):
+            x = cols + dx
+            y = rows + dy
+            inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+            target = np.full(count, -1)
+            target[inside] = index[y[inside], x[inside]]
+            passable = target >= 0
+
+            if dx and dy:
+                for cx, cy in ((cols + dx, rows), (cols, rows + dy)):
+                    corner = np.full(count, -1)
+                    corner[inside] = index[cy[inside], cx[inside]]
+                    passable &= corner >= 0
+
+            self.neighbours[i, passable] = target[passable]
+            self.costs[i, passable] = cost
+
+        directions = np.array([(dx, dy) for dx, dy, _ in NEIGHBOURS], dtype=float)
+        self.directions = directions / np.hypot(directions[:, 0], directions[:, 1])[:, None]
+
+    def get_tile(self, x, y):
+        col = int(x // self.tile_width)
+        row = int(y // self.tile_height)
+
+        if 0 <= col < self.width and 0 <= row < self.height:
+            return col, row
+
+        return None
+
+    def get_cell(self, x, y):
+        tile = self.get_tile(x, y)
+
+        if tile is None:
+            return -1
+
+        return self.index[tile[1]][tile[0]]
+
+    def update(self, x, y):
+        cell = self.get_cell(x, y)
+
+        if cell < 0 or cell == self.target:
+            return False
+
+        distance = np.full(self.count + 1, np.inf)
+        distance[cell] = 0
+
+        self.target = cell
+        self.updates += 1
+
+        while True:
+            relaxed = np.minimum(distance[:-1], (distance[self.neighbours] + self.costs).min(axis=0))
+
+            if np.array_equal(relaxed, distance[:-1]):
+                break
+
+            distance[:-1] = relaxed
+
+        self.distance = distance
+        self.flow = self.get_flow()
+
+        return True
+
+    def get_flow(self):
+        candidates = self.distance[self.neighbours] + self.costs
+        flow = self.directions[candidates.argmin(axis=0)].tolist()
+
+        distance = self.distance[:-1]
+
+        for cell in np.flatnonzero((distance == 0) | np.isinf(distance)).tolist():
+            flow[cell] = None
+
+        return flow
+
+    def get_direction(self, x, y):
+        cell = self.get_cell(x, y)
+
+        if cell < 0:
+            return None
+
+        return self.flow[cell]
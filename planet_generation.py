@@ -1,7 +1,23 @@
-import json
 import math
-import random
 import arcade
+from pyglet.graphics import Batch
+
+import galaxy
+import landing
+import seeds
+
+
+PICK_RADIUS = 25
+INDEX_CELL_SIZE = 128
+CHUNK_SIZE = 1024
+SECTOR_SPACING = 1000
+GALAXY_CENTER = (400, 300)
+GALAXY_SECTORS = 1
+
+PLANET_NAMES = ["Марс", "Венера", "Меркурий", "Юпитер", "Сатурн", "Уран", "Нептун", "Плутон", "Церера", "Эрида",
+                "Татуин", "Альдераан", "Эндор", "Джакку", "Корусант"]
+PLANET_TYPES = ["пустынная", "ледяная", "горная", "водная", "лесная", "вулканическая", "газовая",
+                "металлическая", "болотистая", "радиоактивная"]
 
 
 class StarNode:
@@ -18,6 +34,44 @@ class StarNode:
             self.connections.append(node)
 
 
+class NodeIndex:
+    def __init__(self, cell_size=INDEX_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def get_cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def add(self, node):
+        self.cells.setdefault(self.get_cell(*node.position), []).append(node)
+
+    def query(self, left, right, bottom, top):
+        x1, y1 = self.get_cell(left, bottom)
+        x2, y2 = self.get_cell(right, top)
+
+        return [node for x in range(x1, x2 + 1) for y in range(y1, y2 + 1) for node in self.cells.get((x, y), ())]
+
+    def pick(self, x, y, radius, predicate=None):
+        closest = None
+        min_distance = radius
+
+        for node in self.query(x - radius, x + radius, y - radius, y + radius):
+            if predicate is not None and not predicate(node):
+                continue
+
+            distance = math.hypot(x - node.position[0], y - node.position[1])
+
+            if distance < min_distance:
+                min_distance = distance
+                closest = node
+
+        return closest
+
+
+def get_sector(x, y):
+    return round((x - GALAXY_CENTER[0]) / SECTOR_SPACING), round((y - GALAXY_CENTER[1]) / SECTOR_SPACING)
+
+
 class LevelGraph:
     def __init__(self):
         self.nodes = {}
@@ -25,10 +79,20 @@ class LevelGraph:
         self.current_node = None
         self.all_completed = False
         self.last_visited_id = 1
+        self.version = 0
+        self.changes = []
+        self.index = NodeIndex()
+        self.names = set()
+        self.sectors = set()
 
     def add_node(self, level_id, x, y, name, unlocked=False, completed=False):
         node = StarNode(level_id, x, y, name, unlocked, completed)
         self.nodes[level_id] = node
+        self.index.add(node)
+        self.names.add(name)
+        self.sectors.add(get_sector(x, y))
+        self.version += 1
+        self.changes.append(['node', level_id, x, y, name, unlocked, completed])
         if level_id == 1:
             node.unlocked = True
             self.start_node = node
@@ -42,17 +106,23 @@ class LevelGraph:
         if node1 and node2:
             node1.add_connection(node2)
             node2.add_connection(node1)
+            self.version += 1
+            self.changes.append(['link', level_id1, level_id2])
 
     def unlock_node(self, level_id):
         node = self.nodes.get(level_id)
-        if node:
+        if node and not node.unlocked:
             node.unlocked = True
+            self.version += 1
+            self.changes.append(['unlock', level_id])
 
     def complete_node(self, level_id):
         node = self.nodes.get(level_id)
         if node:
             node.completed = True
             node.unlocked = False
+            self.version += 1
+            self.changes.append(['complete', level_id])
 
     def get_accessible_nodes(self):
         if not self.current_node:
@@ -64,9 +134,76 @@ class LevelGraph:
         if target and target.unlocked and not target.completed:
             self.current_node = target
             self.last_visited_id = level_id
+            self.changes.append(['move', level_id])
             return True
         return False
 
+    def pick(self, x, y, radius=PICK_RADIUS, predicate=None):
+        return self.index.pick(x, y, radius, predicate)
+
+    def has_destinations(self):
+        return any(node.unlocked and not node.completed for node in self.nodes.values())
+
+    def get_free_sector(self, sector):
+        for distance in range(1, len(self.sectors) + 2):
+            ring = [(sector[0] + dx, sector[1] + dy) for dx in range(-distance, distance + 1) for dy in range(-distance, distance + 1)
+                    if max(abs(dx), abs(dy)) == distance and (sector[0] + dx, sector[1] + dy) not in self.sectors]
+
+            if ring:
+                return seeds.run.get('galaxy').choice(ring)
+
+    def get_planet_name(self, level_id):
+        rng = seeds.run.get('galaxy')
+
+        for _ in range(10):
+            name = f"{rng.choice(PLANET_NAMES)} ({rng.choice(PLANET_TYPES)})"
+
+            if name not in self.names:
+                return name
+
+        return f"{rng.choice(PLANET_NAMES)}-{level_id} ({rng.choice(PLANET_TYPES)})"
+
+    def add_sector(self, hub, around_hub=False):
+        rng = seeds.run.get('galaxy')
+
+        if around_hub:
+            base_x, base_y = hub.position
+            nodes = [hub]
+        else:
+            sector = self.get_free_sector(get_sector(*hub.position))
+            base_x = GALAXY_CENTER[0] + sector[0] * SECTOR_SPACING
+            base_y = GALAXY_CENTER[1] + sector[1] * SECTOR_SPACING
+            nodes = []
+
+        first_id = max(self.nodes) + 1
+        num_planets = rng.randint(4, 7)
+
+        for level_id in range(first_id, first_id + num_planets):
+            angle = rng.uniform(0, 2 * math.pi)
+            distance = rng.uniform(150, 350)
+            x = base_x + distance * math.cos(angle)
+            y = base_y + distance * math.sin(angle)
+
+            nodes.append(self.add_node(level_id, x, y, self.get_planet_name(level_id), False, False))
+
+        for i in range(len(nodes)):
+            connections = rng.randint(1, 3)
+            possible_connections = [j for j in range(len(nodes)) if j != i]
+            rng.shuffle(possible_connections)
+            for j in range(min(connections, len(possible_connections))):
+                target_idx = possible_connections[j]
+                self.connect_nodes(nodes[i].level_id, nodes[target_idx].level_id)
+
+        if nodes[0] is hub:
+            return nodes[1:]
+
+        radius = SECTOR_SPACING * 2
+        neighbours = [i for i in self.index.query(base_x - radius, base_x + radius, base_y - radius, base_y + radius) if i not in nodes]
+        start, bridge = min(((i, j) for i in neighbours or [hub] for j in nodes), key=lambda pair: math.dist(pair[0].position, pair[1].position))
+        self.connect_nodes(start.level_id, bridge.level_id)
+
+        return nodes
+
     def check_all_completed(self):
         if not self.nodes:
             return False
@@ -76,7 +213,7 @@ class LevelGraph:
         self.all_completed = True
         return True
 
-    def save_to_file(self, filename):
+    def to_dict(self):
         data = {
             'nodes': [],
             'connections': [],
@@ -99,43 +236,49 @@ class LevelGraph:
                 if connection.level_id > node.level_id:
                     data['connections'].append([node.level_id, connection.level_id])
 
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
-
-    def load_from_file(self, filename):
-        try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
-
-
-            for node_data in data['nodes']:
-                self.add_node(
-                    node_data['id'],
-                    node_data['x'],
-                    node_data['y'],
-                    node_data['name'],
-                    node_data.get('unlocked', False),
-                    node_data.get('completed', False)
-                )
-
-
-            for connection in data['connections']:
-                self.connect_nodes(connection[0], connection[1])
-
-
-            last_visited_id = data.get('last_visited_id', 1)
-            if last_visited_id in self.nodes:
-                self.current_node = self.nodes[last_visited_id]
-                self.last_visited_id = last_visited_id
-
-            if self.current_node:
-                for node in self.current_node.connections:
-                    if not node.completed:
-                        self.unlock_node(node.level_id)
+        return data
+
+    def load_dict(self, data):
+        for node_data in data['nodes']:
+            self.add_node(
+                node_data['id'],
+                node_data['x'],
+                node_data['y'],
+                node_data['name'],
+                node_data.get('unlocked', False),
+                node_data.get('completed', False)
+            )
+
+        for connection in data['connections']:
+            self.connect_nodes(connection[0], connection[1])
+
+        last_visited_id = data.get('last_visited_id', 1)
+        if last_visited_id in self.nodes:
+            self.current_node = self.nodes[last_visited_id]
+            self.last_visited_id = last_visited_id
+
+    def apply_change(self, change):
+        kind, args = change[0], change[1:]
+
+        if kind == 'node':
+            self.add_node(*args)
+        elif kind == 'link':
+            self.connect_nodes(*args)
+        elif kind == 'unlock':
+            self.unlock_node(*args)
+        elif kind == 'complete':
+            self.complete_node(*args)
+        elif kind == 'move':
+            self.current_node = self.nodes[args[0]]
+            self.last_visited_id = args[0]
+        else:
+            raise ValueError(f'unknown graph change {kind}')
 
-        except Exception as e:
-            print(f"Ошибка загрузки графа: {e}")
-            self.create_default_graph()
+    def unlock_neighbours(self):
+        if self.current_node:
+            for node in self.current_node.connections:
+                if not node.completed:
+                    self.unlock_node(node.level_id)
 
     def create_default_graph(self):
         self.add_node(1, 400, 300, "Земля", True, False)
@@ -152,24 +295,216 @@ class LevelGraph:
         self.connect_nodes(5, 6)
 
 
+class StarChunk:
+    def __init__(self):
+        self.nodes = []
+        self.links = []
+        self.sprites = None
+        self.batch = None
+        self.edges = None
+        self.built = False
+        self.dirty = True
+
+
+class StarMap:
+    def __init__(self, textures, chunk_size=CHUNK_SIZE):
+        self.textures = textures
+        self.chunk_size = chunk_size
+        self.graph = None
+        self.state = None
+        self.selected = None
+        self.hovered = None
+
+        self.chunks = {}
+        self.visuals = {}
+        self.count = 0
+        self.reach = 0
+        self.drawn = 0
+        self.rebuilds = 0
+
+    def get_chunk(self, x, y):
+        return int(x // self.chunk_size), int(y // self.chunk_size)
+
+    def get_or_add_chunk(self, x, y):
+        key = self.get_chunk(x, y)
+
+        if key not in self.chunks:
+            self.chunks[key] = StarChunk()
+
+        return self.chunks[key]
+
+    def reset(self, graph):
+        self.graph = graph
+        self.chunks = {}
+        self.visuals = {}
+        self.count = 0
+
+    def assign(self):
+        nodes = list(self.graph.nodes.values())
+
+        for node in nodes[self.count:]:
+            chunk = self.get_or_add_chunk(*node.position)
+            chunk.nodes.append(node)
+
+            if chunk.built:
+                self.add_visual(chunk, node)
+
+        self.count = len(nodes)
+
+        for chunk in self.chunks.values():
+            chunk.links = []
+            chunk.dirty = True
+
+        self.reach = 0
+
+        for node in nodes:
+            for connection in node.connections:
+                if connection.level_id > node.level_id:
+                    (x1, y1), (x2, y2) = node.position, connection.position
+                    self.get_or_add_chunk((x1 + x2) / 2, (y1 + y2) / 2).links.append((node, connection))
+                    self.reach = max(self.reach, math.hypot(x2 - x1, y2 - y1) / 2)
+
+    def build(self, chunk):
+        chunk.sprites = arcade.SpriteList()
+        chunk.batch = Batch()
+
+        for node in chunk.nodes:
+            self.add_visual(chunk, node)
+
+        chunk.built = True
+
+    def add_visual(self, chunk, node):
+        x, y = node.position
+        sprite = arcade.Sprite(self.textures['locked'], center_x=x, center_y=y)
+        sprite.size = (40, 40)
+        chunk.sprites.append(sprite)
+
+        name = arcade.Text(node.name, x, y - 30, arcade.color.GRAY, 12, anchor_x="center", batch=chunk.batch)
+        status = arcade.Text('', x, y - 50, arcade.color.GRAY, 10, anchor_x="center", batch=chunk.batch)
+        self.visuals[node.level_id] = (sprite, name, status)
+
+    def build_edges(self, chunk):
+        chunk.edges = arcade.shape_list.ShapeElementList()
+
+        for node, connection in chunk.links:
+            if node.completed or connection.completed:
+                color = arcade.color.DARK_GRAY
+            elif node.unlocked and connection.unlocked:
+                color = arcade.color.GOLD
+            else:
+                color = arcade.color.LIGHT_GRAY
+            chunk.edges.append(arcade.shape_list.create_line(*node.position, *connection.position, color, 2))
+
+    def style(self, node):
+        if node is None or node.level_id not in self.visuals:
+            return
+
+        sprite, name, status = self.visuals[node.level_id]
+
+        if node.completed:
+            texture = self.textures['completed']
+        elif node == self.selected and node.unlocked:
+            texture = self.textures['current']
+        elif node == self.hovered and node.unlocked:
+            texture = self.textures['hover']
+        elif node.unlocked:
+            texture = self.textures['unlocked']
+        else:
+            texture = self.textures['locked']
+
+        if node.completed:
+            color = arcade.color.DARK_GRAY
+            text = "Зачищено"
+        elif node.unlocked:
+            color = arcade.color.WHITE
+            text = "Доступно для высадки" if node != self.selected else "Текущий"
+        else:
+            color = arcade.color.GRAY
+            text = "Заблокирован"
+
+        if sprite.texture is not texture:
+            sprite.texture = texture
+            sprite.size = (40, 40)
+
+        if name.color != color:
+            name.color = color
+            status.color = color
+
+        if status.text != text:
+            status.text = text
+
+    def update(self, graph, selected, hovered):
+        state = (graph, graph.version, selected, hovered)
+
+        if state == self.state:
+            return
+
+        if graph is not self.graph:
+            self.reset(graph)
+
+        previous = self.state or (None, None, None, None)
+
+        self.selected = selected
+        self.hovered = hovered
+
+        if previous[:2] != state[:2]:
+            self.assign()
+            self.rebuilds += 1
+        else:
+            for node in (previous[2], previous[3], selected, hovered):
+                self.style(node)
+
+        self.state = state
+
+    def get_visible(self, camera):
+        margin = self.reach + 100
+        (left, bottom), (right, top) = camera.bottom_left, camera.top_right
+        x1, y1 = self.get_chunk(left - margin, bottom - margin)
+        x2, y2 = self.get_chunk(right + margin, top + margin)
+
+        return [self.chunks[(x, y)] for x in range(x1, x2 + 1) for y in range(y1, y2 + 1) if (x, y) in self.chunks]
+
+    def draw(self, camera):
+        visible = self.get_visible(camera)
+
+        for chunk in visible:
+            if not chunk.built:
+                self.build(chunk)
+
+            if chunk.dirty:
+                self.build_edges(chunk)
+
+                for node in chunk.nodes:
+                    self.style(node)
+
+                chunk.dirty = False
+
+            chunk.edges.draw()
+
+        for chunk in visible:
+            chunk.sprites.draw()
+
+        for chunk in visible:
+            chunk.batch.draw()
+
+        self.drawn = len(visible)
+
+
 class LevelTransitionView(arcade.View):
     def __init__(self, game_instance, is_level_comp=False, completed_node_id=None, level=1):
         super().__init__()
         self.window.set_mouse_visible(True)
         self.game = game_instance
-        self.level_graph = LevelGraph()
         self.money = game_instance.player.money
         self.upgrade_crystals = game_instance.player.upgrade_crystals
         self.level = level
 
         if self.level == 1:
             self.generate_random_graph()
+        else:
+            self.level_graph = galaxy.store.load(LevelGraph)
 
-        try:
-            self.level_graph.load_from_file('assets/levels/level_graph.json')
-        except:
-            self.generate_random_graph()
-            self.level_graph.save_to_file('assets/levels/level_graph.json')
+        self.level_graph.unlock_neighbours()
 
         if completed_node_id is not None:
             self.level_graph.complete_node(completed_node_id)
@@ -179,10 +514,10 @@ class LevelTransitionView(arcade.View):
                     if not node.completed:
                         self.level_graph.unlock_node(node.level_id)
 
-        self.level_graph.save_to_file('assets/levels/level_graph.json')
+        if not self.level_graph.has_destinations():
+            self.extend_galaxy()
 
-        if self.level_graph.check_all_completed():
-            self.generate_random_graph()
+        galaxy.store.save(self.level_graph)
 
         self.spaceship_texture = arcade.load_texture('assets/images/ui/spaceship.png')
         self.star_locked_texture = arcade.load_texture('assets/images/ui/star_locked.png')
@@ -200,11 +535,27 @@ class LevelTransitionView(arcade.View):
         else:
             self.spaceship_position = (400, 300)
 
+        if self.selected_node and not self.selected_node.completed:
+            self.prepare_landing(self.selected_node)
+
         self.spaceship_target = None
         self.spaceship_speed = 200
 
         self.camera = arcade.camera.Camera2D()
         self.camera.position = self.spaceship_position
+        self.gui_camera = arcade.camera.Camera2D()
+
+        self.star_map = StarMap({
+            'locked': self.star_locked_texture,
+            'unlocked': self.star_unlocked_texture,
+            'hover': self.star_hover_texture,
+            'current': self.star_current_texture,
+            'completed': self.star_completed_texture,
+        })
+
+        self.spaceship = arcade.Sprite(self.spaceship_texture, 0.1, *self.spaceship_position)
+        self.spaceship_list = arcade.SpriteList()
+        self.spaceship_list.append(self.spaceship)
 
         self.title_text = arcade.Text("Карта Галактики", 400, 550, arcade.color.GOLD, 36, anchor_x="center")
         self.hint_text = arcade.Text("Кликните на звезду для перелета", 400, 500, arcade.color.LIGHT_GRAY, 20,
@@ -222,102 +573,38 @@ class LevelTransitionView(arcade.View):
         darkened_image = enhancer.enhance(0.3)
         return arcade.Texture(darkened_image)
 
-    def generate_random_graph(self):
+    def generate_random_graph(self, sectors=GALAXY_SECTORS):
         self.level_graph = LevelGraph()
-        base_x, base_y = 400, 300
-        self.level_graph.add_node(1, base_x, base_y, "Стартовая база", True, False)
-        planet_names = ["Марс", "Венера", "Меркурий", "Юпитер", "Сатурн", "Уран", "Нептун", "Плутон", "Церера", "Эрида",
-                        "Татуин", "Альдераан", "Эндор", "Джакку", "Корусант"]
-        random.shuffle(planet_names)
-        planet_types = ["пустынная", "ледяная", "горная", "водная", "лесная", "вулканическая", "газовая",
-                        "металлическая", "болотистая", "радиоактивная"]
-        random.shuffle(planet_types)
-        num_planets = random.randint(4, 7)
-        nodes = [self.level_graph.nodes[1]]
-        used_names = set()
-
-        for i in range(2, num_planets + 2):
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.uniform(150, 350)
-            x = base_x + distance * math.cos(angle)
-            y = base_y + distance * math.sin(angle)
+        base_x, base_y = GALAXY_CENTER
+        start = self.level_graph.add_node(1, base_x, base_y, "Стартовая база", True, False)
 
-            while True:
-                base_name = random.choice(planet_names)
-                planet_type = random.choice(planet_types)
-                name = f"{base_name} ({planet_type})"
-                if name not in used_names:
-                    used_names.add(name)
-                    break
+        nodes = self.level_graph.add_sector(start, True)
+        self.level_graph.unlock_node(nodes[0].level_id)
 
-            if i == 2:
-                unlocked = True
-            else:
-                unlocked = False
+        for _ in range(sectors - 1):
+            self.level_graph.add_sector(seeds.run.get('galaxy').choice(list(self.level_graph.nodes.values())))
 
-            self.level_graph.add_node(i, x, y, name, unlocked, False)
-            nodes.append(self.level_graph.nodes[i])
+        self.level_graph.current_node = start
 
-        for i in range(len(nodes)):
-            connections = random.randint(1, 3)
-            possible_connections = [j for j in range(len(nodes)) if j != i]
-            random.shuffle(possible_connections)
-            for j in range(min(connections, len(possible_connections))):
-                target_idx = possible_connections[j]
-                self.level_graph.connect_nodes(nodes[i].level_id, nodes[target_idx].level_id)
+    def extend_galaxy(self):
+        hub = self.level_graph.current_node or self.level_graph.start_node
+        nodes = self.level_graph.add_sector(hub)
 
-        self.level_graph.current_node = self.level_graph.nodes[1]
-        self.level_graph.save_to_file('assets/levels/level_graph.json')
+        for node in nodes:
+            if any(i not in nodes for i in node.connections):
+                self.level_graph.unlock_node(node.level_id)
 
     def on_draw(self):
         self.clear(arcade.color.DARK_SLATE_GRAY)
         self.camera.use()
 
-        for node in self.level_graph.nodes.values():
-            for connection in node.connections:
-                if connection.level_id > node.level_id:
-                    start_x, start_y = node.position
-                    end_x, end_y = connection.position
-                    if node.completed or connection.completed:
-                        color = arcade.color.DARK_GRAY
-                    elif node.unlocked and connection.unlocked:
-                        color = arcade.color.GOLD
-                    else:
-                        color = arcade.color.LIGHT_GRAY
-                    arcade.draw_line(start_x, start_y, end_x, end_y, color, 2)
-
-        for node in self.level_graph.nodes.values():
-            if node.completed:
-                texture = self.star_completed_texture
-            elif node == self.selected_node and node.unlocked and not node.completed:
-                texture = self.star_current_texture
-            elif node == self.hovered_node and node.unlocked and not node.completed:
-                texture = self.star_hover_texture
-            elif node.unlocked and not node.completed:
-                texture = self.star_unlocked_texture
-            else:
-                texture = self.star_locked_texture
-
-            rect = arcade.rect.XYWH(node.position[0], node.position[1], 40, 40)
-            arcade.draw_texture_rect(texture, rect)
+        self.star_map.update(self.level_graph, self.selected_node, self.hovered_node)
+        self.star_map.draw(self.camera)
 
-            if node.completed:
-                color = arcade.color.DARK_GRAY
-                status = "Зачищено"
-            elif node.unlocked:
-                color = arcade.color.WHITE
-                status = "Доступно для высадки" if node != self.selected_node else "Текущий"
-            else:
-                color = arcade.color.GRAY
-                status = "Заблокирован"
+        self.spaceship.position = self.spaceship_position
+        self.spaceship_list.draw()
 
-            arcade.draw_text(node.name, node.position[0], node.position[1] - 30, color, 12, anchor_x="center")
-            arcade.draw_text(status, node.position[0], node.position[1] - 50, color, 10, anchor_x="center")
-
-        ship_x, ship_y = self.spaceship_position
-        rect = arcade.rect.XYWH(ship_x, ship_y, self.spaceship_texture.width * 0.1, self.spaceship_texture.height * 0.1)
-        arcade.draw_texture_rect(self.spaceship_texture, rect)
-        arcade.camera.Camera2D().use()
+        self.gui_camera.use()
         self.title_text.draw()
         self.hint_text.draw()
         self.landing_hint.draw()
@@ -350,54 +637,53 @@ class LevelTransitionView(arcade.View):
         self.camera.position = self.spaceship_position
 
     def on_mouse_motion(self, x, y, dx, dy):
-        self.hovered_node = None
         world_x = x + (self.camera.position[0] - 400)
         world_y = y + (self.camera.position[1] - 300)
 
-        for node in self.level_graph.nodes.values():
-            if node.completed or not node.unlocked:
-                continue
-            distance = math.sqrt((world_x - node.position[0]) ** 2 + (world_y - node.position[1]) ** 2)
-            if distance < 25:
-                self.hovered_node = node
-                break
+        self.hovered_node = self.level_graph.pick(world_x, world_y, predicate=lambda node: node.unlocked and not node.completed)
 
     def on_mouse_press(self, x, y, button, modifiers):
         if button != arcade.MOUSE_BUTTON_LEFT:
             return
 
-        closest_node = None
-        min_distance = float('inf')
         world_x = x + (self.camera.position[0] - 400)
         world_y = y + (self.camera.position[1] - 300)
 
-        for node in self.level_graph.nodes.values():
-            if not node.unlocked:
-                continue
-            distance = math.sqrt((world_x - node.position[0]) ** 2 + (world_y - node.position[1]) ** 2)
-            if distance < 25 and distance < min_distance:
-                min_distance = distance
-                closest_node = node
+        closest_node = self.level_graph.pick(world_x, world_y, predicate=lambda node: node.unlocked)
 
         if closest_node:
             self.selected_node = closest_node
             self.spaceship_target = closest_node
             self.selected_info_text = None
             self.selected_warning_text = None
+            self.prepare_landing(closest_node)
+
+    def prepare_landing(self, node):
+        prepared = landing.preloader.get(node.level_id)
+
+        if prepared is None:
+            rng = seeds.run.get('landing')
+            color = arcade.color.BLACK.from_iterable((rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)))
+            music = f'assets/music/music{rng.randint(1, 3)}.mp3'
+            prepared = landing.preloader.prepare(node.level_id, self.generate_random_map(), color, music)
+
+        return prepared
 
     def on_key_press(self, key, modifiers):
         if key == arcade.key.SPACE and self.selected_node:
             if not self.selected_node.completed:
                 if self.level_graph.move_to_node(self.selected_node.level_id):
                     self.level += 1
-                    mapp = self.generate_random_map()
-                    level_id = self.selected_node.level_id
-                    color = arcade.color.BLACK.from_iterable((random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)))
+                    prepared = self.prepare_landing(self.selected_node)
+                    landing.preloader.wait(prepared)
+                    landing.preloader.clear()
 
-                    self.level_graph.save_to_file('assets/levels/level_graph.json')
+                    galaxy.store.save(self.level_graph)
 
                     from main import Game
-                    game_view = Game(mapp, self.money, self.upgrade_crystals, self.game.player.modifiers, self.game.get_player_weapons(), self.game.get_player_armor(), self.game.player.health, self.level, color, level_id)
+                    game_view = Game(prepared.map_name, self.money, self.upgrade_crystals, self.game.player.modifiers, self.game.get_player_weapons(), self.game.get_player_armor(), self.game.player.health, self.level, prepared.color,
+                                     prepared.level_id, level_graph=self.level_graph, music=prepared.music,
+                                     tilemap=prepared.tilemap)
                     self.window.show_view(game_view)
                 else:
                     self.selected_info_text = arcade.Text(f"Ошибка: нельзя высадиться на {self.selected_node.name}",
@@ -413,4 +699,4 @@ class LevelTransitionView(arcade.View):
         map_templates = ["map1.tmx", "map2.tmx", "map3.tmx", "map4.tmx",
                          "map5.tmx", "shop.tmx", "boss.tmx"]
 
-        return random.choice(map_templates)
+        return seeds.run.get('landing').choice(map_templates)
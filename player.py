@@ -0,0 +1,130 @@
+import arcade
+
+import items
+from seeds import Seeds
+
+
+class Player(arcade.Sprite):
+    def __init__(self, texture, x, y, scale, money, upgrade_crystals, weapons_list, armor_list, projectiles, enemies_list, enemy_grid, flow_field, items_list, particles, modifiers={}, seeds=None, spawn_enemy=None):
+        super().__init__(texture, scale, x, y)
+        self.modifiers = modifiers
+        self.weapon = None
+        self.armor = None
+        self.max_health = 10 * modifiers.get('health', 1)
+        self.health = self.max_health
+        self.weapons_list = weapons_list
+        self.projectiles = projectiles
+        self.enemies_list = enemies_list
+        self.enemy_grid = enemy_grid
+        self.flow_field = flow_field
+        self.particles = particles
+        self.items_list = items_list
+        self.armor_list = armor_list
+        self.speed = 6500 * modifiers.get('speed', 1)
+        self.money = money
+        self.upgrade_crystals = upgrade_crystals
+        self.seeds = seeds if seeds is not None else Seeds()
+        self.spawn_enemy = spawn_enemy
+
+        self.inventory = [None] * modifiers.get('inventory', 1)
+        self.curr_slot = 0
+
+    def update(self, delta_time, keys):
+        move_x = move_y = 0
+
+        if arcade.key.W in keys:
+            move_y += self.speed
+        if arcade.key.S in keys:
+            move_y -= self.speed
+        if arcade.key.D in keys:
+            move_x += self.speed
+        if arcade.key.A in keys:
+            move_x -= self.speed
+
+        self.physics_engines[0].apply_force(self, (move_x, move_y))
+
+        if self.weapon is not None:
+            self.weapon.update(delta_time)
+
+        if self.armor is not None:
+            self.armor.update(delta_time)
+
+    def attack(self, x, y):
+        if self.weapon is not None:
+            self.weapon.attack(x, y)
+
+    def set_weapon(self, weapon):
+        if self.weapon is not None:
+            self.weapon.kill()
+
+        self.weapon = weapon
+
+        if self.weapon is not None:
+            self.weapon.return_to_live()
+            self.weapons_list.append(self.weapon)
+
+    def hurt(self, damage):
+        if self.health > 0:
+            self.health -= damage
+
+            if self.health <= 0:
+                self.kill()
+                self.health = 0
+
+    def heal(self, health):
+        self.health = min([self.max_health, self.health + health])
+
+    def kill(self):
+        super().kill()
+
+        if self.weapon is not None:
+            self.weapon.kill()
+
+        if self.armor is not None:
+            self.armor.kill()
+
+    def next_item(self):
+        if self.health > 0:
+            self.curr_slot += 1
+            self.curr_slot %= len(self.inventory)
+
+            if self.weapon is not None:
+                self.projectiles.remove_owner(self.weapon)
+
+            self.set_weapon(self.inventory[self.curr_slot])
+
+    def set_weapon_slot(self, weapon, slot):
+        self.inventory[slot] = weapon
+
+        if slot == self.curr_slot:
+            self.set_weapon(weapon)
+
+    def get_item(self):
+        itemss = sorted(self.items_list.sprite_list, key=lambda x: x.get_distance())
+
+        if itemss:
+            if itemss[0].get_distance() <= 100:
+                return itemss[0]
+
+    def drop_item(self):
+        if self.health > 0:
+            if self.inventory[self.curr_slot] is not None:
+                self.items_list.append(items.WeaponItem(self.inventory[self.curr_slot].__class__, self.center_x, self.center_y, self, self.inventory[self.curr_slot].level))
+                self.set_weapon_slot(None, self.curr_slot)
+
+    def set_armor(self, armor):
+        if self.armor is not None:
+            self.armor.unapply_health()
+            self.armor.kill()
+
+        self.armor = armor
+
+        if self.armor is not None:
+            self.armor.apply_health()
+            self.armor_list.append(armor)
+
+    def drop_armor(self):
+        if self.health > 0:
+            if self.armor is not None:
+                self.items_list.append(items.ArmorItem(self.armor.__class__, self.center_x, self.center_y, self, self.armor.level))
+                self.set_armor(None)
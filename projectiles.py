@@ -0,0 +1,181 @@
+import arcade
+import numpy as np
+
+
+PLAYER = 'player'
+ENEMY = 'enemy'
+
+X = 0
+Y = 1
+VX = 2
+VY = 3
+LIFETIME = 4
+NEXT_LIFETIME = 5
+ANGLE = 6
+SPIN = 7
+PHASE = 8
+FIELDS = 9
+
+
+class BulletStore:
+    def __init__(self, capacity=256):
+        self.data = np.zeros((capacity, FIELDS))
+        self.bullets = []
+
+    def add(self, bullet):
+        count = len(self.bullets)
+
+        if count == len(self.data):
+            self.data = np.concatenate((self.data, np.zeros_like(self.data)))
+
+        vx, vy, lifetime, next_lifetime, spin = bullet.get_motion()
+
+        self.data[count] = (bullet.center_x, bullet.center_y, vx, vy, lifetime, next_lifetime or 0,
+                            bullet.angle, spin, next_lifetime is not None)
+        self.bullets.append(bullet)
+        bullet.slot = count
+
+    def remove(self, bullet):
+        slot = bullet.slot
+        last = len(self.bullets) - 1
+
+        if slot != last:
+            moved = self.bullets[last]
+            self.data[slot] = self.data[last]
+            self.bullets[slot] = moved
+            moved.slot = slot
+
+        self.bullets.pop()
+        bullet.slot = None
+
+    def update(self, delta_time):
+        count = len(self.bullets)
+
+        if not count:
+            return
+
+        data = self.data[:count]
+
+        data[:, X] += data[:, VX] * delta_time
+        data[:, Y] += data[:, VY] * delta_time
+        data[:, ANGLE] += data[:, SPIN] * delta_time
+        data[:, LIFETIME] -= delta_time
+
+        moving = np.flatnonzero((data[:, VX] != 0) | (data[:, VY] != 0)).tolist()
+        positions = data[moving, X:Y + 1].tolist()
+
+        for i, position in zip(moving, positions):
+            self.bullets[i].position = position
+
+        for i in np.flatnonzero(data[:, SPIN]).tolist():
+            self.bullets[i].angle = float(data[i, ANGLE])
+
+        expired = np.flatnonzero(data[:, LIFETIME] <= 0).tolist()
+
+        if not expired:
+            return
+
+        next_phase = [self.bullets[i] for i in expired if data[i, PHASE]]
+        dead = [self.bullets[i] for i in expired if not data[i, PHASE]]
+
+        for bullet in next_phase:
+            row = self.data[bullet.slot]
+            row[LIFETIME] = row[NEXT_LIFETIME]
+            row[VX] = row[VY] = row[SPIN] = row[PHASE] = 0
+            bullet.start_second_phase()
+
+        for bullet in dead:
+            bullet.kill()
+
+    def __len__(self):
+        return len(self.bullets)
+
+
+class ProjectileManager:
+    def __init__(self):
+        self.lists = {PLAYER: arcade.SpriteList(), ENEMY: arcade.SpriteList()}
+        self.owners = {}
+        self.store = BulletStore()
+
+    def add(self, bullet, owner, faction, pierce=None):
+        bullet.manager = self
+        bullet.owner = owner
+        bullet.faction = faction
+        bullet.pierce = pierce
+
+        self.lists[faction].append(bullet)
+        self.owners.setdefault(owner, {})[bullet] = None
+        self.store.add(bullet)
+
+    def remove(self, bullet):
+        owned = self.owners.get(bullet.owner)
+
+        if owned is not None:
+            owned.pop(bullet, None)
+
+            if not owned:
+                del self.owners[bullet.owner]
+
+        self.release(bullet)
+
+    def remove_owner(self, owner):
+        for bullet in self.owners.pop(owner, ()):
+            self.release(bullet)
+
+    def release(self, bullet):
+        bullet.manager = None
+
+        if bullet.slot is not None:
+            self.store.remove(bullet)
+
+        if bullet.sprite_lists:
+            bullet.remove_from_sprite_lists()
+
+        if bullet.pool is not None:
+            bullet.pool.release(bullet)
+
+    def owned(self, owner):
+        return list(self.owners.get(owner, ()))
+
+    def update(self, delta_time, enemy_grid, player):
+        self.check_player_bullets(enemy_grid)
+        self.check_enemy_bullets(player)
+        self.store.update(delta_time)
+
+    def check_player_bullets(self, enemy_grid):
+        for bullet, enemy in enemy_grid.get_pairs(self.lists[PLAYER].sprite_list):
+            if bullet.manager is not self or not enemy.sprite_lists or enemy in bullet.attacked:
+                continue
+
+            if not arcade.check_for_collision(bullet, enemy):
+                continue
+
+            enemy.hurt(bullet.get_damage())
+
+            if bullet.pierce is not None:
+                bullet.targets_damaged += 1
+
+                if bullet.targets_damaged >= bullet.pierce:
+                    bullet.kill()
+                    continue
+
+            bullet.attacked.add(enemy)
+
+    def check_enemy_bullets(self, player):
+        if player.health <= 0:
+            return
+
+        for bullet in arcade.check_for_collision_with_list(player, self.lists[ENEMY]):
+            player.hurt(bullet.get_damage())
+            bullet.kill()
+
+    def draw(self):
+        self.lists[ENEMY].draw()
+        self.lists[PLAYER].draw()
+
+    def clear(self):
+        for owner in list(self.owners):
+            self.remove_owner(owner)
+
+    def __len__(self):
+        return sum(len(i) for i in self.lists.values())
@@ -0,0 +1,394 @@
+import argparse
+import atexit
+import glob
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+
+import items
+import snapshots
+import tilemaps
+from pathfinding import FlowField
+from simulation import ACTIONS, MOVEMENT_KEYS, Simulation, get_loadout
+
+
+MAGIC = b'KPKI'
+VERSION = 2
+REPLAYS_DIR = os.path.join('data', 'replays')
+MAX_RECORDINGS = 10
+FLUSH_FRAMES = 60
+SPIKE_MS = 50
+CHECK_MAP = 'map2.tmx'
+CHECK_FRAMES = 3600
+CHECK_DELTAS = (1 / 60, 1 / 60, 1 / 30, 1 / 144, 0.05)
+
+HEADER = struct.Struct('<4sHiI')
+FRAME = struct.Struct('<cdBI')
+ATTACK = struct.Struct('<cdd')
+ACTION = struct.Struct('<cB')
+RECORDS = {b'F': FRAME, b'A': ATTACK, b'C': ACTION}
+
+
+def get_mask(keys):
+    return sum(1 << n for n, key in enumerate(MOVEMENT_KEYS) if key in keys)
+
+
+def get_keys(mask):
+    return {key for n, key in enumerate(MOVEMENT_KEYS) if mask & 1 << n}
+
+
+class Recorder:
+    def __init__(self, directory=REPLAYS_DIR, limit=MAX_RECORDINGS):
+        self.directory = directory
+        self.limit = limit
+        self.path = None
+        self.file = None
+        self.buffer = bytearray()
+        self.pending = 0
+
+        self.frames = 0
+        self.events = 0
+        self.size = 0
+        self.errors = 0
+
+    def start(self, snapshot, upgrade_crystals):
+        self.stop()
+
+        data = snapshots.encode(dict(snapshot, graph=None))
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{snapshot['level']}-{snapshot['seed']:016x}.kpkrec"
+        self.path = os.path.join(self.directory, name)
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self.prune()
+            self.file = open(self.path, 'wb')
+        except OSError:
+            self.errors += 1
+            self.file = None
+            return
+
+        self.frames = 0
+        self.events = 0
+        self.size = 0
+        self.buffer += HEADER.pack(MAGIC, VERSION, upgrade_crystals, len(data)) + data
+        self.flush()
+
+    def prune(self):
+        recordings = sorted(glob.glob(os.path.join(self.directory, '*.kpkrec')))
+
+        for path in recordings[:max(len(recordings) - self.limit + 1, 0)]:
+            os.remove(path)
+
+    def action(self, action):
+        self.event(ACTION.pack(b'C', ACTIONS.index(action)))
+
+    def event(self, data):
+        if self.file is not None:
+            self.buffer += data
+            self.events += 1
+
+    def frame(self, delta_time, keys, attacks, checksum):
+        if self.file is None:
+            return
+
+        for x, y in attacks:
+            self.event(ATTACK.pack(b'A', x, y))
+
+        self.buffer += FRAME.pack(b'F', delta_time, get_mask(keys), checksum)
+        self.frames += 1
+        self.pending += 1
+
+        if self.pending >= FLUSH_FRAMES:
+            self.flush()
+
+    def flush(self):
+        if self.file is None or not self.buffer:
+            return
+
+        try:
+            self.file.write(self.buffer)
+            self.file.flush()
+            self.size += len(self.buffer)
+        except OSError:
+            self.errors += 1
+
+        self.buffer = bytearray()
+        self.pending = 0
+
+    def stop(self):
+        self.flush()
+
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def get_stats(self):
+        return {
+            'path': self.path,
+            'frames': self.frames,
+            'events': self.events,
+            'bytes': self.size + len(self.buffer),
+            'errors': self.errors,
+        }
+
+
+recorder = Recorder()
+atexit.register(recorder.stop)
+
+
+def load(path):
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    try:
+        magic, version, upgrade_crystals, size = HEADER.unpack_from(data)
+    except struct.error:
+        raise ValueError('recording is too short')
+
+    if magic != MAGIC:
+        raise ValueError('not a recording')
+
+    if version != VERSION:
+        raise ValueError(f'unsupported recording version {version}')
+
+    offset = HEADER.size
+    snapshot = snapshots.decode(data[offset:offset + size])
+    offset += size
+    records = []
+
+    while offset < len(data):
+        tag = data[offset:offset + 1]
+        record = RECORDS.get(tag)
+
+        if record is None or offset + record.size > len(data):
+            break
+
+        records.append(record.unpack_from(data, offset))
+        offset += record.size
+
+    return snapshot, upgrade_crystals, records
+
+
+def create_simulation(snapshot, upgrade_crystals):
+    weapons_now, armor_now, color = get_loadout(snapshot)
+
+    simulation = Simulation(snapshot['map'], snapshot['money'], upgrade_crystals, snapshot['modifiers'], weapons_now, armor_now, snapshot['health'],
+                            snapshot['level'], color, snapshot['rooms'], seed=snapshot['seed'])
+    simulation.select_slot(snapshot['slot'])
+
+    return simulation
+
+
+def get_latest(directory=REPLAYS_DIR):
+    recordings = sorted(glob.glob(os.path.join(directory, '*.kpkrec')))
+
+    return recordings[-1] if recordings else None
+
+
+class Replay:
+    def __init__(self, path):
+        self.path = path
+        self.snapshot, self.upgrade_crystals, self.records = load(path)
+        self.simulation = None
+
+        self.frames = 0
+        self.recorded_time = 0
+        self.divergence = None
+        self.error = None
+        self.frame_ms = []
+        self.recorded_ms = []
+
+    def run(self, stop_on_divergence=True):
+        self.simulation = simulation = create_simulation(self.snapshot, self.upgrade_crystals)
+        attacks = []
+        start = time.perf_counter()
+
+        try:
+            for record in self.records:
+                tag = record[0]
+
+                if tag == b'A':
+                    attacks.append(record[1:])
+                elif tag == b'C':
+                    getattr(simulation, ACTIONS[record[1]])()
+                else:
+                    delta_time, mask, recorded = record[1:]
+
+                    frame_start = time.perf_counter()
+                    simulation.step(delta_time, get_keys(mask), attacks)
+                    checksum = simulation.get_checksum()
+                    self.frame_ms.append((time.perf_counter() - frame_start) * 1000)
+                    self.recorded_ms.append(delta_time * 1000)
+                    self.recorded_time += delta_time
+                    attacks = []
+
+                    if checksum != recorded and self.divergence is None:
+                        self.divergence = self.frames
+
+                        if stop_on_divergence:
+                            self.frames += 1
+                            break
+
+                    self.frames += 1
+        except Exception as e:
+            self.error = f'{type(e).__name__}: {e}'
+
+            if self.divergence is None:
+                self.divergence = self.frames
+
+        self.elapsed = time.perf_counter() - start
+
+        return self.divergence is None
+
+    def get_spikes(self, threshold=SPIKE_MS, count=10):
+        spikes = [(n, round(recorded, 2), round(replayed, 3)) for n, (recorded, replayed) in enumerate(zip(self.recorded_ms, self.frame_ms)) if recorded >= threshold]
+
+        return sorted(spikes, key=lambda i: -i[1])[:count]
+
+    def get_slowest(self, count=10):
+        frames = sorted(enumerate(self.frame_ms), key=lambda i: -i[1])[:count]
+
+        return [(n, round(ms, 3)) for n, ms in frames]
+
+    def get_stats(self):
+        return {
+            'path': self.path,
+            'map': self.snapshot['map'],
+            'level': self.snapshot['level'],
+            'seed': self.snapshot['seed'],
+            'frames': self.frames,
+            'ticks': self.simulation.ticks if self.simulation else 0,
+            'recorded_s': round(self.recorded_time, 3),
+            'replayed_s': round(self.elapsed, 3),
+            'speedup': round(self.recorded_time / max(self.elapsed, 1e-9), 1),
+            'divergence': self.divergence,
+            'error': self.error,
+            'state': self.simulation.get_state() if self.simulation else None,
+        }
+
+
+def get_check_snapshot(map_name=CHECK_MAP, seed=1):
+    tilemap = tilemaps.load_map('assets/tilesets/maps/' + map_name)
+    rooms = sorted({i.properties['room'] for i in tilemap.object_lists['join_triggers']})
+
+    return {
+        'map': map_name,
+        'level': 3,
+        'level_id': 1,
+        'color': (90, 60, 160),
+        'money': 0,
+        'health': 20,
+        'modifiers': {'damage': 1.2, 'health': 1.1, 'inventory': 2, 'speed': 1.1, 'lucky': 3},
+        'weapons': [('OldPistol', 5), (None, 1)],
+        'slot': 0,
+        'armor': (None, 1),
+        'rooms': rooms,
+        'run_seed': seed,
+        'seed': seed,
+        'graph': None,
+    }
+
+
+def get_check_keys(flow_field, x, y):
+    direction = flow_field.get_direction(x, y)
+
+    if direction is None:
+        return set()
+
+    col, row = flow_field.get_tile(x, y)
+    dx = (col + 0.5 + round(direction[0])) * flow_field.tile_width - x
+    dy = (row + 0.5 + round(direction[1])) * flow_field.tile_height - y
+
+    return {key for key, pressed in zip(MOVEMENT_KEYS, (dy > 4, dx < -4, dy < -4, dx > 4)) if pressed}
+
+
+def check(frames=CHECK_FRAMES):
+    snapshot = get_check_snapshot()
+    directory = tempfile.mkdtemp()
+    recorder = Recorder(directory)
+
+    simulation = create_simulation(snapshot, 0)
+    recorder.start(snapshot, 0)
+
+    player = simulation.player
+    tilemap = simulation.tilemap
+    chest = min([i for i in simulation.items_list if type(i) is items.Chest], key=lambda i: (i.center_x - player.center_x) ** 2 + (i.center_y - player.center_y) ** 2)
+    flow_field = FlowField(simulation.phone_list, simulation.walls_list, tilemap.width, tilemap.height, tilemap.tile_width * tilemap.scaling,
+                           tilemap.tile_height * tilemap.scaling)
+    flow_field.update(*chest.position)
+    opened = None
+
+    for frame in range(frames):
+        if opened is None and player.get_item() is chest:
+            recorder.action('use_item')
+            simulation.use_item()
+            opened = frame
+        elif opened is not None and frame - opened >= 60:
+            break
+
+        keys = get_check_keys(flow_field, *player.position) if opened is None else set()
+        delta_time = CHECK_DELTAS[frame % len(CHECK_DELTAS)]
+
+        simulation.step(delta_time, keys)
+        recorder.frame(delta_time, keys, (), simulation.get_checksum())
+
+    recorder.stop()
+
+    try:
+        replay = Replay(recorder.path)
+        ok = replay.run()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(replay.get_stats())
+
+    if opened is None:
+        print(f'the chest was not reached in {frames} frames')
+        return 2
+
+    if not ok:
+        print(f'chest opened at frame {opened}, replay diverged at frame {replay.divergence}' + (f' ({replay.error})' if replay.error else ''))
+        return 2
+
+    print(f'chest opened at frame {opened}, {replay.frames} frames match')
+
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded session headless and check it frame by frame.')
+    parser.add_argument('path', nargs='?', help='recording to replay, the latest one by default')
+    parser.add_argument('--keep-going', action='store_true', help='do not stop at the first diverged frame')
+    parser.add_argument('--spike-ms', type=float, default=SPIKE_MS, help='recorded frame time that counts as a lag spike')
+    parser.add_argument('--check', action='store_true', help='record a scripted run that opens a chest and check that it replays')
+    args = parser.parse_args()
+
+    if args.check:
+        return check()
+
+    path = args.path or get_latest()
+
+    if path is None:
+        print(f'no recordings in {REPLAYS_DIR}', file=sys.stderr)
+        return 1
+
+    replay = Replay(path)
+    ok = replay.run(not args.keep_going)
+
+    print(replay.get_stats())
+    print('lag spikes (frame, recorded ms, replayed ms):', replay.get_spikes(args.spike_ms))
+    print('slowest replayed frames (frame, ms):', replay.get_slowest())
+
+    if ok:
+        print(f'{replay.frames} frames match')
+    else:
+        print(f'diverged at frame {replay.divergence}' + (f' ({replay.error})' if replay.error else ''))
+
+    return 0 if ok else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+class Room:
+    def __init__(self, room_id):
+        self.id = room_id
+        self.triggers = []
+        self.enemies = []
+        self.bounds = None
+        self.active = False
+
+    def add_trigger(self, rect):
+        self.triggers.append(rect)
+        self.extend_bounds(*rect)
+
+    def add_enemy(self, enemy):
+        self.enemies.append(enemy)
+        self.extend_bounds(enemy.center_x, enemy.center_x, enemy.center_y, enemy.center_y)
+
+    def extend_bounds(self, left, right, bottom, top):
+        if self.bounds is None:
+            self.bounds = (left, right, bottom, top)
+        else:
+            self.bounds = (min(self.bounds[0], left), max(self.bounds[1], right),
+                           min(self.bounds[2], bottom), max(self.bounds[3], top))
+
+    def get_alive(self):
+        return [i for i in self.enemies if i.sprite_lists]
+
+    def is_cleared(self):
+        return self.active and not self.get_alive()
+
+
+class RoomIndex:
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.rooms = {}
+        self.cells = {}
+
+    def get(self, room_id):
+        room = self.rooms.get(room_id)
+
+        if room is None:
+            room = self.rooms[room_id] = Room(room_id)
+
+        return room
+
+    def get_cells(self, left, right, bottom, top):
+        size = self.cell_size
+
+        return [(x, y) for x in range(int(left // size), int(right // size) + 1)
+                for y in range(int(bottom // size), int(top // size) + 1)]
+
+    def add_trigger(self, room_id, shape):
+        xs = [i[0] for i in shape]
+        ys = [i[1] for i in shape]
+        rect = (min(xs), max(xs), min(ys), max(ys))
+
+        room = self.get(room_id)
+        room.add_trigger(rect)
+
+        for cell in self.get_cells(*rect):
+            self.cells.setdefault(cell, []).append((rect, room))
+
+    def add_enemy(self, enemy):
+        self.get(enemy.room).add_enemy(enemy)
+
+    def enter(self, sprite):
+        left, right, bottom, top = sprite.left, sprite.right, sprite.bottom, sprite.top
+        entered = []
+
+        for cell in self.get_cells(left, right, bottom, top):
+            for rect, room in self.cells.get(cell, ()):
+                if room.active or room in entered:
+                    continue
+
+                if left <= rect[1] and right >= rect[0] and bottom <= rect[3] and top >= rect[2]:
+                    entered.append(room)
+
+        for room in entered:
+            self.activate(room)
+
+        return entered
+
+    def activate(self, room):
+        if room.active:
+            return False
+
+        room.active = True
+
+        for cell in self.get_cells(*room.bounds):
+            triggers = self.cells.get(cell)
+
+            if triggers is None:
+                continue
+
+            triggers[:] = [i for i in triggers if i[1] is not room]
+
+            if not triggers:
+                del self.cells[cell]
+
+        return True
+
+    def get_sleeping(self):
+        return [i for i in self.rooms.values() if not i.active]
+
+    def get_cleared(self):
+        return [i for i in self.rooms.values() if i.is_cleared()]
+
+    def __iter__(self):
+        return iter(self.rooms.values())
+
+    def __len__(self):
+        return len(self.rooms)
@@ -0,0 +1,160 @@
+import atexit
+import json
+import os
+import shutil
+import threading
+
+
+VERSION = 1
+SAVE_PATH = os.path.join('data', 'data.txt')
+SAVE_DELAY = 0.5
+UPGRADES = ['damage', 'health', 'inventory', 'speed', 'lucky']
+
+
+def write_atomic(path, data):
+    temp_path = path + '.tmp'
+    mode = 'wb' if isinstance(data, bytes) else 'w'
+    encoding = None if isinstance(data, bytes) else 'utf-8'
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    with open(temp_path, mode, encoding=encoding) as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temp_path, path)
+
+
+def get_default():
+    return {'version': VERSION, 'shards': 0, 'upgrades': {i: 0 for i in UPGRADES}}
+
+
+def migrate_legacy(text):
+    values = [int(i) for i in text.split()]
+
+    if len(values) != len(UPGRADES) + 1:
+        raise ValueError('legacy save must have 6 lines')
+
+    return {'version': 1, 'shards': values[0], 'upgrades': dict(zip(UPGRADES, values[1:]))}
+
+
+def parse(text):
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return migrate_legacy(text)
+
+    if not isinstance(data, dict) or not isinstance(data.get('version'), int):
+        raise ValueError('save has no version')
+
+    if data['version'] > VERSION:
+        raise ValueError(f'save version {data["version"]} is newer than {VERSION}')
+
+    save = get_default()
+    save['shards'] = int(data.get('shards', 0))
+
+    for key, value in data.get('upgrades', {}).items():
+        if key in save['upgrades']:
+            save['upgrades'][key] = int(value)
+
+    return save
+
+
+class SaveManager:
+    def __init__(self, path=SAVE_PATH, delay=SAVE_DELAY):
+        self.path = path
+        self.delay = delay
+        self.data = None
+
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.timer = None
+        self.changes = 0
+        self.written = 0
+
+        self.reads = 0
+        self.writes = 0
+        self.errors = 0
+
+    def load(self):
+        if self.data is not None:
+            return self.data
+
+        self.reads += 1
+
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                self.data = parse(file.read())
+        except FileNotFoundError:
+            self.data = get_default()
+        except (OSError, ValueError):
+            self.errors += 1
+            self.backup()
+            self.data = get_default()
+
+        return self.data
+
+    def backup(self):
+        try:
+            shutil.copyfile(self.path, self.path + '.bak')
+        except OSError:
+            pass
+
+    def get_shards(self):
+        return self.load()['shards']
+
+    def get_upgrades(self):
+        upgrades = self.load()['upgrades']
+
+        return [upgrades[i] for i in UPGRADES]
+
+    def set(self, shards, upgrades):
+        with self.lock:
+            data = self.load()
+            data['shards'] = int(shards)
+            data['upgrades'] = {key: int(value) for key, value in zip(UPGRADES, upgrades)}
+            self.changes += 1
+
+        self.schedule()
+
+    def schedule(self):
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+
+            self.timer = threading.Timer(self.delay, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def flush(self):
+        with self.write_lock:
+            with self.lock:
+                if self.changes == self.written:
+                    return
+
+                changes = self.changes
+                text = json.dumps(self.data, ensure_ascii=False, indent=2)
+
+            self.write(text)
+            self.written = changes
+
+    def write(self, text):
+        try:
+            write_atomic(self.path, text)
+            self.writes += 1
+        except OSError:
+            self.errors += 1
+
+    def get_stats(self):
+        return {
+            'version': VERSION,
+            'reads': self.reads,
+            'writes': self.writes,
+            'pending': self.changes - self.written,
+            'errors': self.errors,
+        }
+
+
+manager = SaveManager()
+atexit.register(manager.flush)
@@ -0,0 +1,45 @@
+import hashlib
+import random
+
+
+SEED_BITS = 63
+
+
+def new_seed():
+    return random.SystemRandom().getrandbits(SEED_BITS)
+
+
+def derive(seed, *names):
+    digest = hashlib.sha256(repr((seed,) + names).encode()).digest()
+
+    return int.from_bytes(digest[:8], 'little') >> (64 - SEED_BITS)
+
+
+class Seeds:
+    def __init__(self, seed=None):
+        self.seed = new_seed() if seed is None else seed
+        self.streams = {}
+
+    def derive(self, *names):
+        return derive(self.seed, *names)
+
+    def child(self, *names):
+        return Seeds(self.derive(*names))
+
+    def get(self, name):
+        stream = self.streams.get(name)
+
+        if stream is None:
+            stream = self.streams[name] = random.Random(self.derive(name))
+
+        return stream
+
+
+run = Seeds()
+
+
+def start_run(seed=None):
+    global run
+    run = Seeds(seed)
+
+    return run
@@ -0,0 +1,411 @@
+import struct
+import sys
+import time
+import zlib
+
+import arcade
+import pymunk
+
+import armor
+import enemies
+import items
+import tilemaps
+import weapons
+from chunks import ChunkRenderer
+from collisions import SpatialGrid
+from particles import ParticleSystem
+from pathfinding import FlowField
+from player import Player
+from projectiles import ProjectileManager
+from rooms import RoomIndex
+from seeds import Seeds
+
+
+FIXED_DELTA = 1 / 60
+MAX_STEPS = 8
+MOVEMENT_KEYS = (arcade.key.W, arcade.key.A, arcade.key.S, arcade.key.D)
+ACTIONS = ['next_item', 'use_item', 'take_item', 'drop_item', 'drop_armor']
+
+
+def get_loadout(snapshot):
+    weapons_now = [(weapons.REGISTRY[name] if name else None, level) for name, level in snapshot['weapons']]
+    armor_now = (armor.REGISTRY[snapshot['armor'][0]] if snapshot['armor'][0] else None, snapshot['armor'][1])
+    color = arcade.color.BLACK.from_iterable(snapshot['color'])
+
+    return weapons_now, armor_now, color
+
+
+class Simulation:
+    def __init__(self, map_name, money, upgrade_crystals, modifiers, weapons_now, armor_now, hp, level, color, cleared_rooms=(), tilemap=None, seed=None):
+        self.map_name = map_name
+        self.level = level
+        self.color = color
+        self.seeds = Seeds(seed)
+        self.seed = self.seeds.seed
+
+        self.player_list = arcade.SpriteList()
+        self.enemy_list = arcade.SpriteList()
+        self.sleeping_list = arcade.SpriteList()
+        self.enemy_grid = SpatialGrid()
+        self.weapons_list = arcade.SpriteList()
+        self.projectiles = ProjectileManager()
+        self.items_list = arcade.SpriteList()
+        self.armor_list = arcade.SpriteList()
+        self.walls_list = arcade.SpriteList()
+        self.phone_list = arcade.SpriteList()
+        self.rooms = RoomIndex()
+        self.open_rooms = []
+        self.cleared_rooms = list(cleared_rooms)
+        self.particles = ParticleSystem(seed=self.seeds.derive('particles'))
+
+        self.physics_engine = arcade.PymunkPhysicsEngine(damping=0)
+
+        self.keys = set()
+        self.ticks = 0
+        self.time = 0
+        self.accumulator = 0
+
+        self.setup_map(map_name, money, upgrade_crystals, modifiers, weapons_now, armor_now, hp, tilemap)
+
+    def setup_map(self, map_name, money, upgrade_crystals, modifiers, weapons_now, armor_now, hp, tilemap=None):
+        self.tilemap = tilemap or tilemaps.load_map('assets/tilesets/maps/' + map_name)
+        self.walls_list = self.tilemap.sprite_lists['walls']
+        self.phone_list = self.tilemap.sprite_lists['floor']
+        player_pos = self.tilemap.sprite_lists['player'].sprite_list[0].position
+        try:
+            enemies_list = self.tilemap.sprite_lists['enemies'].sprite_list
+        except Exception:
+            enemies_list = []
+        chests_list = self.tilemap.sprite_lists['chests']
+        try:
+            join_triggers = self.tilemap.object_lists['join_triggers']
+        except Exception:
+            join_triggers = []
+        try:
+            shop_items = self.tilemap.sprite_lists['shop_items']
+        except Exception:
+            shop_items = []
+        try:
+            boss = self.tilemap.sprite_lists['boss'].sprite_list[0]
+        except Exception:
+            boss = False
+        try:
+            boss_angles = self.tilemap.sprite_lists['boss_angles'].sprite_list
+        except Exception:
+            boss_angles = []
+
+        tile_width = self.tilemap.tile_width * self.tilemap.scaling
+        tile_height = self.tilemap.tile_height * self.tilemap.scaling
+
+        self.flow_field = FlowField(self.phone_list, self.walls_list, self.tilemap.width, self.tilemap.height, tile_width, tile_height)
+        self.map_renderer = ChunkRenderer([self.phone_list, self.walls_list], self.tilemap.width, self.tilemap.height, tile_width, tile_height)
+
+        normal_enemy_texture = self.tilemap.sprite_lists['normal_enemy_texture'].sprite_list[0].texture
+
+        self.player = Player('assets/images/player/players/default-player.png', player_pos[0], player_pos[1], 0.5, money, upgrade_crystals, self.weapons_list, self.armor_list, self.projectiles, self.enemy_list, self.enemy_grid, self.flow_field, self.items_list, self.particles, modifiers, self.seeds, self.spawn_enemy)
+        self.add_walls(self.tilemap.get_rects('walls'))
+
+        rng = self.seeds.get('spawn')
+
+        for i in enemies_list:
+            if i.texture == normal_enemy_texture:
+                enemy = rng.choice(enemies.NORMAL_ENEMIES)(*i.position, False, self.player, self.color, self.level)
+            else:
+                enemy = rng.choice(enemies.ELITE_ENEMIES)(*i.position, False, self.player, self.color, self.level)
+
+            enemy.room = i.properties['room']
+            self.add_sleeping(enemy)
+
+        for i in chests_list.sprite_list:
+            self.items_list.append(items.Chest(*i.position, 2, self.player, self.level))
+
+        for i in join_triggers:
+            self.rooms.add_trigger(i.properties['room'], i.shape)
+
+        for i in shop_items:
+            min_level = max([self.level - 2, 1])
+            max_level = min([self.level + 2, 100])
+            level = rng.randint(min_level, max_level)
+
+            if rng.randint(0, 1):
+                rarity = rng.randint(1, 5)
+                price = round((rarity * 100 + 10 * level) * rng.uniform(0.95, 1.05))
+                item = items.BoughtWeapon(rng.choice(weapons.RARITY_TO_WEAPONS[rarity]), *i.position, self.player, level, price)
+            else:
+                rarity = rng.randint(1, 5)
+                price = round((rarity * 100 + 10 * level) * rng.uniform(0.95, 1.05))
+                item = items.BoughtArmor(rng.choice(armor.RARITY_TO_ARMOR[rarity]), *i.position, self.player, level, price)
+
+            self.items_list.append(item)
+
+        if boss:
+            angles = [i.position for i in boss_angles]
+            x1, y1 = min([i[0] for i in angles]), min([i[1] for i in angles])
+            x2, y2 = max([i[0] for i in angles]), max([i[1] for i in angles])
+
+            bosss = rng.choice(enemies.BOSSES)(boss.center_x, boss.center_y, False, self.player, self.color, self.level, x1, y1, x2, y2)
+            bosss.room = boss.properties['room']
+            self.add_sleeping(bosss)
+
+        for room_id in self.cleared_rooms:
+            room = self.rooms.get(room_id)
+            self.rooms.activate(room)
+
+            for enemy in room.enemies:
+                enemy.kill()
+
+        for num, (i, level) in enumerate(weapons_now):
+            if i is None:
+                continue
+
+            self.player.set_weapon_slot(i(self.player, level), num)
+
+        if armor_now[0] is not None:
+            self.player.set_armor(armor_now[0](self.player, armor_now[1]))
+
+        self.player.health = hp
+        self.player_list.append(self.player)
+
+        self.physics_engine.add_sprite_list(self.player_list, 1, 0, moment_of_inertia=arcade.PymunkPhysicsEngine.MOMENT_INF, collision_type='player')
+
+    def add_walls(self, rects):
+        space = self.physics_engine.space
+
+        if 'default' not in self.physics_engine.collision_types:
+            self.physics_engine.collision_types.append('default')
+
+        collision_type = self.physics_engine.collision_types.index('default')
+
+        for left, right, bottom, top in rects:
+            shape = pymunk.Poly(space.static_body, [(left, bottom), (right, bottom), (right, top), (left, top)])
+            shape.friction = 0.2
+            shape.collision_type = collision_type
+            space.add(shape)
+
+    def spawn_enemy(self, enemy_class, x, y, active=True, room=None):
+        enemy = enemy_class(x, y, active, self.player, self.color, self.level)
+        enemy.room = room
+
+        if room is None:
+            self.add_enemy(enemy)
+        elif active or self.rooms.get(room).active:
+            enemy.active = True
+            self.rooms.add_enemy(enemy)
+            self.add_enemy(enemy)
+        else:
+            self.add_sleeping(enemy)
+
+        return enemy
+
+    def add_sleeping(self, enemy):
+        self.rooms.add_enemy(enemy)
+        self.sleeping_list.append(enemy)
+
+    def add_enemy(self, enemy):
+        self.enemy_list.append(enemy)
+        self.physics_engine.add_sprite(enemy, 1, 0, moment_of_inertia=arcade.PymunkPhysicsEngine.MOMENT_INF, collision_type='enemy')
+
+    def wake_room(self, room):
+        self.open_rooms.append(room)
+
+        for enemy in room.get_alive():
+            enemy.active = True
+            self.sleeping_list.remove(enemy)
+            self.add_enemy(enemy)
+
+    def wake_all(self):
+        for room in self.rooms.get_sleeping():
+            self.rooms.activate(room)
+            self.wake_room(room)
+
+    def select_slot(self, slot):
+        if slot != self.player.curr_slot and slot < len(self.player.inventory):
+            self.player.curr_slot = slot
+            self.player.set_weapon(self.player.inventory[slot])
+
+    def next_item(self):
+        self.player.next_item()
+
+    def use_item(self):
+        item = self.player.get_item()
+
+        if item is not None:
+            item.activate()
+
+    def take_item(self):
+        player = self.player
+        item = player.get_item()
+
+        if type(item) is items.BoughtWeapon or type(item) is items.BoughtArmor:
+            if player.money < item.money:
+                return False
+
+            player.money -= item.money
+
+        if type(item) is items.WeaponItem or type(item) is items.BoughtWeapon:
+            player.set_weapon_slot(item.weapon(player, item.level), player.curr_slot)
+        elif type(item) is items.ArmorItem or type(item) is items.BoughtArmor:
+            player.set_armor(item.armor(player, item.level))
+        else:
+            return False
+
+        item.kill()
+
+        return True
+
+    def drop_item(self):
+        self.player.drop_item()
+
+    def drop_armor(self):
+        self.player.drop_armor()
+
+    def step(self, delta_time, keys=None, attacks=()):
+        if keys is not None:
+            self.keys = set(keys)
+
+        for x, y in attacks:
+            self.player.attack(x, y)
+
+        self.accumulator += delta_time
+        steps = 0
+
+        while self.accumulator >= FIXED_DELTA and steps < MAX_STEPS:
+            self.update(FIXED_DELTA)
+            self.accumulator -= FIXED_DELTA
+            steps += 1
+
+        if steps == MAX_STEPS:
+            self.accumulator = 0
+
+        return steps
+
+    def update(self, delta_time):
+        if self.player.health <= 0:
+            return
+
+        self.update_flow_field()
+        self.update_enemies(delta_time)
+        self.update_particles(delta_time)
+        self.update_physics(delta_time)
+        self.update_grid()
+        self.update_player(delta_time)
+        self.update_projectiles(delta_time)
+        self.check_join_triggers()
+        self.check_cleared_rooms()
+
+        self.ticks += 1
+        self.time += delta_time
+
+    def update_flow_field(self):
+        self.flow_field.update(*self.player.position)
+
+    def update_enemies(self, delta_time):
+        self.enemy_list.update(delta_time)
+
+    def update_particles(self, delta_time):
+        self.particles.update(delta_time)
+
+    def update_physics(self, delta_time):
+        self.physics_engine.step(delta_time)
+
+    def update_grid(self):
+        self.enemy_grid.rebuild(self.enemy_list)
+
+    def update_player(self, delta_time):
+        self.player_list.update(delta_time, self.keys)
+
+    def update_projectiles(self, delta_time):
+        self.projectiles.update(delta_time, self.enemy_grid, self.player)
+
+    def check_join_triggers(self):
+        for room in self.rooms.enter(self.player):
+            self.wake_room(room)
+
+    def check_cleared_rooms(self):
+        for room in [i for i in self.open_rooms if i.is_cleared()]:
+            self.open_rooms.remove(room)
+            self.cleared_rooms.append(room.id)
+
+    def draw_map(self, camera=None):
+        self.map_renderer.draw(camera)
+
+    def draw_sprites(self):
+        self.particles.draw()
+
+        self.items_list.draw()
+        self.player_list.draw()
+        self.armor_list.draw()
+        self.sleeping_list.draw()
+        self.enemy_list.draw()
+
+        self.projectiles.draw()
+
+        self.weapons_list.draw()
+
+    def is_cleared(self):
+        return not self.enemy_list.sprite_list and not self.rooms.get_sleeping()
+
+    def is_over(self):
+        return self.player.health <= 0
+
+    def get_state(self):
+        return {
+            'map': self.map_name,
+            'level': self.level,
+            'ticks': self.ticks,
+            'time': round(self.time, 4),
+            'player': {
+                'x': round(self.player.center_x, 2),
+                'y': round(self.player.center_y, 2),
+                'health': round(self.player.health, 2),
+                'max_health': round(self.player.max_health, 2),
+                'money': self.player.money,
+            },
+            'enemies': len(self.enemy_list) + sum(len(i.enemies) for i in self.rooms.get_sleeping()),
+            'active_enemies': sum(1 for i in self.enemy_list if i.active),
+            'sleeping_enemies': sum(len(i.enemies) for i in self.rooms.get_sleeping()),
+            'rooms_cleared': len(self.rooms.get_cleared()),
+            'bullets': len(self.projectiles),
+            'emitters': len(self.particles),
+            'particles': self.particles.count,
+            'items': len(self.items_list),
+        }
+
+    def get_checksum(self):
+        player = self.player
+        values = [self.ticks, player.center_x, player.center_y, player.health, player.money, player.upgrade_crystals,
+                  len(self.projectiles), len(self.items_list), len(self.cleared_rooms)]
+
+        for enemy in self.enemy_list:
+            values += (enemy.center_x, enemy.center_y, enemy.health)
+
+        return zlib.crc32(struct.pack(f'<{len(values)}d', *values))
+
+
+def main():
+    map_name = sys.argv[1] if len(sys.argv) > 1 else 'map1.tmx'
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    seeds = Seeds(seed)
+    rng = seeds.get('color')
+    color = arcade.color.BLACK.from_iterable((rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)))
+    simulation = Simulation(map_name, 0, 0, {}, [(weapons.OldPistol, 5)], (None, 1), 20, 1, color, seed=seeds.seed)
+
+    start = time.perf_counter()
+
+    for _ in range(frames):
+        simulation.update(FIXED_DELTA)
+
+        if simulation.is_over():
+            break
+
+    elapsed = time.perf_counter() - start
+
+    print(simulation.get_state())
+    print(f'seed {simulation.seed}, checksum {simulation.get_checksum():08x}')
+    print(f'{simulation.ticks} ticks in {elapsed:.3f}s ({simulation.ticks / max(elapsed, 1e-9):.0f} ticks/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+import atexit
+import os
+import struct
+import threading
+import time
+
+import saves
+
+
+MAGIC = b'KPKR'
+VERSION = 3
+SNAPSHOT_PATH = os.path.join('data', 'run.bin')
+AUTOSAVE_INTERVAL = 30
+
+HEADER = struct.Struct('<4sH')
+MODIFIERS = ['damage', 'health', 'inventory', 'speed', 'lucky']
+INTEGER_MODIFIERS = ['inventory', 'lucky']
+MODIFIER_DEFAULTS = {'lucky': 0}
+MODIFIERS_FORMAT = ''.join('i' if i in INTEGER_MODIFIERS else 'd' for i in MODIFIERS)
+
+
+class Writer:
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def pack(self, fmt, *values):
+        self.buffer += struct.pack('<' + fmt, *values)
+
+    def string(self, value):
+        data = value.encode('utf-8')
+        self.pack('H', len(data))
+        self.buffer += data
+
+    def item(self, item):
+        name, level = item
+        self.string(name or '')
+        self.pack('H', level)
+
+
+class Reader:
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, fmt):
+        fmt = '<' + fmt
+        values = struct.unpack_from(fmt, self.data, self.offset)
+        self.offset += struct.calcsize(fmt)
+
+        return values
+
+    def value(self, fmt):
+        return self.unpack(fmt)[0]
+
+    def string(self):
+        size = self.value('H')
+        data = self.data[self.offset:self.offset + size]
+
+        if len(data) != size:
+            raise ValueError('truncated snapshot')
+
+        self.offset += size
+
+        return bytes(data).decode('utf-8')
+
+    def item(self):
+        name = self.string()
+        level = self.value('H')
+
+        return name or None, level
+
+
+def encode(snapshot):
+    out = Writer()
+    out.buffer += HEADER.pack(MAGIC, VERSION)
+
+    out.string(snapshot['map'])
+    out.pack('HH', snapshot['level'], snapshot['level_id'])
+    out.pack('BBB', *snapshot['color'][:3])
+    out.pack('id', snapshot['money'], snapshot['health'])
+    out.pack(MODIFIERS_FORMAT, *[snapshot['modifiers'].get(i, MODIFIER_DEFAULTS.get(i, 1)) for i in MODIFIERS])
+
+    out.pack('BB', len(snapshot['weapons']), snapshot['slot'])
+
+    for weapon in snapshot['weapons']:
+        out.item(weapon)
+
+    out.item(snapshot['armor'])
+
+    rooms = snapshot['rooms']
+    out.pack(f'H{len(rooms)}i', len(rooms), *rooms)
+
+    out.pack('QQ', snapshot['run_seed'], snapshot['seed'])
+
+    graph = snapshot['graph']
+    out.pack('?', graph is not None)
+
+    if graph is not None:
+        out.pack('HH', graph['last_visited_id'], len(graph['nodes']))
+
+        for node in graph['nodes']:
+            out.pack('Hff??', node['id'], node['x'], node['y'], node['unlocked'], node['completed'])
+            out.string(node['name'])
+
+        connections = [i for pair in graph['connections'] for i in pair]
+        out.pack(f'H{len(connections)}H', len(graph['connections']), *connections)
+
+    return bytes(out.buffer)
+
+
+def decode(data):
+    data = memoryview(data)
+
+    try:
+        magic, version = HEADER.unpack_from(data)
+    except struct.error:
+        raise ValueError('snapshot is too short')
+
+    if magic != MAGIC:
+        raise ValueError('not a run snapshot')
+
+    if version not in (1, 2, VERSION):
+        raise ValueError(f'unsupported snapshot version {version}')
+
+    reader = Reader(data)
+    reader.offset = HEADER.size
+
+    try:
+        snapshot = {'map': reader.string()}
+        snapshot['level'], snapshot['level_id'] = reader.unpack('HH')
+        snapshot['color'] = reader.unpack('BBB')
+        snapshot['money'], snapshot['health'] = reader.unpack('id')
+        snapshot['modifiers'] = dict(zip(MODIFIERS, reader.unpack(MODIFIERS_FORMAT if version == VERSION else '5d')))
+
+        for i in INTEGER_MODIFIERS:
+            snapshot['modifiers'][i] = int(snapshot['modifiers'][i])
+
+        count, snapshot['slot'] = reader.unpack('BB')
+        snapshot['weapons'] = [reader.item() for _ in range(count)]
+        snapshot['armor'] = reader.item()
+
+        count = reader.value('H')
+        snapshot['rooms'] = list(reader.unpack(f'{count}i'))
+
+        if version == 1:
+            count = reader.unpack('BH')[1]
+            reader.unpack(f'{count}I?d')
+            snapshot['run_seed'], snapshot['seed'] = None, None
+        else:
+            snapshot['run_seed'], snapshot['seed'] = reader.unpack('QQ')
+
+        snapshot['graph'] = None
+
+        if reader.value('?'):
+            last_visited_id, count = reader.unpack('HH')
+            nodes = []
+
+            for _ in range(count):
+                level_id, x, y, unlocked, completed = reader.unpack('Hff??')
+                nodes.append({'id': level_id, 'x': x, 'y': y, 'name': reader.string(), 'unlocked': unlocked, 'completed': completed})
+
+            count = reader.value('H')
+            connections = reader.unpack(f'{count * 2}H')
+
+            snapshot['graph'] = {
+                'nodes': nodes,
+                'connections': [list(connections[i:i + 2]) for i in range(0, len(connections), 2)],
+                'current_node_id': last_visited_id,
+                'last_visited_id': last_visited_id,
+            }
+    except (struct.error, UnicodeDecodeError):
+        raise ValueError('truncated snapshot')
+
+    return snapshot
+
+
+def load(path=SNAPSHOT_PATH):
+    try:
+        with open(path, 'rb') as file:
+            return decode(file.read())
+    except (OSError, ValueError):
+        return None
+
+
+def exists(path=SNAPSHOT_PATH):
+    return os.path.exists(path)
+
+
+class Autosaver:
+    def __init__(self, path=SNAPSHOT_PATH):
+        self.path = path
+        self.pending = None
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()
+        self.thread = None
+
+        self.saves = 0
+        self.writes = 0
+        self.errors = 0
+        self.size = 0
+        self.encode_ms = 0
+        self.write_ms = 0
+
+    def save(self, snapshot):
+        start = time.perf_counter()
+        data = encode(snapshot)
+        self.encode_ms = round((time.perf_counter() - start) * 1000, 3)
+
+        self.saves += 1
+        self.size = len(data)
+
+        with self.condition:
+            self.pending = data
+            self.condition.notify()
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name='autosave', daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+
+            self.flush()
+
+    def flush(self):
+        with self.write_lock:
+            with self.condition:
+                data, self.pending = self.pending, None
+
+            if data is None:
+                return
+
+            start = time.perf_counter()
+
+            try:
+                saves.write_atomic(self.path, data)
+                self.writes += 1
+            except OSError:
+                self.errors += 1
+
+            self.write_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    def delete(self):
+        with self.write_lock:
+            with self.condition:
+                self.pending = None
+
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def get_stats(self):
+        return {
+            'saves': self.saves,
+            'writes': self.writes,
+            'errors': self.errors,
+            'bytes': self.size,
+            'encode_ms': self.encode_ms,
+            'write_ms': self.write_ms,
+        }
+
+
+autosaver = Autosaver()
+atexit.register(autosaver.flush)
@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+
+import arcade
+
+
+CACHE_SIZE = 256
+
+
+class TextureCache:
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.textures = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, factory):
+        with self.lock:
+            texture = self.textures.get(key)
+
+            if texture is not None:
+                self.hits += 1
+                self.textures.move_to_end(key)
+                return texture
+
+            self.misses += 1
+
+        texture = factory()
+
+        with self.lock:
+            self.textures[key] = texture
+
+            while len(self.textures) > self.size:
+                self.textures.popitem(last=False)
+
+        return texture
+
+    def clear(self):
+        self.textures.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self):
+        total = self.hits + self.misses
+
+        return {
+            'size': self.size,
+            'textures': len(self.textures),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0,
+        }
+
+
+cache = TextureCache()
+
+
+def circle(diameter, color):
+    return cache.get(('circle', diameter, tuple(color)), lambda: arcade.make_circle_texture(diameter, color))
+
+
+def soft_circle(diameter, color, center_alpha=255, outer_alpha=0):
+    return cache.get(('soft_circle', diameter, tuple(color), center_alpha, outer_alpha),
+                     lambda: arcade.make_soft_circle_texture(diameter, color, center_alpha, outer_alpha))
+
+
+def load(path):
+    return cache.get(('file', path), lambda: arcade.load_texture(path))
+
+
+def flip(texture, vertical=True, horizontal=False, diagonal=False):
+    if diagonal:
+        texture = texture.flip_diagonally()
+
+    if horizontal:
+        texture = texture.flip_horizontally()
+
+    if vertical:
+        texture = texture.flip_vertically()
+
+    return texture
+
+
+def flipped(texture, vertical=True, horizontal=False, diagonal=False):
+    return cache.get(('flipped', texture.cache_name, vertical, horizontal, diagonal), lambda: flip(texture, vertical, horizontal, diagonal))
+
+
+def get_stats():
+    return cache.get_stats()
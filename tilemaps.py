@@ -0,0 +1,308 @@
+import hashlib
+import os
+import pickle
+
+import arcade
+import numpy as np
+import pytiled_parser
+from arcade.types import TiledObject
+
+import textures
+
+
+FORMAT_VERSION = 3
+CACHE_DIR = os.path.join('data', 'cache', 'maps')
+GID_MASK = 0x1FFFFFFF
+FLIPPED_HORIZONTALLY = 0x80000000
+FLIPPED_VERTICALLY = 0x40000000
+FLIPPED_DIAGONALLY = 0x20000000
+
+compiled = {}
+texture_manager = arcade.TextureCacheManager()
+
+
+class CompiledMap:
+    def __init__(self, data, scaling=1, lazy=False):
+        self.data = data
+        self.scaling = scaling
+        self.lazy = lazy
+        self.width = data['width']
+        self.height = data['height']
+        self.tile_width = data['tile_width']
+        self.tile_height = data['tile_height']
+        self.properties = data['properties']
+        self.grids = data['grids']
+        self.rects = data['rects']
+
+        self.sprite_lists = {name: self.build_sprite_list(layer) for name, layer in data['sprite_lists'].items()}
+        self.object_lists = {name: [self.build_object(i) for i in objects] for name, objects in data['object_lists'].items()}
+
+    def get_texture(self, gid):
+        tile = self.data['tiles'][gid & GID_MASK]
+        texture = texture_manager.load_or_get_texture(tile['image'], x=tile['x'], y=tile['y'], width=tile['width'], height=tile['height'])
+
+        if gid & ~GID_MASK:
+            texture = textures.flipped(texture, bool(gid & FLIPPED_VERTICALLY), bool(gid & FLIPPED_HORIZONTALLY), bool(gid & FLIPPED_DIAGONALLY))
+
+        return texture
+
+    def build_sprite_list(self, layer):
+        sprite_list = arcade.SpriteList(capacity=max(len(layer['gid']), 1), lazy=self.lazy)
+        scaling = self.scaling
+        tiles = self.data['tiles']
+        loaded = {}
+
+        sprites = zip(layer['gid'].tolist(), layer['x'].tolist(), layer['y'].tolist(),
+                      layer['width'].tolist(), layer['height'].tolist(), layer['angle'].tolist(), layer['properties'])
+
+        for gid, x, y, width, height, angle, properties in sprites:
+            if gid not in loaded:
+                loaded[gid] = self.get_texture(gid)
+
+            tile = tiles[gid & GID_MASK]
+            sprite = arcade.Sprite(loaded[gid], scaling, x * scaling, y * scaling, angle)
+
+            if (width, height) != (tile['width'], tile['height']):
+                sprite.size = (width * scaling, height * scaling)
+
+            sprite.properties.update(tile['properties'])
+
+            if properties:
+                sprite.properties.update(properties)
+
+            sprite_list.append(sprite)
+
+        return sprite_list
+
+    def get_rects(self, name):
+        tile_width = self.tile_width * self.scaling
+        tile_height = self.tile_height * self.scaling
+        rects = []
+
+        for col, row, width, height in self.rects.get(name, ()):
+            left = col * tile_width
+            top = (self.height - row) * tile_height
+            rects.append((left, left + width * tile_width, top - height * tile_height, top))
+
+        return rects
+
+    def build_object(self, record):
+        scaling = self.scaling
+        shape = record['shape']
+
+        if shape and isinstance(shape[0], (tuple, list)):
+            shape = [(x * scaling, y * scaling) for x, y in shape]
+        elif shape:
+            shape = tuple(i * scaling for i in shape)
+
+        return TiledObject(shape, dict(record['properties']), record['name'], record['type'])
+
+
+def get_dependencies(tiled_map):
+    paths = {str(tiled_map.map_file)}
+
+    for tileset in tiled_map.tilesets.values():
+        if tileset.image is not None:
+            paths.add(str(tileset.image))
+
+    return sorted(paths)
+
+
+def get_stamp(path):
+    stat = os.stat(path)
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_hash(path):
+    with open(path, 'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+def get_tile(tiled_map, gid):
+    firstgid = max(i for i in tiled_map.tilesets if i <= gid)
+    tileset = tiled_map.tilesets[firstgid]
+    tile_id = gid - firstgid
+
+    spacing = tileset.spacing or 0
+    margin = tileset.margin or 0
+    columns = tileset.columns or 1
+
+    properties = {'tile_id': tile_id}
+    tile = (tileset.tiles or {}).get(tile_id)
+
+    if tile is not None and tile.properties:
+        properties = {**tile.properties, 'tile_id': tile_id}
+
+    return {
+        'image': str(tileset.image),
+        'x': margin + tile_id % columns * (tileset.tile_width + spacing),
+        'y': margin + tile_id // columns * (tileset.tile_height + spacing),
+        'width': tileset.tile_width,
+        'height': tileset.tile_height,
+        'properties': properties,
+    }
+
+
+def merge_rects(grid):
+    filled = grid != 0
+    height, width = filled.shape
+    rects = []
+
+    for row in range(height):
+        col = 0
+
+        while col < width:
+            if not filled[row, col]:
+                col += 1
+                continue
+
+            end = col
+
+            while end < width and filled[row, end]:
+                end += 1
+
+            bottom = row + 1
+
+            while bottom < height and filled[bottom, col:end].all():
+                bottom += 1
+
+            filled[row:bottom, col:end] = False
+            rects.append((col, row, end - col, bottom - row))
+            col = end
+
+    return rects
+
+
+def get_layer_gids(layer):
+    if isinstance(layer, pytiled_parser.TileLayer):
+        data = np.array(layer.data, dtype=np.uint32)
+        return data & GID_MASK, data[data != 0].tolist()
+
+    return None, [i.gid for i in layer.tiled_objects if getattr(i, 'gid', None)]
+
+
+def compile_map(path):
+    tilemap = arcade.load_tilemap(path, lazy=True)
+    tiled_map = tilemap.tiled_map
+    layers = {i.name: i for i in tiled_map.layers}
+
+    data = {
+        'version': FORMAT_VERSION,
+        'width': tilemap.width,
+        'height': tilemap.height,
+        'tile_width': tilemap.tile_width,
+        'tile_height': tilemap.tile_height,
+        'properties': dict(tilemap.properties or {}),
+        'tiles': {},
+        'grids': {},
+        'rects': {},
+        'sprite_lists': {},
+        'object_lists': {},
+    }
+
+    for name, sprite_list in tilemap.sprite_lists.items():
+        grid, gids = get_layer_gids(layers[name])
+
+        if grid is not None:
+            data['grids'][name] = grid
+            data['rects'][name] = merge_rects(grid)
+
+        for gid in gids:
+            if gid & GID_MASK not in data['tiles']:
+                data['tiles'][gid & GID_MASK] = get_tile(tiled_map, gid & GID_MASK)
+
+        sprites = sprite_list.sprite_list
+        base = [data['tiles'][gid & GID_MASK]['properties'] for gid in gids]
+
+        data['sprite_lists'][name] = {
+            'gid': np.array(gids, dtype=np.uint32),
+            'x': np.array([i.center_x for i in sprites], dtype=float),
+            'y': np.array([i.center_y for i in sprites], dtype=float),
+            'width': np.array([i.width for i in sprites], dtype=float),
+            'height': np.array([i.height for i in sprites], dtype=float),
+            'angle': np.array([i.angle for i in sprites], dtype=float),
+            'properties': [{k: v for k, v in i.properties.items() if k not in base[n] or base[n][k] != v} or None for n, i in enumerate(sprites)],
+        }
+
+    for name, objects in tilemap.object_lists.items():
+        data['object_lists'][name] = [{'shape': i.shape, 'properties': dict(i.properties or {}), 'name': i.name, 'type': i.type} for i in objects]
+
+    data['dependencies'] = {i: get_stamp(i) for i in get_dependencies(tiled_map)}
+    data['hash'] = get_hash(path)
+
+    return data
+
+
+def get_cache_path(path):
+    name = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:12]
+
+    return os.path.join(CACHE_DIR, f'{os.path.basename(path)}.{name}.pickle')
+
+
+def is_fresh(data, path):
+    if data.get('version') != FORMAT_VERSION:
+        return False
+
+    for dependency, stamp in data['dependencies'].items():
+        if not os.path.exists(dependency):
+            return False
+
+        if tuple(stamp) == get_stamp(dependency):
+            continue
+
+        if os.path.abspath(dependency) != os.path.abspath(path) or data['hash'] != get_hash(path):
+            return False
+
+        data['dependencies'][dependency] = get_stamp(dependency)
+
+    return True
+
+
+def read_cache(path):
+    try:
+        with open(get_cache_path(path), 'rb') as file:
+            data = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+    if not isinstance(data, dict) or not is_fresh(data, path):
+        return None
+
+    return data
+
+
+def write_cache(path, data):
+    cache_path = get_cache_path(path)
+    temp_path = cache_path + '.tmp'
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+
+        with open(temp_path, 'wb') as file:
+            pickle.dump(data, file, pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass
+
+
+def get_compiled(path):
+    data = compiled.get(path)
+
+    if data is not None and is_fresh(data, path):
+        return data
+
+    data = read_cache(path)
+
+    if data is None:
+        data = compile_map(path)
+        write_cache(path, data)
+
+    compiled[path] = data
+
+    return data
+
+
+def load_map(path, scaling=1, lazy=False):
+    return CompiledMap(get_compiled(path), scaling, lazy)
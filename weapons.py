@@ -1,56 +1,34 @@
 import arcade
-import arcade.particles
 import math
 import bullets
-import random
+import particles
+import projectiles
+import textures
 
 
 def make_trail(texture, maintain=60):
-    emit = arcade.particles.Emitter(
-        center_xy=(0, 0),
-        emit_controller=arcade.particles.EmitMaintainCount(maintain),
-        particle_factory=lambda e: arcade.particles.FadeParticle(
-            filename_or_texture=texture,
-            change_xy=arcade.math.rand_in_circle((0.0, 0.0), 1.6),
-            lifetime=random.uniform(0.35, 0.6),
-            start_alpha=220, end_alpha=0,
-            scale=random.uniform(0.25, 0.4),
-        ),
-    )
-    return emit
+    return particles.Emitter(0, 0, texture, maintain, 1.6, (0.35, 0.6), (0.25, 0.4), 220, maintain=True)
 
 
 def make_explosion(x, y, texture, count=80):
-    return arcade.particles.Emitter(
-        center_xy=(x, y),
-        emit_controller=arcade.particles.EmitBurst(count),
-        particle_factory=lambda e: arcade.particles.FadeParticle(
-            filename_or_texture=texture,
-            change_xy=arcade.math.rand_in_circle((0.0, 0.0), 5.0),
-            lifetime=random.uniform(0.3, 0.6),
-            start_alpha=255, end_alpha=0,
-            scale=random.uniform(0.35, 0.6)
-        ),
-    )
+    return particles.Emitter(x, y, texture, count, 5.0, (0.3, 0.6), (0.35, 0.6))
 
 
 def make_big_explosion(x, y, texture, count=80):
-    return arcade.particles.Emitter(
-        center_xy=(x, y),
-        emit_controller=arcade.particles.EmitBurst(count),
-        particle_factory=lambda e: arcade.particles.FadeParticle(
-            filename_or_texture=texture,
-            change_xy=arcade.math.rand_in_circle((0.0, 0.0), 7.5),
-            lifetime=random.uniform(0.3, 0.8),
-            start_alpha=255, end_alpha=0,
-            scale=random.uniform(0.55, 0.8)
-        ),
-    )
+    return particles.Emitter(x, y, texture, count, 7.5, (0.3, 0.8), (0.55, 0.8))
+
+
+def get_level_damage(damage, level, modifiers):
+    return damage * modifiers.get('damage', 1) * (level / 10 + 0.9)
 
 
 class BasicSword(arcade.Sprite):
+    name = ''
+    base_damage = 0
+    reloading = 0
+
     def __init__(self, texture, scale, x, y, radius, damage, degrees, speed, reloading, player, level):
-        super().__init__(texture, scale)
+        super().__init__(textures.load(texture), scale)
         self.x = x
         self.y = y
         self.damage = damage * player.modifiers.get('damage', 1)
@@ -67,9 +45,6 @@ class BasicSword(arcade.Sprite):
         self.hitted = set()
 
         self.player = player
-        self.enemies_list = self.player.enemies_list
-
-        self.name = ''
 
         self.apply_level()
 
@@ -114,7 +89,7 @@ class BasicSword(arcade.Sprite):
         self.hitted.clear()
 
     def check_for_hit(self):
-        for i in arcade.check_for_collision_with_list(self, self.enemies_list):
+        for i in self.player.enemy_grid.check(self):
             if i not in self.hitted:
                 i.hurt(self.damage)
                 self.hitted.add(i)
@@ -122,62 +97,99 @@ class BasicSword(arcade.Sprite):
     def apply_level(self):
         self.damage *= self.level / 10 + 0.9
 
+    @classmethod
+    def get_stats(cls, level, modifiers):
+        return {'damage': get_level_damage(cls.base_damage, level, modifiers), 'reloading': cls.reloading}
+
+    @classmethod
+    def describe(cls, level, modifiers):
+        stats = cls.get_stats(level, modifiers)
+
+        return f'Уровень: {level}\nУрон: {stats["damage"]}\nПерезарядка: {stats["reloading"]}'
+
     def return_name(self):
         return self.name
 
     def return_desc(self):
-        return f'Уровень: {self.level}\nУрон: {self.damage}\nПерезарядка: {self.reloading_time}'
+        return self.describe(self.level, self.player.modifiers)
 
     def return_to_live(self):
         pass
 
 
 class WoodenSword(BasicSword):
+    texture_path = 'assets/images/weapons/swords/wooden_sword.png'
+    item_scale = 0.8
+    rarity = 1
+    name = 'Деревянный меч'
+    base_damage = 6
+    reloading = 1
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/swords/wooden_sword.png', 0.8, 50, 20, 65, 6, 90, 200, 1, player, level)
-        self.rarity = 1
-        self.name = 'Деревянный меч'
+        super().__init__(self.texture_path, self.item_scale, 50, 20, 65, self.base_damage, 90, 200, self.reloading, player, level)
 
 
 class IronSword(BasicSword):
+    texture_path = 'assets/images/weapons/swords/iron_sword.png'
+    item_scale = 1
+    rarity = 2
+    name = 'Железный меч'
+    base_damage = 7
+    reloading = 0.7
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/swords/iron_sword.png', 1, 50, 20, 70, 7, 140, 280, 0.7, player, level)
-        self.rarity = 2
-        self.name = 'Железный меч'
+        super().__init__(self.texture_path, self.item_scale, 50, 20, 70, self.base_damage, 140, 280, self.reloading, player, level)
 
 
 class DiamondSword(BasicSword):
+    texture_path = 'assets/images/weapons/swords/sword.png'
+    item_scale = 1.2
+    rarity = 3
+    name = 'Алмазный меч'
+    base_damage = 9
+    reloading = 0.5
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/swords/sword.png', 1.2, 50, 45, 90, 9, 180, 360, 0.5, player, level)
-        self.rarity = 3
-        self.name = 'Алмазный меч'
+        super().__init__(self.texture_path, self.item_scale, 50, 45, 90, self.base_damage, 180, 360, self.reloading, player, level)
 
 
 class DarkSword(BasicSword):
+    texture_path = 'assets/images/weapons/swords/dark_sword.png'
+    item_scale = 1.3
+    rarity = 4
+    name = 'Меч тьмы'
+    base_damage = 12
+    reloading = 0.3
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/swords/dark_sword.png', 1.3, 60, 35, 80, 12, 220, 400, 0.3, player, level)
-        self.rarity = 4
-        self.name = 'Меч тьмы'
+        super().__init__(self.texture_path, self.item_scale, 60, 35, 80, self.base_damage, 220, 400, self.reloading, player, level)
 
 
 class ChaosSaber(BasicSword):
+    texture_path = 'assets/images/weapons/swords/chaos_saber.png'
+    item_scale = 1.5
+    rarity = 5
+    name = 'Сабля хаоса'
+    base_damage = 14
+    reloading = 0.25
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/swords/chaos_saber.png', 1.5, 50, 50, 110, 14, 260, 500, 0.25, player, level)
-        self.rarity = 5
-        self.name = 'Сабля хаоса'
+        super().__init__(self.texture_path, self.item_scale, 50, 50, 110, self.base_damage, 260, 500, self.reloading, player, level)
 
 
 class Pistol(arcade.Sprite):
+    name = ''
+    base_damage = 0
+    reloading = 0
+
     def __init__(self, texture, scale, x, y, r_d, bullet, reloading, throughing, player, level):
-        super().__init__(texture, scale)
+        super().__init__(textures.load(texture), scale)
         self.x = x
         self.y = y
         self.r_d = r_d
         self.level = level
 
         self.bullet = bullet
-        self.bullets_list = arcade.SpriteList()
-        player.bullets_list.append(self.bullets_list)
 
         self.reloading_time = reloading
         self.time_left = 0
@@ -185,11 +197,8 @@ class Pistol(arcade.Sprite):
         self.throughing = throughing
 
         self.player = player
-        self.enemies_list = self.player.enemies_list
-        
-        self.source_texture = arcade.load_texture(texture)
 
-        self.name = ''
+        self.source_texture = textures.load(texture)
 
         self.apply_level()
 
@@ -203,25 +212,6 @@ class Pistol(arcade.Sprite):
             self.center_x = self.player.center_x + self.r_d * math.sin(self.radians + math.radians(90))
             self.center_y = self.player.center_y + self.r_d * math.cos(self.radians + math.radians(90))
 
-        for bullet in self.bullets_list.sprite_list:
-            enemies = arcade.check_for_collision_with_list(bullet, self.enemies_list)
-
-            for enemy in enemies:
-                if enemy in bullet.attacked:
-                    continue
-
-                enemy.hurt(bullet.get_damage())
-
-                bullet.targets_damaged += 1
-
-                if bullet.targets_damaged >= self.throughing:
-                    bullet.kill()
-                    break
-
-                bullet.attacked.add(enemy)
-
-        self.bullets_list.update(delta_time)
-
         if self.time_left > 0:
             self.time_left -= delta_time
         else:
@@ -236,7 +226,7 @@ class Pistol(arcade.Sprite):
             if -90 < self.angle < 90:
                 self.texture = self.source_texture
             else:
-                self.texture = self.source_texture.flip_vertically()
+                self.texture = textures.flipped(self.source_texture)
 
             self.center_x = self.player.center_x + self.r_d * math.sin(self.radians + math.radians(90))
             self.center_y = self.player.center_y + self.r_d * math.cos(self.radians + math.radians(90))
@@ -245,65 +235,96 @@ class Pistol(arcade.Sprite):
 
             bullet = self.bullet.shoot(self.player.center_x, self.player.center_y, x, y)
             bullet.position = self.position
-            bullet.attacked = set()
-            self.bullets_list.append(bullet)
+            self.add_bullet(bullet)
 
     def apply_level(self):
-        self.bullet.damage *= self.player.modifiers.get('damage', 1)
-        self.bullet.damage *= self.level / 10 + 0.9
+        self.bullet.damage = self.get_stats(self.level, self.player.modifiers)['damage']
+
+    def add_bullet(self, bullet):
+        self.player.projectiles.add(bullet, self, projectiles.PLAYER, self.throughing)
 
     def kill(self):
         super().kill()
-        self.bullets_list.clear()
+        self.player.projectiles.remove_owner(self)
 
-        try:
-            del self.player.bullets_list[self.player.bullets_list.index(self.bullets_list)]
-        except Exception:
-            pass
+    @classmethod
+    def get_stats(cls, level, modifiers):
+        return {'damage': get_level_damage(cls.base_damage, level, modifiers), 'reloading': cls.reloading}
+
+    @classmethod
+    def describe(cls, level, modifiers):
+        stats = cls.get_stats(level, modifiers)
+
+        return f'Уровень: {level}\nУрон: {stats["damage"]}\nПерезарядка: {stats["reloading"]}'
 
     def return_name(self):
         return self.name
 
     def return_desc(self):
-        return f'Уровень: {self.level}\nУрон: {self.bullet.damage}\nПерезарядка: {self.reloading_time}'
+        return self.describe(self.level, self.player.modifiers)
 
     def return_to_live(self):
-        self.player.bullets_list.append(self.bullets_list)
+        pass
 
 
 class OldPistol(Pistol):
+    texture_path = 'assets/images/weapons/pistols/pistol.png'
+    item_scale = 1.2
+    rarity = 1
+    name = 'Старый пистолет'
+    base_damage = 3
+    reloading = 0.75
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/pistols/pistol.png', 1.2, 50, 0, 60, bullets.NormalPistolBullet(), 0.75, 1, player, level)
-        self.rarity = 1
-        self.name = 'Старый пистолет'
+        super().__init__(self.texture_path, self.item_scale, 50, 0, 60, bullets.NormalPistolBullet(self.base_damage), self.reloading, 1, player, level)
 
 
 class ModernPistol(Pistol):
+    texture_path = 'assets/images/weapons/pistols/modern_pistol.png'
+    item_scale = 1.2
+    rarity = 2
+    name = 'Современный пистолет'
+    base_damage = 4
+    reloading = 0.5
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/pistols/modern_pistol.png', 1.2, 50, 0, 60, bullets.ModernPistolBullet(), 0.5, 2, player, level)
-        self.rarity = 2
-        self.name = 'Современный пистолет'
+        super().__init__(self.texture_path, self.item_scale, 50, 0, 60, bullets.ModernPistolBullet(self.base_damage), self.reloading, 2, player, level)
 
 
 class PrimitiveSniper(Pistol):
+    texture_path = 'assets/images/weapons/pistols/primitive_sniper.png'
+    item_scale = 1.4
+    rarity = 3
+    name = 'Примитивная снайперка'
+    base_damage = 8
+    reloading = 1
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/pistols/primitive_sniper.png', 1.4, 55, 0, 60, bullets.PrimitiveSniperBullet(), 1, 3, player, level)
-        self.rarity = 3
-        self.name = 'Примитивная снайперка'
+        super().__init__(self.texture_path, self.item_scale, 55, 0, 60, bullets.PrimitiveSniperBullet(self.base_damage), self.reloading, 3, player, level)
 
 
 class Sniper(Pistol):
+    texture_path = 'assets/images/weapons/pistols/sniper.png'
+    item_scale = 1.4
+    rarity = 4
+    name = 'Снайперка'
+    base_damage = 13
+    reloading = 0.9
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/pistols/sniper.png', 1.4, 55, 0, 60, bullets.SniperBullet(), 0.9, 5, player, level)
-        self.rarity = 4
-        self.name = 'Снайперка'
+        super().__init__(self.texture_path, self.item_scale, 55, 0, 60, bullets.SniperBullet(self.base_damage), self.reloading, 5, player, level)
 
 
 class SpreadingPistol(Pistol):
+    texture_path = 'assets/images/weapons/pistols/spreading_pistol.png'
+    item_scale = 1.2
+    rarity = 3
+    name = 'Рассеивающий пистолет'
+    base_damage = 3
+    reloading = 0.75
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/pistols/spreading_pistol.png', 1.2, 55, 0, 60, bullets.SpreadingBullet(), 0.75, 1, player, level)
-        self.rarity = 3
-        self.name = 'Рассеивающий пистолет'
+        super().__init__(self.texture_path, self.item_scale, 55, 0, 60, bullets.SpreadingBullet(self.base_damage), self.reloading, 1, player, level)
 
     def attack(self, x, y):
         if self.time_left <= 0:
@@ -314,7 +335,7 @@ class SpreadingPistol(Pistol):
             if -90 < self.angle < 90:
                 self.texture = self.source_texture
             else:
-                self.texture = self.source_texture.flip_vertically()
+                self.texture = textures.flipped(self.source_texture)
 
             self.center_x = self.player.center_x + self.r_d * math.sin(self.radians + math.radians(90))
             self.center_y = self.player.center_y + self.r_d * math.cos(self.radians + math.radians(90))
@@ -326,15 +347,19 @@ class SpreadingPistol(Pistol):
             for x, y in targets:
                 bullet = self.bullet.shoot(self.player.center_x, self.player.center_y, x, y)
                 bullet.position = self.position
-                bullet.attacked = set()
-                self.bullets_list.append(bullet)
+                self.add_bullet(bullet)
 
 
 class GoodSpreadingPistol(Pistol):
+    texture_path = 'assets/images/weapons/pistols/good_spreading_pistol.png'
+    item_scale = 1.2
+    rarity = 4
+    name = 'Усечённый дробовик'
+    base_damage = 4
+    reloading = 0.75
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/pistols/good_spreading_pistol.png', 1.2, 55, 0, 60, bullets.GoodSpreadingBullet(), 0.75, 2, player, level)
-        self.rarity = 4
-        self.name = 'Усечённый дробовик'
+        super().__init__(self.texture_path, self.item_scale, 55, 0, 60, bullets.GoodSpreadingBullet(self.base_damage), self.reloading, 2, player, level)
 
     def attack(self, x, y):
         if self.time_left <= 0:
@@ -345,7 +370,7 @@ class GoodSpreadingPistol(Pistol):
             if -90 < self.angle < 90:
                 self.texture = self.source_texture
             else:
-                self.texture = self.source_texture.flip_vertically()
+                self.texture = textures.flipped(self.source_texture)
 
             self.center_x = self.player.center_x + self.r_d * math.sin(self.radians + math.radians(90))
             self.center_y = self.player.center_y + self.r_d * math.cos(self.radians + math.radians(90))
@@ -357,15 +382,19 @@ class GoodSpreadingPistol(Pistol):
             for x, y in targets:
                 bullet = self.bullet.shoot(self.player.center_x, self.player.center_y, x, y)
                 bullet.position = self.position
-                bullet.attacked = set()
-                self.bullets_list.append(bullet)
+                self.add_bullet(bullet)
 
 
 class Shotgun(Pistol):
+    texture_path = 'assets/images/weapons/pistols/shotgun.png'
+    item_scale = 1.2
+    rarity = 5
+    name = 'Дробовик'
+    base_damage = 5
+    reloading = 0.65
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/pistols/shotgun.png', 1.2, 55, 0, 60, bullets.InsaneSpreadingBullet(), 0.65, 3, player, level)
-        self.rarity = 5
-        self.name = 'Дробовик'
+        super().__init__(self.texture_path, self.item_scale, 55, 0, 60, bullets.InsaneSpreadingBullet(self.base_damage), self.reloading, 3, player, level)
 
     def attack(self, x, y):
         if self.time_left <= 0:
@@ -376,7 +405,7 @@ class Shotgun(Pistol):
             if -90 < self.angle < 90:
                 self.texture = self.source_texture
             else:
-                self.texture = self.source_texture.flip_vertically()
+                self.texture = textures.flipped(self.source_texture)
 
             self.center_x = self.player.center_x + self.r_d * math.sin(self.radians + math.radians(90))
             self.center_y = self.player.center_y + self.r_d * math.cos(self.radians + math.radians(90))
@@ -391,8 +420,7 @@ class Shotgun(Pistol):
             for x, y in targets:
                 bullet = self.bullet.shoot(self.player.center_x, self.player.center_y, x, y)
                 bullet.position = self.position
-                bullet.attacked = set()
-                self.bullets_list.append(bullet)
+                self.add_bullet(bullet)
 
 
 class PistolBook(Pistol):
@@ -410,28 +438,17 @@ class PistolBook(Pistol):
             self.center_x = self.player.center_x + self.r_d * math.sin(self.radians + math.radians(90))
             self.center_y = self.player.center_y + self.r_d * math.cos(self.radians + math.radians(90))
 
-        for bullet in self.bullets_list.sprite_list:
+        for bullet in self.player.projectiles.owned(self):
             bullet.emitter.center_x = bullet.center_x
             bullet.emitter.center_y = bullet.center_y
 
-            enemies = arcade.check_for_collision_with_list(bullet, self.enemies_list)
-
-            for enemy in enemies:
-                if enemy in bullet.attacked:
-                    continue
-
-                enemy.hurt(bullet.get_damage())
-                bullet.attacked.add(enemy)
-
         for e in self.emitters:
             e.lifetime -= delta_time
 
             if e.lifetime <= 0:
-                self.player.emitters.remove(e)
+                self.player.particles.remove(e)
                 self.emitters.remove(e)
 
-        self.bullets_list.update(delta_time)
-
         if self.time_left > 0:
             self.time_left -= delta_time
         else:
@@ -446,7 +463,7 @@ class PistolBook(Pistol):
             if -90 < self.angle < 90:
                 self.texture = self.source_texture
             else:
-                self.texture = self.source_texture.flip_vertically()
+                self.texture = textures.flipped(self.source_texture)
 
             self.center_x = self.player.center_x + self.r_d * math.sin(self.radians + math.radians(90))
             self.center_y = self.player.center_y + self.r_d * math.cos(self.radians + math.radians(90))
@@ -455,34 +472,43 @@ class PistolBook(Pistol):
 
             bullet = self.bullet.shoot(self.player.center_x, self.player.center_y, x, y)
             bullet.position = self.position
-            bullet.attacked = set()
-            bullet.emitter = make_trail(arcade.make_soft_circle_texture(20, self.bullet.color, 255, 50))
+            bullet.emitter = make_trail(textures.soft_circle(20, self.bullet.color, 255, 50))
             bullet.emitter.lifetime = bullet.lifetime
-            self.player.emitters.append(bullet.emitter)
+            self.player.particles.add(bullet.emitter)
             self.emitters.append(bullet.emitter)
-            self.bullets_list.append(bullet)
+            self.add_bullet(bullet)
 
     def kill(self):
         super().kill()
 
         for i in self.emitters:
-            self.player.emitters.remove(i)
+            self.player.particles.remove(i)
 
         self.emitters.clear()
 
 
 class WaterBook(PistolBook):
+    texture_path = 'assets/images/weapons/magic/water_book.png'
+    item_scale = 1.2
+    rarity = 1
+    name = 'Книга воды'
+    base_damage = 3
+    reloading = 0.75
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/magic/water_book.png', 1.2, 45, 0, 50, bullets.WaterBullet(), 0.75, None, player, level)
-        self.rarity = 1
-        self.name = 'Книга воды'
+        super().__init__(self.texture_path, self.item_scale, 45, 0, 50, bullets.WaterBullet(self.base_damage), self.reloading, None, player, level)
 
 
 class FireBook(PistolBook):
+    texture_path = 'assets/images/weapons/magic/fire_book.png'
+    item_scale = 1.2
+    rarity = 2
+    name = 'Огненная книга'
+    base_damage = 4
+    reloading = 0.65
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/magic/fire_book.png', 1.2, 45, 0, 50, bullets.FireBullet(), 0.65, None, player, level)
-        self.rarity = 2
-        self.name = 'Огненная книга'
+        super().__init__(self.texture_path, self.item_scale, 45, 0, 50, bullets.FireBullet(self.base_damage), self.reloading, None, player, level)
 
 
 class AreaBook(Pistol):
@@ -490,7 +516,7 @@ class AreaBook(Pistol):
         self.magic_color = color
         self.radius = radius
         self.damage = damage
-        self.particle_texture = arcade.make_circle_texture(10, color)
+        self.particle_texture = textures.circle(10, color)
         self.lifetime = lifetime
 
         super().__init__(texture, scale, x, y, r_d, None, reloading, None, player, level)
@@ -505,22 +531,6 @@ class AreaBook(Pistol):
             self.center_x = self.player.center_x + self.r_d * math.sin(self.radians + math.radians(90))
             self.center_y = self.player.center_y + self.r_d * math.cos(self.radians + math.radians(90))
 
-        for bullet in self.bullets_list.sprite_list:
-            enemies = arcade.check_for_collision_with_list(bullet, self.enemies_list)
-            bullet.lifetime -= delta_time
-
-            if bullet.lifetime <= 0:
-                bullet.kill()
-            else:
-                for enemy in enemies:
-                    if enemy in bullet.attacked:
-                        continue
-
-                    enemy.hurt(self.damage)
-                    bullet.attacked.add(enemy)
-
-        self.bullets_list.update(delta_time)
-
         if self.time_left > 0:
             self.time_left -= delta_time
         else:
@@ -535,48 +545,57 @@ class AreaBook(Pistol):
             if -90 < self.angle < 90:
                 self.texture = self.source_texture
             else:
-                self.texture = self.source_texture.flip_vertically()
+                self.texture = textures.flipped(self.source_texture)
 
             self.center_x = self.player.center_x + self.r_d * math.sin(self.radians + math.radians(90))
             self.center_y = self.player.center_y + self.r_d * math.cos(self.radians + math.radians(90))
 
             self.time_left = self.reloading_time
 
-            bullet = arcade.SpriteCircle(self.radius, self.magic_color, False, x, y)
-            bullet.lifetime = self.lifetime
-            bullet.alpha = 100
-            bullet.attacked = set()
-            self.player.emitters.append(make_explosion(x, y, self.particle_texture, 40))
-            self.bullets_list.append(bullet)
+            bullet = bullets.AreaBullet(self.radius, self.magic_color, x, y, self.damage, self.lifetime)
+            self.player.particles.add(make_explosion(x, y, self.particle_texture, 40))
+            self.add_bullet(bullet)
 
     def apply_level(self):
-        self.damage *= self.player.modifiers.get('damage', 1)
-        self.damage *= self.level / 10 + 0.9
-
-    def return_desc(self):
-        return f'Уровень: {self.level}\nУрон: {self.damage}\nПерезарядка: {self.reloading_time}'
+        self.damage = self.get_stats(self.level, self.player.modifiers)['damage']
 
 
 class DarkBook(AreaBook):
+    texture_path = 'assets/images/weapons/magic/dark_book.png'
+    item_scale = 1.2
+    rarity = 3
+    name = 'Книга тьмы'
+    base_damage = 6
+    reloading = 0.6
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/magic/dark_book.png', 1.2, 45, 0, 50, 6, 50, 0.5, 0.6, arcade.color.PURPLE, player, level)
-        self.rarity = 3
-        self.name = 'Книга тьмы'
+        super().__init__(self.texture_path, self.item_scale, 45, 0, 50, self.base_damage, 50, 0.5, self.reloading, arcade.color.PURPLE, player, level)
 
 
 class LightBook(AreaBook):
+    texture_path = 'assets/images/weapons/magic/light_book.png'
+    item_scale = 1.2
+    rarity = 4
+    name = 'Книга света'
+    base_damage = 8
+    reloading = 0.5
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/magic/light_book.png', 1.2, 45, 0, 50, 8, 75, 0.65, 0.5, arcade.color.YELLOW, player, level)
-        self.rarity = 4
-        self.name = 'Книга света'
+        super().__init__(self.texture_path, self.item_scale, 45, 0, 50, self.base_damage, 75, 0.65, self.reloading, arcade.color.YELLOW, player, level)
 
 
 class Slipper(Pistol):
+    texture_path = 'assets/images/weapons/magic/slipper.png'
+    item_scale = 1.75
+    rarity = 5
+    name = 'Тапочек'
+    base_damage = 7
+    explosion_damage = 5
+    reloading = 0.9
+
     def __init__(self, player, level):
-        super().__init__('assets/images/weapons/magic/slipper.png', 1.75, 40, 0, 45, bullets.SlipperBullet(), 0.9, None, player, level)
-        self.rarity = 5
-        self.name = 'Тапочек'
-        self.particle_texture = arcade.make_circle_texture(15, arcade.color.PINK)
+        super().__init__(self.texture_path, self.item_scale, 40, 0, 45, bullets.SlipperBullet(self.base_damage, self.explosion_damage), self.reloading, None, player, level)
+        self.particle_texture = textures.circle(15, arcade.color.PINK)
 
     def update(self, delta_time):
         if not self.attacking:
@@ -588,22 +607,11 @@ class Slipper(Pistol):
             self.center_x = self.player.center_x + self.r_d * math.sin(self.radians + math.radians(90))
             self.center_y = self.player.center_y + self.r_d * math.cos(self.radians + math.radians(90))
 
-        for bullet in self.bullets_list.sprite_list:
-            enemies = arcade.check_for_collision_with_list(bullet, self.enemies_list)
-
-            for enemy in enemies:
-                if enemy in bullet.attacked:
-                    continue
-
-                enemy.hurt(bullet.get_damage())
-                bullet.attacked.add(enemy)
-
+        for bullet in self.player.projectiles.owned(self):
             if bullet.want_boom:
-                self.player.emitters.append(make_big_explosion(bullet.center_x, bullet.center_y, self.particle_texture, 40))
+                self.player.particles.add(make_big_explosion(bullet.center_x, bullet.center_y, self.particle_texture, 40))
                 bullet.want_boom = False
 
-        self.bullets_list.update(delta_time)
-
         if self.time_left > 0:
             self.time_left -= delta_time
         else:
@@ -620,7 +628,7 @@ class Slipper(Pistol):
             if -90 < self.angle < 90:
                 self.texture = self.source_texture
             else:
-                self.texture = self.source_texture.flip_vertically()
+                self.texture = textures.flipped(self.source_texture)
 
             self.center_x = self.player.center_x + self.r_d * math.sin(self.radians + math.radians(90))
             self.center_y = self.player.center_y + self.r_d * math.cos(self.radians + math.radians(90))
@@ -629,18 +637,25 @@ class Slipper(Pistol):
 
             bullet = self.bullet.shoot(self.player.center_x, self.player.center_y, x, y)
             bullet.position = self.position
-            bullet.attacked = set()
-            self.bullets_list.append(bullet)
+            self.add_bullet(bullet)
 
     def apply_level(self):
-        self.bullet.damage_mod *= self.player.modifiers.get('damage', 1)
-        self.bullet.damage_mod *= self.level / 10 + 0.9
+        stats = self.get_stats(self.level, self.player.modifiers)
 
-        self.bullet.first_damage *= self.bullet.damage_mod 
-        self.bullet.second_damage *= self.bullet.damage_mod 
+        self.bullet.first_damage = stats['damage']
+        self.bullet.second_damage = stats['explosion_damage']
 
-    def return_desc(self):
-        return f'Уровень: {self.level}\nУрон тапка: {self.bullet.first_damage}\nУрон взрывом: {self.bullet.second_damage}\nПерезарядка: {self.reloading_time}'
+    @classmethod
+    def get_stats(cls, level, modifiers):
+        return {'damage': get_level_damage(cls.base_damage, level, modifiers),
+                'explosion_damage': get_level_damage(cls.explosion_damage, level, modifiers),
+                'reloading': cls.reloading}
+
+    @classmethod
+    def describe(cls, level, modifiers):
+        stats = cls.get_stats(level, modifiers)
+
+        return f'Уровень: {level}\nУрон тапка: {stats["damage"]}\nУрон взрывом: {stats["explosion_damage"]}\nПерезарядка: {stats["reloading"]}'
 
 
 USUAL_RARITY_WEAPONS = [WoodenSword, OldPistol, WaterBook]
@@ -655,4 +670,6 @@ RARITY_TO_WEAPONS = {1: USUAL_RARITY_WEAPONS,
                      2: UNUSUAL_RARITY_WEAPONS,
                      3: RARE_RARITY_WEAPONS,
                      4: EPIC_RARITY_WEAPONS,
-                     5: LEGENDARY_RARITY_WEAPONS}
\ No newline at end of file
+                     5: LEGENDARY_RARITY_WEAPONS}
+
+REGISTRY = {i.__name__: i for i in WEAPONS}